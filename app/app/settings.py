@@ -45,6 +45,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.TimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -52,6 +53,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = "app.urls"
@@ -78,17 +80,137 @@ WSGI_APPLICATION = "app.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/2.2/ref/settings/#databases
 
+# DB_CONN_MAX_AGE keeps each worker thread's connection open between
+# requests; only use it with a fixed set of worker threads, as a thread per
+# request server leaves one connection behind per thread. Setting
+# DB_POOL_MAX_SIZE switches to core.db.backends.postgresql, which shares a
+# bounded pool of connections between the threads of a process; connections
+# then go back to the pool after every request and DB_CONN_MAX_AGE is ignored.
+
+DB_POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", 0))
+
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": (
+            "core.db.backends.postgresql"
+            if DB_POOL_MAX_SIZE
+            else "django.db.backends.postgresql"
+        ),
         "HOST": os.environ.get("DB_HOST"),
         "NAME": os.environ.get("DB_NAME"),
         "USER": os.environ.get("DB_USER"),
         "PASSWORD": os.environ.get("DB_PASS"),
+        "CONN_MAX_AGE": (
+            0 if DB_POOL_MAX_SIZE else int(os.environ.get("DB_CONN_MAX_AGE", 0))
+        ),
+        "POOL": {
+            "MAX_SIZE": DB_POOL_MAX_SIZE,
+            "IDLE_TIMEOUT": int(os.environ.get("DB_POOL_IDLE_TIMEOUT", 300)),
+            "PRE_PING": os.environ.get("DB_POOL_PRE_PING", "1") == "1",
+            "ACQUIRE_TIMEOUT": int(os.environ.get("DB_POOL_ACQUIRE_TIMEOUT", 30)),
+        },
+    }
+}
+
+# Read replicas, one alias per host in DB_REPLICA_HOSTS. Safe requests of the
+# recipe and user views read from a replica, users who just wrote are pinned
+# to the primary for REPLICA_PIN_SECONDS. Pins are kept in the
+# REPLICA_PIN_CACHE_ALIAS cache, which must be shared by all workers, e.g.
+# Memcached, for the pin to hold whichever worker serves the next request.
+# REPLICA_SELECTION is round_robin or least_loaded (by pooled connections in
+# use). Under test, replicas mirror the primary's test database unless
+# DB_REPLICA_TEST_STANDALONE is set, which gives each replica its own test
+# database so the end-to-end replica routing tests can run.
+
+DB_REPLICA_HOSTS = [
+    host for host in os.environ.get("DB_REPLICA_HOSTS", "").split(",") if host
+]
+
+DB_REPLICA_TEST_STANDALONE = os.environ.get("DB_REPLICA_TEST_STANDALONE") == "1"
+
+DATABASE_REPLICAS = []
+
+for index, host in enumerate(DB_REPLICA_HOSTS):
+    alias = "replica%d" % index
+    if DB_REPLICA_TEST_STANDALONE:
+        test = {"NAME": "test_%s_%s" % (DATABASES["default"]["NAME"], alias)}
+    else:
+        test = {"MIRROR": "default"}
+    DATABASES[alias] = dict(DATABASES["default"], HOST=host, TEST=test)
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["core.db.routers.ReplicaRouter"]
+
+REPLICA_SELECTION = os.environ.get("REPLICA_SELECTION", "round_robin")
+
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", 5))
+
+REPLICA_PIN_CACHE_ALIAS = os.environ.get("REPLICA_PIN_CACHE_ALIAS", "default")
+
+
+# Django REST framework
+# https://www.django-rest-framework.org/api-guide/settings/
+# orjson is used for JSON when installed; the browsable API is only served
+# while DEBUG is on. Throttle rates are "<requests>/<sec|min|hour|day>", an
+# empty rate disables that throttle.
+
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": ["core.renderers.JSONRenderer"]
+    + (["rest_framework.renderers.BrowsableAPIRenderer"] if DEBUG else []),
+    "DEFAULT_PARSER_CLASSES": [
+        "core.parsers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    "DEFAULT_CONTENT_NEGOTIATION_CLASS": "core.negotiation.FastContentNegotiation",
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": os.environ.get("THROTTLE_LOGIN_IP_RATE", "30/min") or None,
+        "login_email": os.environ.get("THROTTLE_LOGIN_EMAIL_RATE", "10/min") or None,
+        "signup": os.environ.get("THROTTLE_SIGNUP_RATE", "20/hour") or None,
+        "create": os.environ.get("THROTTLE_CREATE_RATE", "120/min") or None,
+    },
+}
+
+THROTTLING_ENABLED = os.environ.get("THROTTLING_ENABLED", "1") == "1"
+
+THROTTLE_CACHE_ALIAS = os.environ.get("THROTTLE_CACHE_ALIAS", "default")
+
+
+# Caches
+# https://docs.djangoproject.com/en/2.2/topics/cache/
+# Use a shared backend (e.g. memcached) in production so every worker sees
+# the same entries.
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
     }
 }
 
 
+# Password hashing
+# https://docs.djangoproject.com/en/2.2/topics/auth/passwords/
+# New passwords use PASSWORD_HASHER; hashes made by any other hasher, or with
+# a different PBKDF2 iteration count, are re-encoded on the next login.
+
+PASSWORD_HASHER = os.environ.get("PASSWORD_HASHER", "pbkdf2")
+
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get("PASSWORD_PBKDF2_ITERATIONS", 120000))
+
+_PASSWORD_HASHERS = {
+    "argon2": "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "bcrypt_sha256": "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "pbkdf2": "core.hashers.PBKDF2PasswordHasher",
+}
+
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+]
+
+
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
 
@@ -128,3 +250,92 @@ USE_TZ = True
 STATIC_URL = "/static/"
 
 AUTH_USER_MODEL = "core.User"
+
+
+# Token authentication cache
+# Entries are per process and invalidation only reaches the worker that made
+# the change. The TTL is therefore the revocation bound: another worker can
+# keep authenticating a deleted token or a deactivated user for up to
+# TOKEN_CACHE_TTL seconds, so keep it to a few seconds.
+
+TOKEN_CACHE_MAX_SIZE = int(os.environ.get("TOKEN_CACHE_MAX_SIZE", 10000))
+
+TOKEN_CACHE_TTL = int(os.environ.get("TOKEN_CACHE_TTL", 5))
+
+
+# Recipe attribute lists
+# Lists are only paginated when the client asks for a page size or cursor.
+
+RECIPE_PAGE_SIZE = int(os.environ.get("RECIPE_PAGE_SIZE", 100))
+
+RECIPE_MAX_PAGE_SIZE = int(os.environ.get("RECIPE_MAX_PAGE_SIZE", 1000))
+
+RECIPE_BULK_MAX_BATCH_SIZE = int(os.environ.get("RECIPE_BULK_MAX_BATCH_SIZE", 1000))
+
+RECIPE_EXPORT_CHUNK_SIZE = int(os.environ.get("RECIPE_EXPORT_CHUNK_SIZE", 2000))
+
+RECIPE_AUTOCOMPLETE_LIMIT = int(os.environ.get("RECIPE_AUTOCOMPLETE_LIMIT", 10))
+
+RECIPE_AUTOCOMPLETE_MAX_LIMIT = int(os.environ.get("RECIPE_AUTOCOMPLETE_MAX_LIMIT", 50))
+
+# Serialized list bodies are cached per user; 0 disables the cache.
+
+RECIPE_LIST_CACHE_ALIAS = os.environ.get("RECIPE_LIST_CACHE_ALIAS", "default")
+
+RECIPE_LIST_CACHE_TIMEOUT = int(os.environ.get("RECIPE_LIST_CACHE_TIMEOUT", 300))
+
+# Request timing
+# Responses to staff users, or to anyone with DEBUG, carry a Server-Timing
+# header with their DB, view and render time; slower requests and queries
+# are logged by core.middleware.
+
+SERVER_TIMING_ENABLED = os.environ.get("SERVER_TIMING_ENABLED", "1") == "1"
+
+SLOW_REQUEST_THRESHOLD_MS = int(os.environ.get("SLOW_REQUEST_THRESHOLD_MS", 500))
+
+SLOW_QUERY_THRESHOLD_MS = int(os.environ.get("SLOW_QUERY_THRESHOLD_MS", 100))
+
+# On demand profiling for staff users, see core.middleware.ProfilingMiddleware.
+# Profiles are returned in the response unless PROFILING_OUTPUT_DIR is set.
+
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "0") == "1"
+
+PROFILING_OUTPUT_DIR = os.environ.get("PROFILING_OUTPUT_DIR") or None
+
+PROFILING_SAMPLE_INTERVAL = float(os.environ.get("PROFILING_SAMPLE_INTERVAL", 0.001))
+
+# Readiness checks behind /health/ready; results are reused for
+# READINESS_CACHE_TTL seconds so frequent probes do not load the database.
+
+READINESS_CACHE_TTL = float(os.environ.get("READINESS_CACHE_TTL", 5))
+
+READINESS_CHECK_MIGRATIONS = os.environ.get("READINESS_CHECK_MIGRATIONS", "1") == "1"
+
+# Admin changelists show planner estimates instead of COUNT(*) for tables and
+# searches estimated at ADMIN_ESTIMATED_COUNT_THRESHOLD rows or more.
+
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(
+    os.environ.get("ADMIN_ESTIMATED_COUNT_THRESHOLD", 10000)
+)
+
+# Deleted accounts are deactivated at once; their data is then deleted in
+# batches by a background thread, or by process_account_deletions when
+# ACCOUNT_DELETION_ASYNC is off.
+
+ACCOUNT_DELETION_ASYNC = os.environ.get("ACCOUNT_DELETION_ASYNC", "1") == "1"
+
+ACCOUNT_DELETION_BATCH_SIZE = int(os.environ.get("ACCOUNT_DELETION_BATCH_SIZE", 1000))
+
+# Bulk user provisioning. The provision_users command hashes passwords across
+# USER_PROVISION_WORKERS processes; /api/user/provision/ hashes in the request
+# thread, tens of milliseconds per password, so it takes at most
+# USER_PROVISION_MAX_USERS users per request to stay well within worker
+# timeouts. Larger imports go through the command.
+
+USER_PROVISION_WORKERS = int(
+    os.environ.get("USER_PROVISION_WORKERS", os.cpu_count() or 1)
+)
+
+USER_PROVISION_BATCH_SIZE = int(os.environ.get("USER_PROVISION_BATCH_SIZE", 500))
+
+USER_PROVISION_MAX_USERS = int(os.environ.get("USER_PROVISION_MAX_USERS", 25))
@@ -15,9 +15,12 @@ Including another URLconf
 """
 from django.urls import path, include
 from django.contrib import admin
+from core.views import ReadinessView, DatabasePoolsView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/user/", include("user.urls")),
     path("api/recipe/", include("recipe.urls")),
+    path("health/ready", ReadinessView.as_view(), name="health-ready"),
+    path("health/pools", DatabasePoolsView.as_view(), name="health-pools"),
 ]
@@ -3,6 +3,12 @@ WSGI config for app project.
 
 It exposes the WSGI callable as a module-level variable named ``application``.
 
+With WSGI_WARMUP=1 the URL resolvers, serializers and model metadata are
+built and the databases checked before serving, see core.warmup. Failing
+steps are logged and do not stop the application from loading. Load the
+application before forking (e.g. gunicorn --preload) so every worker starts
+warm.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/2.2/howto/deployment/wsgi/
 """
@@ -14,3 +20,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
 
 application = get_wsgi_application()
+
+if os.environ.get("WSGI_WARMUP") == "1":
+    from core.warmup import warm_up
+
+    warm_up()
@@ -1,12 +1,77 @@
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext as _
+from django.utils.functional import cached_property
+from django.core.paginator import Paginator
+from django.db import connections
+from django.conf import settings
 from django.contrib import admin
 from core import models
+import json
 
 
-class UserAdmin(BaseUserAdmin):
+def estimate_count(queryset):
+    """Return the planner's row estimate for queryset, None if unavailable
+
+    Unfiltered tables are estimated from pg_class.reltuples, which VACUUM
+    and ANALYZE keep current; filtered querysets from the top plan node of
+    EXPLAIN. Only PostgreSQL is supported.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            if row is None or row[0] < 0:
+                # Never analyzed
+                return None
+            return int(row[0])
+
+        sql, params = queryset.query.sql_with_params()
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator using estimated counts on large tables
+
+    The exact COUNT(*) is only run when the estimate is below
+    ADMIN_ESTIMATED_COUNT_THRESHOLD, where it is cheap and the page links
+    should be accurate.
+    """
+
+    @cached_property
+    def count(self):
+        threshold = getattr(settings, "ADMIN_ESTIMATED_COUNT_THRESHOLD", 10000)
+        if threshold and hasattr(self.object_list, "query"):
+            estimate = estimate_count(self.object_list)
+            if estimate is not None and estimate >= threshold:
+                return estimate
+
+        return super().count
+
+
+class EstimatedCountAdmin(admin.ModelAdmin):
+    """Changelist that skips the full result count and estimates totals"""
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class UserAdmin(EstimatedCountAdmin, BaseUserAdmin):
     ordering = ["id"]
     list_display = ["email", "name"]
+    list_filter = ["is_staff", "is_superuser", "is_active"]
+    # Prefix search served by the UPPER(email) text_pattern_ops index
+    search_fields = ["^email"]
     fieldsets = (
         (None, {"fields": ("email", "password")}),
         (_("Personal Info"), {"fields": ("name",)}),
@@ -28,5 +93,37 @@ class UserAdmin(BaseUserAdmin):
     )
 
 
+class RecipeAttributeAdmin(EstimatedCountAdmin):
+    ordering = ["id"]
+    list_display = ["name", "user"]
+    list_select_related = ["user"]
+    autocomplete_fields = ["user"]
+    search_fields = ["name_key"]
+
+    def get_search_results(self, request, queryset, search_term):
+        """Match names starting with the search term through the name index"""
+        if not search_term:
+            return queryset, False
+
+        return queryset.prefix_search(search_term), False
+
+
+class RecipeAdmin(EstimatedCountAdmin):
+    ordering = ["-id"]
+    list_display = ["title", "user", "time_minutes", "price"]
+    list_select_related = ["user"]
+    autocomplete_fields = ["user", "tags", "ingredients"]
+
+
+class AccountDeletionAdmin(admin.ModelAdmin):
+    ordering = ["-id"]
+    list_display = ["user_id", "status", "step", "rows_deleted", "requested_at"]
+    list_filter = ["status"]
+    readonly_fields = [field.name for field in models.AccountDeletion._meta.fields]
+
+
 admin.site.register(models.User, UserAdmin)
-admin.site.register(models.Tag)
+admin.site.register(models.Tag, RecipeAttributeAdmin)
+admin.site.register(models.Ingredient, RecipeAttributeAdmin)
+admin.site.register(models.Recipe, RecipeAdmin)
+admin.site.register(models.AccountDeletion, AccountDeletionAdmin)
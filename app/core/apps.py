@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = "core"
+
+    def ready(self):
+        """Connect the signal receivers and register the checks of the app"""
+        from core import signals  # noqa: F401
+        from core import checks  # noqa: F401
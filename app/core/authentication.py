@@ -0,0 +1,143 @@
+from rest_framework.authentication import TokenAuthentication
+from collections import OrderedDict
+from django.conf import settings
+import threading
+import time
+
+
+def _snapshot(instance):
+    """Return the database state of a model instance as plain values"""
+    names = [field.attname for field in instance._meta.concrete_fields]
+    values = [getattr(instance, name) for name in names]
+    return instance._state.db, names, values
+
+
+def _restore(model, snapshot):
+    """Build a fresh model instance from a snapshot"""
+    db, names, values = snapshot
+    return model.from_db(db, names, values)
+
+
+class TokenCache:
+    """Bounded, thread safe LRU cache of token keys to users with a TTL
+
+    The cache is per process, so changes made by another worker are only
+    picked up once the entry expires. The TTL is the revocation bound for
+    every other worker; keep it to a few seconds.
+    """
+
+    def __init__(self, max_size=10000, ttl=5, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the cached (user, token) pair for a key or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self.clock():
+                self._discard(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        _, _, user_model, user_state, token_model, token_state = entry
+        user = _restore(user_model, user_state)
+        token = _restore(token_model, token_state)
+        token.user = user
+        return user, token
+
+    def set(self, key, user, token):
+        """Store a freshly authenticated (user, token) pair"""
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        entry = (
+            self.clock() + self.ttl,
+            user.pk,
+            type(user),
+            _snapshot(user),
+            type(token),
+            _snapshot(token),
+        )
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = entry
+            self._keys_by_user.setdefault(user.pk, set()).add(key)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        """Drop the entry for a single token key"""
+        with self._lock:
+            self._discard(key)
+
+    def invalidate_user(self, user_id):
+        """Drop every entry that resolves to the given user"""
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._discard(key)
+
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Return the cache counters for monitoring"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_id = entry[1]
+        keys = self._keys_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user_id]
+
+
+token_cache = TokenCache(
+    max_size=getattr(settings, "TOKEN_CACHE_MAX_SIZE", 10000),
+    ttl=getattr(settings, "TOKEN_CACHE_TTL", 5),
+)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication that avoids the token and user query when cached"""
+
+    cache = token_cache
+
+    def authenticate_credentials(self, key):
+        """Authenticate the token key, consulting the cache first"""
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        user, token = super().authenticate_credentials(key)
+        self.cache.set(key, user, token)
+        return user, token
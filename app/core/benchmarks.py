@@ -0,0 +1,49 @@
+from collections import OrderedDict
+import time
+
+registry = OrderedDict()
+
+
+def register(name):
+    """Register a benchmark suite under a name
+
+    A suite is a callable accepting ``quick`` and returning a list of
+    results built with ``result``. Suites live in a ``benchmarks`` module
+    of any installed app and are run by ``manage.py benchmark``.
+    """
+
+    def decorator(func):
+        registry[name] = func
+        return func
+
+    return decorator
+
+
+def timeit(func, min_time=1.0, min_runs=3):
+    """Call func until both min_time and min_runs are reached
+
+    Returns the number of runs and the elapsed wall time in seconds.
+    """
+    runs = 0
+    started = time.perf_counter()
+    elapsed = 0.0
+    while runs < min_runs or elapsed < min_time:
+        func()
+        runs += 1
+        elapsed = time.perf_counter() - started
+
+    return runs, elapsed
+
+
+def result(case, runs, elapsed, **extra):
+    """Build a benchmark result from a number of runs and their duration"""
+    data = OrderedDict(
+        [
+            ("case", case),
+            ("runs", runs),
+            ("ops_per_sec", round(runs / elapsed, 2)),
+            ("mean_ms", round(elapsed / runs * 1000, 4)),
+        ]
+    )
+    data.update(extra)
+    return data
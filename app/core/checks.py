@@ -0,0 +1,31 @@
+from django.core.checks import Tags, Warning, register
+from core.db.routers import replicas
+from django.conf import settings
+
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches)
+def check_replica_pin_cache(app_configs, **kwargs):
+    """Warn when replica pins cannot be seen by the other worker processes"""
+    if not replicas():
+        return []
+
+    alias = getattr(settings, "REPLICA_PIN_CACHE_ALIAS", "default")
+    backend = settings.CACHES.get(alias, {}).get("BACKEND")
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+
+    return [
+        Warning(
+            "Replica pins are stored in the %r cache, which is local to each "
+            "process. Users may not read their own writes when the next "
+            "request is served by another worker." % alias,
+            hint="Set REPLICA_PIN_CACHE_ALIAS to a cache shared by all "
+            "workers, such as Memcached or Redis.",
+            id="core.W001",
+        )
+    ]
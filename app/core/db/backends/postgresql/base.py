@@ -0,0 +1,124 @@
+from django.db.backends.postgresql.creation import DatabaseCreation as BaseCreation
+from core.db.pool import ConnectionPool, get_pool, registry, registry_lock
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+
+
+def ping(connection):
+    """Run a query, never leaving a transaction open on the connection"""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    finally:
+        if not connection.autocommit:
+            connection.rollback()
+
+
+class DatabaseCreation(BaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        """Close pooled connections to the test database before dropping it"""
+        with registry_lock:
+            pools = [
+                pool
+                for name, pool in registry.items()
+                if name.split(":", 1)[1] == test_database_name
+            ]
+        for pool in pools:
+            pool.close_all()
+
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL backend borrowing its connections from a ConnectionPool
+
+    Closing the Django connection, which happens after every request when
+    CONN_MAX_AGE is 0, returns it to the pool instead of disconnecting. A
+    connection is returned rolled back, in autocommit mode and with its
+    session state discarded, so the next borrower gets it as if new; one
+    that cannot be reset is discarded. The pool is configured by the POOL key
+    of the database settings: MAX_SIZE, IDLE_TIMEOUT, PRE_PING and
+    ACQUIRE_TIMEOUT.
+
+    CONN_MAX_AGE must be 0. Persistent connections are never closed, so
+    they would hold their pool slot for the lifetime of their thread.
+    """
+
+    creation_class = DatabaseCreation
+
+    def __init__(self, settings_dict, *args, **kwargs):
+        if settings_dict.get("CONN_MAX_AGE"):
+            raise ImproperlyConfigured(
+                "CONN_MAX_AGE must be 0 with the pooled PostgreSQL backend, "
+                "connections return to the pool when they are closed."
+            )
+        super().__init__(settings_dict, *args, **kwargs)
+
+    def get_pool(self, conn_params):
+        """Return the process wide pool for this alias and database"""
+        options = self.settings_dict.get("POOL") or {}
+
+        def create():
+            return ConnectionPool(
+                lambda: base.Database.connect(**conn_params),
+                ping=ping,
+                max_size=options.get("MAX_SIZE", 10),
+                idle_timeout=options.get("IDLE_TIMEOUT", 300),
+                pre_ping=options.get("PRE_PING", True),
+                acquire_timeout=options.get("ACQUIRE_TIMEOUT", 30),
+            )
+
+        name = "%s:%s" % (self.alias, conn_params.get("database", ""))
+        return get_pool(name, create)
+
+    def get_new_connection(self, conn_params):
+        self.pool = self.get_pool(conn_params)
+        connection = self.pool.acquire()
+
+        # Mirrors the parent: a reused connection still needs the isolation
+        # level recorded on the wrapper.
+        options = self.settings_dict["OPTIONS"]
+        try:
+            self.isolation_level = options["isolation_level"]
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                reusable = self.reset_connection(self.connection)
+                self.pool.release(self.connection, discard=not reusable)
+
+    def reset_connection(self, connection):
+        """Reset the connection for reuse, returning whether it is reusable
+
+        Any open transaction is rolled back, autocommit is turned back on
+        and DISCARD ALL drops session settings, temporary tables and
+        prepared statements.
+        """
+        if connection.closed:
+            return False
+
+        idle = extensions.TRANSACTION_STATUS_IDLE
+        try:
+            if connection.get_transaction_status() in (
+                extensions.TRANSACTION_STATUS_INTRANS,
+                extensions.TRANSACTION_STATUS_INERROR,
+            ):
+                connection.rollback()
+            if connection.get_transaction_status() != idle:
+                return False
+            if not connection.autocommit:
+                connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute("DISCARD ALL")
+        except base.Database.Error:
+            return False
+
+        return connection.get_transaction_status() == idle
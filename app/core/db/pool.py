@@ -0,0 +1,207 @@
+from django.db.utils import OperationalError
+from collections import deque
+import threading
+import time
+import os
+
+
+class PoolTimeout(OperationalError):
+    """No connection became available within the acquire timeout
+
+    An OperationalError, like failing to connect, so code handling an
+    unavailable database handles an exhausted pool too.
+    """
+
+
+class ConnectionPool:
+    """Bounded pool of reusable database connections
+
+    ``connect`` opens a new raw connection, ``ping`` checks that an idle
+    connection still works and ``close`` closes one. At most ``max_size``
+    connections exist at once; callers beyond that wait up to
+    ``acquire_timeout`` seconds for one to be released. Idle connections
+    are closed after ``idle_timeout`` seconds and, with ``pre_ping``,
+    checked before being handed out so a restarted server does not cause
+    errors. Idle connections are reused most recently released first,
+    which lets surplus ones age out.
+
+    The pool is fork safe: a child process never reuses the connections
+    of its parent, whose sockets it shares.
+    """
+
+    def __init__(
+        self,
+        connect,
+        ping=None,
+        close=None,
+        max_size=10,
+        idle_timeout=300,
+        pre_ping=True,
+        acquire_timeout=30,
+    ):
+        self.connect = connect
+        self.ping = ping
+        self.close_connection = close or (lambda connection: connection.close())
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.pre_ping = pre_ping and ping is not None
+        self.acquire_timeout = acquire_timeout
+        self._condition = threading.Condition()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._idle = deque()
+        self._size = 0
+        self._counters = dict.fromkeys(
+            ("created", "reused", "closed", "waits", "timeouts", "ping_failures"), 0
+        )
+
+    def _check_fork(self):
+        if self._pid != os.getpid():
+            # Keep the inherited connections referenced so they are never
+            # closed, or garbage collected, from the child.
+            self._inherited = list(self._idle)
+            self._condition = threading.Condition()
+            self._reset()
+
+    def acquire(self):
+        """Return a connection, opening one if the pool is not full"""
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            connection = self._take(deadline)
+            if connection is None:
+                break
+            if not self.pre_ping or self._alive(connection):
+                return connection
+            self._discard(connection)
+
+        try:
+            connection = self.connect()
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self._counters["created"] += 1
+        return connection
+
+    def release(self, connection, discard=False):
+        """Give a connection back, closing it when discard is set"""
+        with self._condition:
+            self._check_fork()
+            now = time.monotonic()
+            expired = self._pop_expired(now)
+            if discard:
+                self._size -= 1
+                expired.append(connection)
+            else:
+                self._idle.append((now, connection))
+            self._condition.notify()
+        for connection in expired:
+            self._close(connection)
+
+    def close_all(self):
+        """Close every idle connection"""
+        with self._condition:
+            self._check_fork()
+            idle, self._idle = self._idle, deque()
+            self._size -= len(idle)
+            self._condition.notify_all()
+        for _, connection in idle:
+            self._close(connection)
+
+    def stats(self):
+        """Return the pool size and counters for monitoring"""
+        with self._condition:
+            self._check_fork()
+            stats = {
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+            }
+            stats.update(self._counters)
+            return stats
+
+    def _take(self, deadline):
+        """Pop a live idle connection, or reserve a slot and return None"""
+        expired = []
+        try:
+            with self._condition:
+                self._check_fork()
+                waited = False
+                while True:
+                    now = time.monotonic()
+                    expired.extend(self._pop_expired(now))
+                    if self._idle:
+                        self._counters["reused"] += 1
+                        return self._idle.pop()[1]
+                    if self._size < self.max_size:
+                        self._size += 1
+                        return None
+
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._counters["timeouts"] += 1
+                        raise PoolTimeout(
+                            "No connection available within %ss" % self.acquire_timeout
+                        )
+                    if not waited:
+                        self._counters["waits"] += 1
+                        waited = True
+                    self._condition.wait(remaining)
+        finally:
+            for connection in expired:
+                self._close(connection)
+
+    def _pop_expired(self, now):
+        """Remove the connections idle for too long, oldest first"""
+        expired = []
+        while self._idle and now - self._idle[0][0] >= self.idle_timeout:
+            expired.append(self._idle.popleft()[1])
+            self._size -= 1
+        return expired
+
+    def _alive(self, connection):
+        try:
+            return self.ping(connection) is not False
+        except Exception:
+            return False
+
+    def _discard(self, connection):
+        with self._condition:
+            self._counters["ping_failures"] += 1
+            self._size -= 1
+            self._condition.notify()
+        self._close(connection)
+
+    def _close(self, connection):
+        with self._condition:
+            self._counters["closed"] += 1
+        try:
+            self.close_connection(connection)
+        except Exception:
+            pass
+
+
+registry = {}
+registry_lock = threading.Lock()
+
+
+def get_pool(name, factory):
+    """Return the pool registered under name, creating it with factory"""
+    with registry_lock:
+        pool = registry.get(name)
+        if pool is None:
+            pool = registry[name] = factory()
+        return pool
+
+
+def pool_stats():
+    """Return the statistics of every registered pool"""
+    with registry_lock:
+        pools = sorted(registry.items())
+    return {name: pool.stats() for name, pool in pools}
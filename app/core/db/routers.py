@@ -0,0 +1,130 @@
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.core.cache import caches
+from core.db.pool import pool_stats
+from django.conf import settings
+import threading
+import itertools
+
+_state = threading.local()
+
+
+def replicas():
+    """Return the replica aliases configured in DATABASE_REPLICAS"""
+    return [
+        alias
+        for alias in getattr(settings, "DATABASE_REPLICAS", ())
+        if alias in connections.databases
+    ]
+
+
+def pin_key(user_id):
+    return "db-pin:%s" % user_id
+
+
+def pin_to_primary(user_id):
+    """Send the user's reads to the primary for REPLICA_PIN_SECONDS"""
+    cache = caches[getattr(settings, "REPLICA_PIN_CACHE_ALIAS", "default")]
+    cache.set(pin_key(user_id), 1, getattr(settings, "REPLICA_PIN_SECONDS", 5))
+
+
+def is_pinned(user_id):
+    cache = caches[getattr(settings, "REPLICA_PIN_CACHE_ALIAS", "default")]
+    return cache.get(pin_key(user_id)) is not None
+
+
+class ReplicaSelector:
+    """Pick the replica serving a request
+
+    ``round_robin`` cycles through the replicas. ``least_loaded`` picks
+    the replica whose connection pool has the lowest share of connections
+    in use, falling back to round robin without pooled connections.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+
+    def choose(self, aliases):
+        if not aliases:
+            return None
+        with self._lock:
+            offset = next(self._counter) % len(aliases)
+        ordered = aliases[offset:] + aliases[:offset]
+        if getattr(settings, "REPLICA_SELECTION", "round_robin") != "least_loaded":
+            return ordered[0]
+
+        return min(ordered, key=self.load)
+
+    def load(self, alias):
+        """Return the share of the alias' pooled connections in use"""
+        for name, stats in pool_stats().items():
+            if name.split(":", 1)[0] == alias and stats["max_size"]:
+                return stats["in_use"] / stats["max_size"]
+        return 0.0
+
+
+selector = ReplicaSelector()
+
+
+class replica_reads:
+    """Route reads made inside the block to a replica for a user
+
+    Nothing goes to a replica when the user wrote recently and is pinned to
+    the primary, or inside a transaction on the primary. Reads following a
+    write in the block go to the primary. Writes made for unsafe requests,
+    i.e. without reads, also pin the user for REPLICA_PIN_SECONDS so they
+    read their own writes on the following requests; incidental writes of
+    safe requests, such as creating a missing version counter, do not.
+
+    Pins are kept in the REPLICA_PIN_CACHE_ALIAS cache, which must be shared
+    by every worker process for the pin to hold across them.
+    """
+
+    def __init__(self, user_id=None, reads=True):
+        self.user_id = user_id
+        self.reads = reads
+
+    def __enter__(self):
+        self.previous = getattr(_state, "context", None)
+        replica = None
+        if self.reads and not (self.user_id is not None and is_pinned(self.user_id)):
+            replica = selector.choose(replicas())
+        _state.context = {
+            "user_id": self.user_id,
+            "replica": replica,
+            "wrote": False,
+            "pin": not self.reads,
+        }
+        return replica
+
+    def __exit__(self, *exc_info):
+        _state.context = self.previous
+
+
+class ReplicaRouter:
+    """Send reads to a replica within replica_reads, all else to the primary
+
+    All aliases hold the same data, so relations across them are allowed.
+    Migrations are left to the default rules: PostgreSQL replicas receive
+    the schema through replication, while standalone databases standing in
+    for replicas, e.g. two local SQLite files, can be migrated directly.
+    """
+
+    def db_for_read(self, model, **hints):
+        context = getattr(_state, "context", None)
+        if not context or not context["replica"] or context["wrote"]:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return context["replica"]
+
+    def db_for_write(self, model, **hints):
+        context = getattr(_state, "context", None)
+        if context and not context["wrote"]:
+            context["wrote"] = True
+            if context["pin"] and context["user_id"] is not None:
+                pin_to_primary(context["user_id"])
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
@@ -0,0 +1,133 @@
+from core.models import Tag, Ingredient, Recipe, CollectionVersion, AccountDeletion
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from rest_framework.authtoken.models import Token
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.utils import timezone
+from django.conf import settings
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def deletion_steps(user_id):
+    """Return (name, queryset) pairs covering the rows owned by a user
+
+    Every step only holds rows nothing left references, as the rows
+    pointing at them were removed by the steps before.
+    """
+    recipe_tags = Recipe.tags.through.objects
+    recipe_ingredients = Recipe.ingredients.through.objects
+    return (
+        ("recipe tags", recipe_tags.filter(recipe__user_id=user_id)),
+        ("recipe ingredients", recipe_ingredients.filter(recipe__user_id=user_id)),
+        ("tag links", recipe_tags.filter(tag__user_id=user_id)),
+        ("ingredient links", recipe_ingredients.filter(ingredient__user_id=user_id)),
+        ("recipes", Recipe.objects.filter(user_id=user_id)),
+        ("tags", Tag.objects.filter(user_id=user_id)),
+        ("ingredients", Ingredient.objects.filter(user_id=user_id)),
+        ("collection versions", CollectionVersion.objects.filter(user_id=user_id)),
+    )
+
+
+def delete_batch(queryset, batch_size, using=DEFAULT_DB_ALIAS):
+    """Delete up to batch_size rows of queryset and return how many went
+
+    The rows are deleted with one DELETE by primary key. Unlike
+    QuerySet.delete() nothing is loaded into Python and no signals are
+    sent, which is why the steps remove dependent rows first.
+    """
+    pks = list(queryset.using(using).values_list("pk", flat=True)[:batch_size])
+    if not pks:
+        return 0
+
+    return queryset.model._base_manager.filter(pk__in=pks)._raw_delete(using)
+
+
+def request_deletion(user):
+    """Deactivate the user and record that the account is to be deleted
+
+    The user can no longer authenticate once this returns: the account is
+    inactive and its tokens are gone. The data is deleted afterwards by
+    process_deletion, in a background thread once the transaction commits
+    when ACCOUNT_DELETION_ASYNC is on, or by the process_account_deletions
+    command.
+    """
+    with transaction.atomic():
+        user.is_active = False
+        user.save(update_fields=["is_active"])
+        Token.objects.filter(user=user).delete()
+        deletion, _ = AccountDeletion.objects.get_or_create(user_id=user.pk)
+
+        if getattr(settings, "ACCOUNT_DELETION_ASYNC", True):
+            transaction.on_commit(lambda: start_background(deletion.pk))
+
+    return deletion
+
+
+def process_deletion(deletion_id, batch_size=None):
+    """Delete the data of an account in batches, recording progress
+
+    Each batch commits with its progress, so a process that dies midway
+    leaves a consistent state to resume from. Returns the deletion.
+    """
+    batch_size = batch_size or getattr(settings, "ACCOUNT_DELETION_BATCH_SIZE", 1000)
+    deletions = AccountDeletion.objects.filter(pk=deletion_id)
+    deletion = deletions.get()
+    deletions.update(
+        status=AccountDeletion.RUNNING, error="", started_at=timezone.now()
+    )
+    try:
+        for step, queryset in deletion_steps(deletion.user_id):
+            deleted = None
+            while deleted != 0:
+                with transaction.atomic():
+                    deleted = delete_batch(queryset, batch_size)
+                    deletions.update(
+                        step=step, rows_deleted=F("rows_deleted") + deleted
+                    )
+
+        # What is left is small: tokens, permissions and admin log entries
+        with transaction.atomic():
+            deletions.update(step="user")
+            deleted, _ = get_user_model().objects.filter(pk=deletion.user_id).delete()
+            deletions.update(
+                status=AccountDeletion.DONE,
+                rows_deleted=F("rows_deleted") + deleted,
+                finished_at=timezone.now(),
+            )
+    except Exception as exc:
+        logger.exception("Deleting the account of user %s failed", deletion.user_id)
+        deletions.update(status=AccountDeletion.FAILED, error=str(exc))
+        raise
+
+    deletion.refresh_from_db()
+    logger.info(
+        "Deleted the account of user %s, %d rows",
+        deletion.user_id,
+        deletion.rows_deleted,
+    )
+    return deletion
+
+
+def run_in_background(deletion_id):
+    try:
+        process_deletion(deletion_id)
+    except Exception:
+        # Logged and recorded; process_account_deletions retries it
+        pass
+    finally:
+        connections.close_all()
+
+
+def start_background(deletion_id):
+    """Process a deletion in a daemon thread of this process"""
+    thread = threading.Thread(
+        target=run_in_background,
+        args=(deletion_id,),
+        name="account-deletion-%s" % deletion_id,
+        daemon=True,
+    )
+    thread.start()
+    return thread
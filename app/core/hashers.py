@@ -0,0 +1,18 @@
+from django.contrib.auth import hashers
+from django.conf import settings
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2 hasher whose iteration count comes from the settings
+
+    Stored hashes using a different count are re-encoded on the next
+    successful login, so the cost can be tuned in either direction.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(
+            settings,
+            "PASSWORD_PBKDF2_ITERATIONS",
+            hashers.PBKDF2PasswordHasher.iterations,
+        )
@@ -0,0 +1,216 @@
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from collections import OrderedDict, defaultdict
+from django.db import connection, connections
+from urllib.parse import urlencode
+import http.client
+import threading
+import random
+import json
+import time
+
+QUERY_COUNT_HEADER = "X-Loadtest-Queries"
+
+SCENARIOS = (
+    # (name, weight, method, path)
+    ("token", 1, "POST", "/api/user/token/"),
+    ("me", 2, "GET", "/api/user/me/"),
+    ("tags", 3, "GET", "/api/recipe/tags/"),
+    ("ingredients", 3, "GET", "/api/recipe/ingredients/"),
+    ("ingredients page", 2, "GET", "/api/recipe/ingredients/?page_size=50"),
+    ("autocomplete", 4, "GET", "/api/recipe/ingredients/autocomplete/"),
+    ("create tag", 1, "POST", "/api/recipe/tags/"),
+)
+
+
+class QueryCountingApplication:
+    """WSGI wrapper reporting the number of queries a request ran
+
+    The count is taken when the response starts, once the view has run, and
+    returned in a response header so clients can attribute it per endpoint.
+    """
+
+    def __init__(self, application):
+        self.application = application
+
+    def __call__(self, environ, start_response):
+        queries = [0]
+
+        def count(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        def counting_start_response(status, headers, exc_info=None):
+            headers = list(headers) + [(QUERY_COUNT_HEADER, str(queries[0]))]
+            return start_response(status, headers, exc_info)
+
+        with connection.execute_wrapper(count):
+            return self.application(environ, counting_start_response)
+
+
+class LoadtestWSGIServer(ThreadedWSGIServer):
+    """Threaded server closing the database connections of each request thread
+
+    Connections belong to the thread that opened them, so without this
+    every request thread would leave its connection open until the
+    database or CONN_MAX_AGE drops it, as LiveServerThread avoids.
+    """
+
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            connections.close_all()
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class Server:
+    """Serve the WSGI application on an ephemeral local port in a thread"""
+
+    def __init__(self, application=None, host="127.0.0.1"):
+        application = application or get_wsgi_application()
+        self.httpd = LoadtestWSGIServer((host, 0), QuietRequestHandler)
+        self.httpd.set_app(QueryCountingApplication(application))
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def address(self):
+        return self.httpd.server_address[:2]
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join()
+
+
+def percentile(values, percent):
+    """Return the nearest rank percentile of sorted values"""
+    if not values:
+        return None
+    rank = max(int(round(percent / 100.0 * len(values) + 0.5)), 1)
+    return values[min(rank, len(values)) - 1]
+
+
+class Client(threading.Thread):
+    """A user logging in and then running weighted scenarios in a loop"""
+
+    def __init__(self, address, credentials, host, deadline, requests, seed):
+        super().__init__(daemon=True)
+        self.address = address
+        self.credentials = credentials
+        self.host = host
+        self.deadline = deadline
+        self.requests = requests
+        self.random = random.Random(seed)
+        self.samples = []
+        self.token = None
+
+    def run(self):
+        self.call("token")
+        names = [scenario[0] for scenario in SCENARIOS]
+        weights = [scenario[1] for scenario in SCENARIOS]
+        while len(self.samples) < self.requests and time.monotonic() < self.deadline:
+            self.call(self.random.choices(names, weights)[0])
+
+    def call(self, name):
+        """Send the request of a scenario and record its outcome"""
+        _, _, method, path = next(s for s in SCENARIOS if s[0] == name)
+        headers = {"Host": self.host, "Accept": "application/json"}
+        body = None
+        if self.token:
+            headers["Authorization"] = "Token %s" % self.token
+        if name == "token":
+            body = self.credentials
+        elif name == "create tag":
+            body = {"name": "Load %d" % self.random.getrandbits(32)}
+        elif name == "autocomplete":
+            path += "?" + urlencode({"search": self.random.choice("abcdefghiklmps")})
+        if body is not None:
+            body = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+
+        started = time.perf_counter()
+        conn = http.client.HTTPConnection(*self.address, timeout=30)
+        try:
+            conn.request(method, path, body, headers)
+            response = conn.getresponse()
+            content = response.read()
+            status = response.status
+            queries = int(response.getheader(QUERY_COUNT_HEADER, 0))
+        except (OSError, http.client.HTTPException):
+            status, queries, content = 0, 0, b""
+        finally:
+            conn.close()
+        elapsed = time.perf_counter() - started
+
+        if name == "token" and status == 200:
+            self.token = json.loads(content.decode("utf-8"))["token"]
+        self.samples.append((name, status, elapsed, queries))
+
+
+def summarize(samples, duration):
+    """Aggregate (name, status, seconds, queries) samples into a report"""
+    by_name = defaultdict(list)
+    for sample in samples:
+        by_name[sample[0]].append(sample)
+        by_name["total"].append(sample)
+
+    report = OrderedDict()
+    order = [scenario[0] for scenario in SCENARIOS] + ["total"]
+    for name in order:
+        rows = by_name.get(name)
+        if not rows:
+            continue
+        latencies = sorted(row[2] * 1000 for row in rows)
+        report[name] = OrderedDict(
+            [
+                ("requests", len(rows)),
+                ("errors", sum(1 for row in rows if not 200 <= row[1] < 300)),
+                ("rps", round(len(rows) / duration, 2)),
+                ("mean_ms", round(sum(latencies) / len(latencies), 3)),
+                ("p50_ms", round(percentile(latencies, 50), 3)),
+                ("p95_ms", round(percentile(latencies, 95), 3)),
+                ("p99_ms", round(percentile(latencies, 99), 3)),
+                ("queries_per_request", round(sum(r[3] for r in rows) / len(rows), 2)),
+            ]
+        )
+
+    return report
+
+
+def run(credentials, clients, duration, requests, host="localhost", seed=0):
+    """Drive a local server with one client thread per credentials entry
+
+    Each client stops after ``requests`` requests or ``duration`` seconds,
+    whichever comes first. Returns the per scenario report.
+    """
+    with Server() as server:
+        deadline = time.monotonic() + duration
+        threads = [
+            Client(
+                server.address,
+                credentials[i % len(credentials)],
+                host,
+                deadline,
+                requests,
+                seed + i,
+            )
+            for i in range(clients)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = max(time.perf_counter() - started, 1e-9)
+
+    samples = [sample for thread in threads for sample in thread.samples]
+    return summarize(samples, elapsed)
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import autodiscover_modules
+from core.benchmarks import registry
+import json
+
+
+class Command(BaseCommand):
+    """Django command to run the registered micro benchmarks"""
+
+    help = "Run micro benchmarks and report the results as JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("suites", nargs="*", help="Suites to run, all by default")
+        parser.add_argument("--list", action="store_true", help="List the suites")
+        parser.add_argument(
+            "--quick", action="store_true", help="Run reduced sizes as a smoke test"
+        )
+
+    def handle(self, *args, **options):
+        autodiscover_modules("benchmarks")
+
+        if options["list"]:
+            for name in registry:
+                self.stdout.write(name)
+            return
+
+        names = options["suites"] or list(registry)
+        unknown = [name for name in names if name not in registry]
+        if unknown:
+            raise CommandError("Unknown benchmark: %s" % ", ".join(unknown))
+
+        report = {}
+        for name in names:
+            self.stderr.write("Running %s..." % name)
+            report[name] = registry[name](quick=options["quick"])
+
+        self.stdout.write(json.dumps(report, indent=2))
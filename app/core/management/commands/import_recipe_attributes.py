@@ -0,0 +1,207 @@
+from core.models import Tag, Ingredient, CollectionVersion, normalize_name
+from django.core.management.base import BaseCommand, CommandError
+from concurrent.futures import ProcessPoolExecutor, wait
+from django.db import connections, router, transaction
+from django.contrib.auth import get_user_model
+from django.apps import apps
+import django
+import json
+import time
+import csv
+import io
+import os
+
+MODELS = {"tag": Tag, "ingredient": Ingredient}
+
+
+def read_names(path, file_format):
+    """Yield the line number, name and error of every row of a file
+
+    Rows of CSV or JSON lines files are read. A JSON line that cannot be
+    parsed, or that is not an object, yields no name and the reason why.
+    """
+    with open(path, newline="", encoding="utf-8") as handle:
+        if file_format == "csv":
+            reader = csv.DictReader(handle)
+            for row in reader:
+                yield reader.line_num, row.get("name"), None
+        else:
+            for number, line in enumerate(handle, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as error:
+                    yield number, None, "invalid JSON (%s)" % error
+                    continue
+                if not isinstance(row, dict):
+                    yield number, None, "not a JSON object"
+                    continue
+                yield number, row.get("name"), None
+
+
+def batched(items, batch_size):
+    """Group an iterable into lists of at most batch_size items"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def copy_batch(model, user_id, names, using):
+    """Insert a batch with PostgreSQL COPY, skipping names the user has
+
+    COPY cannot skip conflicting rows, so the batch is copied into a
+    temporary table and moved over with INSERT ... ON CONFLICT DO NOTHING.
+    The table is dropped once moved, as batches may run in savepoints of
+    one enclosing transaction. Returns the number of rows inserted.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for name in names:
+        writer.writerow((name, normalize_name(name)))
+    buffer.seek(0)
+
+    connection = connections[using]
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TEMPORARY TABLE import_batch "
+            "(name varchar(255), name_key varchar(255))"
+        )
+        cursor.copy_expert(
+            "COPY import_batch (name, name_key) FROM STDIN WITH (FORMAT csv)", buffer
+        )
+        cursor.execute(
+            "INSERT INTO %s (name, name_key, user_id) "
+            "SELECT name, name_key, %%s FROM import_batch "
+            "ON CONFLICT (user_id, name_key) DO NOTHING" % table,
+            [user_id],
+        )
+        inserted = cursor.rowcount
+        cursor.execute("DROP TABLE import_batch")
+
+    return inserted
+
+
+def insert_batch(model_name, user_id, names):
+    """Insert one batch of names for a user in its own transaction
+
+    Returns the number of names inserted, names the user already has
+    being skipped.
+    """
+    model = MODELS[model_name]
+    using = router.db_for_write(model)
+    with transaction.atomic(using=using):
+        if connections[using].vendor != "postgresql":
+            return model.objects.using(using).upsert(user_id, names)[1]
+
+        inserted = copy_batch(model, user_id, names, using)
+        if inserted:
+            CollectionVersion.objects.db_manager(using).bump(
+                user_id, model._meta.model_name
+            )
+
+    return inserted
+
+
+def init_worker():
+    """Prepare a pool process to talk to the database"""
+    if not apps.ready:
+        django.setup()
+
+
+class Command(BaseCommand):
+    """Django command to bulk import tags or ingredients for a user"""
+
+    help = "Import tags or ingredients from CSV or JSON lines files"
+
+    def add_arguments(self, parser):
+        parser.add_argument("files", nargs="+", help="CSV or .jsonl files to import")
+        parser.add_argument("--model", choices=sorted(MODELS), required=True)
+        parser.add_argument("--user", required=True, help="Email of the owner")
+        parser.add_argument("--format", choices=("csv", "jsonl"))
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of processes inserting batches in parallel",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(email=options["user"])
+        except get_user_model().DoesNotExist:
+            raise CommandError("User %s does not exist" % options["user"])
+
+        self.skipped = 0
+        self.valid = 0
+        batches = batched(self.valid_names(options), options["batch_size"])
+        started = time.monotonic()
+        if options["workers"] > 1:
+            imported = self.import_parallel(options, user.pk, batches)
+        else:
+            imported = sum(
+                insert_batch(options["model"], user.pk, batch) for batch in batches
+            )
+        elapsed = max(time.monotonic() - started, 1e-9)
+
+        if self.skipped:
+            self.stdout.write("Skipped %d invalid rows" % self.skipped)
+        if self.valid > imported:
+            self.stdout.write(
+                "Skipped %d names the user already had" % (self.valid - imported)
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Imported %d rows in %.2fs (%.0f rows/s)"
+                % (imported, elapsed, imported / elapsed)
+            )
+        )
+
+    def valid_names(self, options):
+        """Stream the names of every file, skipping invalid rows"""
+        max_length = MODELS[options["model"]]._meta.get_field("name").max_length
+        for path in options["files"]:
+            file_format = options["format"] or self.guess_format(path)
+            for number, name, error in read_names(path, file_format):
+                if error is not None:
+                    self.stderr.write("%s line %d: %s" % (path, number, error))
+                name = name.strip() if isinstance(name, str) else ""
+                if not name or len(name) > max_length:
+                    self.skipped += 1
+                    continue
+                self.valid += 1
+                yield name
+
+    def guess_format(self, path):
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".csv":
+            return "csv"
+        if extension in (".jsonl", ".ndjson"):
+            return "jsonl"
+        raise CommandError("Cannot tell the format of %s, use --format" % path)
+
+    def import_parallel(self, options, user_id, batches):
+        """Spread batches across a process pool, bounding batches in flight"""
+        workers = options["workers"]
+        connections.close_all()
+
+        imported = 0
+        pending = set()
+        with ProcessPoolExecutor(workers, initializer=init_worker) as executor:
+            for batch in batches:
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when="FIRST_COMPLETED")
+                    imported += sum(future.result() for future in done)
+                pending.add(
+                    executor.submit(insert_batch, options["model"], user_id, batch)
+                )
+            imported += sum(future.result() for future in wait(pending).done)
+
+        return imported
@@ -0,0 +1,95 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth import get_user_model
+from django.test.utils import override_settings
+from core.models import Tag, Ingredient
+from core import loadtest
+import random
+import json
+import uuid
+
+WORDS = (
+    "basil chili dill garlic kale lemon mint paprika pepper salt saffron sage "
+    "thyme tomato tumeric"
+).split()
+
+
+class Command(BaseCommand):
+    """Django command to load test the API over HTTP"""
+
+    help = (
+        "Serve the API locally and drive it with concurrent token "
+        "authenticated clients, reporting latency percentiles as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=8)
+        parser.add_argument(
+            "--duration", type=float, default=10.0, help="Seconds to run for"
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=None,
+            help="Stop each client after this many requests",
+        )
+        parser.add_argument(
+            "--users", type=int, default=None, help="Users to spread clients over"
+        )
+        parser.add_argument(
+            "--rows", type=int, default=200, help="Tags and ingredients per user"
+        )
+        parser.add_argument("--host", default="localhost", help="Host header to send")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--throttle",
+            action="store_true",
+            help="Keep rate limits on; by default they would reject the load",
+        )
+
+    def handle(self, *args, **options):
+        if options["clients"] < 1:
+            raise CommandError("At least one client is required")
+
+        users = self.create_users(options)
+        try:
+            credentials = [
+                {"email": user.email, "password": self.password} for user in users
+            ]
+            with override_settings(THROTTLING_ENABLED=options["throttle"]):
+                report = loadtest.run(
+                    credentials,
+                    clients=options["clients"],
+                    duration=options["duration"],
+                    requests=options["requests"] or float("inf"),
+                    host=options["host"],
+                    seed=options["seed"],
+                )
+        finally:
+            get_user_model().objects.filter(pk__in=[user.pk for user in users]).delete()
+
+        report["config"] = {
+            key: options[key] for key in ("clients", "duration", "requests", "rows")
+        }
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def create_users(self, options):
+        """Create throw away users owning some tags and ingredients"""
+        rng = random.Random(options["seed"])
+        run_id = uuid.uuid4().hex[:8]
+        self.password = uuid.uuid4().hex
+        users = []
+        for i in range(options["users"] or options["clients"]):
+            email = "loadtest-%s-%d@example.com" % (run_id, i)
+            user = get_user_model().objects.create_user(email, self.password)
+            for model in (Tag, Ingredient):
+                # Repeated names resolve to one row, as they would over the API
+                model.objects.upsert(
+                    user.pk,
+                    (
+                        " ".join(rng.sample(WORDS, 2)).title()
+                        for _ in range(options["rows"])
+                    ),
+                )
+            users.append(user)
+
+        return users
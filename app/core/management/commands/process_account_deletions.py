@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+from core.deletion import process_deletion
+from core.models import AccountDeletion
+from django.utils import timezone
+from django.db.models import Q
+import datetime
+
+
+class Command(BaseCommand):
+    """Django command to delete the data of accounts pending deletion"""
+
+    help = (
+        "Delete the data of accounts whose deletion is pending, failed or "
+        "stuck, e.g. after the process running it was stopped"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=30,
+            help="Minutes after which a running deletion is taken over",
+        )
+
+    def handle(self, *args, **options):
+        stale = timezone.now() - datetime.timedelta(minutes=options["stale_after"])
+        deletions = AccountDeletion.objects.filter(
+            Q(status__in=(AccountDeletion.PENDING, AccountDeletion.FAILED))
+            | Q(status=AccountDeletion.RUNNING, started_at__lt=stale)
+        ).order_by("id")
+
+        failed = 0
+        for deletion_id in deletions.values_list("id", flat=True):
+            try:
+                deletion = process_deletion(deletion_id, options["batch_size"])
+            except Exception as exc:
+                failed += 1
+                self.stderr.write("Deletion %d failed: %s" % (deletion_id, exc))
+                continue
+            self.stdout.write(
+                "Deleted user %s (%d rows)" % (deletion.user_id, deletion.rows_deleted)
+            )
+
+        if failed:
+            raise CommandError("%d deletions failed" % failed)
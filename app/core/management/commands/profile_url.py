@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from core.profiling import PROFILERS
+import json
+
+
+class Command(BaseCommand):
+    """Django command to profile a request made through the test client"""
+
+    help = "Profile a request to a URL and print or save the profile"
+
+    def add_arguments(self, parser):
+        parser.add_argument("url", help="Path of the request, e.g. /api/recipe/tags/")
+        parser.add_argument("--method", default="GET")
+        parser.add_argument("--data", help="JSON request body")
+        parser.add_argument("--user", help="Email of the user to authenticate as")
+        parser.add_argument("--profiler", choices=sorted(PROFILERS), default="cprofile")
+        parser.add_argument(
+            "--repeat", type=int, default=1, help="Requests to profile together"
+        )
+        parser.add_argument(
+            "--warmup", type=int, default=1, help="Unprofiled requests sent first"
+        )
+        parser.add_argument("--output", help="File to write the raw profile to")
+        parser.add_argument("--limit", type=int, default=30)
+
+    def handle(self, *args, **options):
+        client = APIClient(SERVER_NAME="localhost")
+        if options["user"]:
+            try:
+                user = get_user_model().objects.get(email=options["user"])
+            except get_user_model().DoesNotExist:
+                raise CommandError("User %s does not exist" % options["user"])
+            client.force_authenticate(user)
+
+        def request():
+            return client.generic(
+                options["method"].upper(),
+                options["url"],
+                options["data"] or "",
+                content_type="application/json",
+            )
+
+        for _ in range(options["warmup"]):
+            request()
+
+        profiler = PROFILERS[options["profiler"]]()
+        with profiler:
+            for _ in range(options["repeat"]):
+                response = request()
+
+        self.stderr.write(
+            "%s %s -> %d"
+            % (options["method"].upper(), options["url"], response.status_code)
+        )
+        if response.status_code >= 400:
+            self.stderr.write(json.dumps(getattr(response, "data", None), default=str))
+
+        if options["output"]:
+            with open(options["output"], "wb") as handle:
+                handle.write(profiler.data())
+            self.stderr.write("Profile written to %s" % options["output"])
+        self.stdout.write(profiler.summary(options["limit"]))
@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand, CommandError
+from core.provisioning import provision_users
+from django.conf import settings
+import json
+import csv
+import os
+
+
+def read_rows(path, file_format):
+    """Yield a dict per user of a CSV or JSON lines file"""
+    with open(path, newline="", encoding="utf-8") as handle:
+        if file_format == "csv":
+            yield from csv.DictReader(handle)
+        else:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class Command(BaseCommand):
+    """Django command to create users in bulk"""
+
+    help = (
+        "Create users from CSV or JSON lines files with email, name and "
+        "password columns; users without a password cannot log in until "
+        "they set one"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("files", nargs="+", help="CSV or .jsonl files")
+        parser.add_argument("--format", choices=("csv", "jsonl"))
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=getattr(settings, "USER_PROVISION_WORKERS", 1),
+            help="Number of processes hashing passwords",
+        )
+
+    def handle(self, *args, **options):
+        rows = []
+        for path in options["files"]:
+            file_format = options["format"] or self.guess_format(path)
+            rows.extend(read_rows(path, file_format))
+
+        report = provision_users(
+            rows, batch_size=options["batch_size"], workers=options["workers"]
+        )
+
+        for error in report["errors"]:
+            self.stderr.write("Row %(row)d (%(email)s): %(error)s" % error)
+        if report["existing"]:
+            self.stdout.write("Skipped %d existing users" % len(report["existing"]))
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Created %d users in %.2fs (%.1f users/s)"
+                % (report["created"], report["seconds"], report["users_per_sec"])
+            )
+        )
+
+    def guess_format(self, path):
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".csv":
+            return "csv"
+        if extension in (".jsonl", ".ndjson"):
+            return "jsonl"
+        raise CommandError("Cannot tell the format of %s, use --format" % path)
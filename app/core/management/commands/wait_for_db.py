@@ -1,23 +1,58 @@
-from django.core.management.base import BaseCommand
-from django.db.utils import OperationalError
+from django.core.management.base import BaseCommand, CommandError
+from core.readiness import wait_until_ready
 from django.db import connections
-import time
 
 
 class Command(BaseCommand):
     """Django command to pause execution until database is available"""
 
+    help = (
+        "Wait until every database accepts connections, retrying with "
+        "exponential backoff, and fail once the timeout is reached"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            action="append",
+            dest="databases",
+            choices=list(connections),
+            help="Alias to wait for, may be repeated; all aliases by default",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=60,
+            help="Seconds to wait before failing, 0 waits forever",
+        )
+        parser.add_argument(
+            "--check-migrations",
+            action="store_true",
+            help="Also wait until every migration has been applied",
+        )
+
     def handle(self, *args, **options):
         self.stdout.write("Waiting for database...")
+        self.stdout.write("Obtain cursor and verify database...")
 
-        cursor = None
-        while not cursor:
-            try:
-                db_conn = connections["default"]
-                self.stdout.write("Obtain cursor and verify database...")
-                cursor = db_conn.cursor()
-            except OperationalError:
-                self.stdout.write("Database unavailable waiting 1 second...")
-                time.sleep(1)
+        results = wait_until_ready(
+            options["databases"],
+            migrations=options["check_migrations"],
+            timeout=options["timeout"],
+            on_retry=self.on_retry,
+        )
 
+        failed = ["%s: %s" % (alias, d) for alias, (ok, d) in results.items() if not ok]
+        if failed:
+            raise CommandError(
+                "Database unavailable after %ss (%s)"
+                % (options["timeout"], "; ".join(failed))
+            )
         self.stdout.write(self.style.SUCCESS("Database available"))
+
+    def on_retry(self, failing, delay):
+        self.stdout.write(
+            "Database unavailable (%s) waiting %.1f seconds..."
+            % (", ".join(sorted(failing)), delay)
+        )
+        self.stdout.write("Obtain cursor and verify database...")
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from core.warmup import STEPS, warm_up
+import json
+
+
+class Command(BaseCommand):
+    """Django command to run the WSGI warm up and report its timings"""
+
+    help = "Run the warm up steps of the WSGI entry point and print timings"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "steps",
+            nargs="*",
+            choices=[name for name, _ in STEPS],
+            help="Steps to run, all by default",
+        )
+
+    def handle(self, *args, **options):
+        report = warm_up(options["steps"] or None)
+        self.stdout.write(json.dumps(report, indent=2))
@@ -0,0 +1,213 @@
+from rest_framework.exceptions import AuthenticationFailed
+from core.authentication import CachedTokenAuthentication
+from django.http import HttpResponse
+from core.profiling import PROFILERS
+from django.db import connections
+from django.conf import settings
+from contextlib import ExitStack
+import logging
+import uuid
+import time
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def is_staff_request(request):
+    """Return whether the session or token user is a staff member"""
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return user.is_staff
+
+    try:
+        user_auth = CachedTokenAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return False
+    return user_auth is not None and user_auth[0].is_staff
+
+
+class RequestTimings:
+    """Query and phase timings collected while serving one request"""
+
+    def __init__(self, slow_query_threshold):
+        self.slow_query_threshold = slow_query_threshold
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.slow_queries = []
+        self.view_started = None
+        self.view_finished = None
+        self.render_finished = None
+
+    def __call__(self, execute, sql, params, many, context):
+        """Time a query; installed with connection.execute_wrapper"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.queries += 1
+            self.db_time += duration
+            if duration * 1000 >= self.slow_query_threshold:
+                alias = context["connection"].alias
+                self.slow_queries.append((duration, alias, sql))
+
+    def metrics(self, finished):
+        """Return (name, milliseconds, description) tuples for the request"""
+        total = finished - self.started
+        metrics = [("db", self.db_time, "%d queries" % self.queries)]
+        if self.view_started is not None:
+            view_finished = self.view_finished or self.render_finished or finished
+            metrics.append(("view", view_finished - self.view_started, None))
+            if self.view_finished and self.render_finished:
+                render = self.render_finished - self.view_finished
+                metrics.append(("render", render, None))
+        metrics.append(("total", total, None))
+
+        return [(name, seconds * 1000, desc) for name, seconds, desc in metrics]
+
+
+class TimingMiddleware:
+    """Measure database and view time of every request
+
+    Queries are counted and timed through ``execute_wrapper`` on every
+    connection, so it works without ``DEBUG``. The view phase runs from
+    URL resolution until the view returns and includes the database time
+    it caused, the render phase covers rendering template and DRF
+    responses. The figures are sent in a ``Server-Timing`` header to staff
+    users, or to everyone with ``DEBUG``, as they would tell anyone else
+    how long e.g. a password check took. Requests or queries slower than
+    ``SLOW_REQUEST_THRESHOLD_MS`` and ``SLOW_QUERY_THRESHOLD_MS`` are
+    logged with the resolved view name.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = RequestTimings(getattr(settings, "SLOW_QUERY_THRESHOLD_MS", 100))
+        request._timings = timings
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timings))
+            response = self.get_response(request)
+        finished = time.perf_counter()
+
+        metrics = timings.metrics(finished)
+        if getattr(settings, "SERVER_TIMING_ENABLED", True) and (
+            settings.DEBUG or is_staff_request(request)
+        ):
+            response["Server-Timing"] = ", ".join(
+                self.format_metric(*metric) for metric in metrics
+            )
+        self.log_slow(request, response, timings, metrics)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._timings.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        timings = request._timings
+        timings.view_finished = time.perf_counter()
+        response.add_post_render_callback(self.mark_rendered(timings))
+        return response
+
+    def mark_rendered(self, timings):
+        def callback(response):
+            timings.render_finished = time.perf_counter()
+
+        return callback
+
+    def format_metric(self, name, duration, desc):
+        metric = "%s;dur=%.3f" % (name, duration)
+        if desc:
+            metric += ';desc="%s"' % desc
+        return metric
+
+    def log_slow(self, request, response, timings, metrics):
+        """Log the request and its queries if they crossed the thresholds"""
+        match = getattr(request, "resolver_match", None)
+        view_name = match.view_name if match else None
+        for duration, alias, sql in timings.slow_queries:
+            logger.warning(
+                "Slow query (%.1f ms) on %s in %s: %s",
+                duration * 1000,
+                alias,
+                view_name,
+                sql,
+            )
+
+        total = metrics[-1][1]
+        if total >= getattr(settings, "SLOW_REQUEST_THRESHOLD_MS", 500):
+            logger.warning(
+                "Slow request (%.1f ms) %s %s %s status=%d %s",
+                total,
+                view_name,
+                request.method,
+                request.path,
+                response.status_code,
+                " ".join("%s=%.1fms" % (name, ms) for name, ms, _ in metrics[:-1]),
+            )
+
+
+class ProfilingMiddleware:
+    """Profile single requests on demand for staff users
+
+    Disabled unless ``PROFILING_ENABLED`` is set. A request sending an
+    ``X-Profile`` header or a ``profile`` query parameter naming a profiler
+    (``cprofile`` or ``sample``) has its view and rendering run under it.
+    With ``PROFILING_OUTPUT_DIR`` set the profile is written there and named
+    in the ``X-Profile`` response header, otherwise the profile replaces
+    the response body. Only staff users, authenticated by session or
+    token, can profile; for anyone else the flag is ignored.
+
+    Must be the last middleware, it calls the view itself.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not getattr(settings, "PROFILING_ENABLED", False):
+            return None
+
+        mode = request.META.get("HTTP_X_PROFILE") or request.GET.get("profile")
+        if not mode:
+            return None
+        profiler_class = PROFILERS.get(mode, PROFILERS["cprofile"])
+        if not is_staff_request(request):
+            return None
+
+        interval = getattr(settings, "PROFILING_SAMPLE_INTERVAL", 0.001)
+        profiler = profiler_class(interval=interval)
+        with profiler:
+            response = view_func(request, *view_args, **view_kwargs)
+            if hasattr(response, "render") and callable(response.render):
+                response = response.render()
+
+        return self.profile_response(request, response, profiler)
+
+    def profile_response(self, request, response, profiler):
+        """Store the profile or return it in place of the response"""
+        view_name = request.resolver_match.view_name or "view"
+        filename = "%s-%s-%s.%s" % (
+            time.strftime("%Y%m%d-%H%M%S"),
+            view_name.replace(":", "-"),
+            uuid.uuid4().hex[:8],
+            profiler.extension,
+        )
+        output_dir = getattr(settings, "PROFILING_OUTPUT_DIR", None)
+        if output_dir:
+            with open(os.path.join(output_dir, filename), "wb") as handle:
+                handle.write(profiler.data())
+            response["X-Profile"] = filename
+            return response
+
+        profile = HttpResponse(profiler.data(), content_type=profiler.content_type)
+        profile["Content-Disposition"] = 'attachment; filename="%s"' % filename
+        profile["X-Profile-Status"] = str(response.status_code)
+        return profile
@@ -0,0 +1,69 @@
+# Generated by Django 2.1.15 on 2026-10-18 02:51
+
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+def populate_name_key(apps, schema_editor):
+    """Fill in the normalized name of every existing tag and ingredient
+
+    A single LOWER() pass covers most rows, the remaining rows whose case
+    folded form differs are then corrected one by one while streaming.
+    """
+    for model_name in ("Tag", "Ingredient"):
+        model = apps.get_model("core", model_name)
+        objects = model.objects.using(schema_editor.connection.alias)
+        objects.update(name_key=Lower("name"))
+
+        rows = objects.values_list("pk", "name", "name_key").iterator(chunk_size=2000)
+        for pk, name, name_key in rows:
+            normalized = name.casefold()[:255]
+            if normalized != name_key:
+                objects.filter(pk=pk).update(name_key=normalized)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_ingredient"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ingredient",
+            name="name_key",
+            field=models.CharField(default="", editable=False, max_length=255),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="tag",
+            name="name_key",
+            field=models.CharField(default="", editable=False, max_length=255),
+            preserve_default=False,
+        ),
+        migrations.RunPython(populate_name_key, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="ingredient",
+            index=models.Index(
+                fields=["user", "name", "id"], name="core_ingredient_user_name_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ingredient",
+            index=models.Index(
+                fields=["user", "name_key"], name="core_ingredient_user_key_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tag",
+            index=models.Index(
+                fields=["user", "name", "id"], name="core_tag_user_name_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tag",
+            index=models.Index(
+                fields=["user", "name_key"], name="core_tag_user_key_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+TABLES = ("core_tag", "core_ingredient")
+
+
+def create_prefix_indexes(apps, schema_editor):
+    """Index name_key for LIKE 'prefix%' lookups on PostgreSQL
+
+    The (user, name_key) indexes use the database collation, which cannot
+    serve LIKE on non C locales, so PostgreSQL gets varchar_pattern_ops
+    indexes. Other backends seek the existing indexes with a range.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for table in TABLES:
+        schema_editor.execute(
+            "CREATE INDEX %s_user_key_prefix_idx ON %s "
+            "(user_id, name_key varchar_pattern_ops)" % (table, table)
+        )
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for table in TABLES:
+        schema_editor.execute("DROP INDEX IF EXISTS %s_user_key_prefix_idx" % table)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_collectionversion"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 2.1.15 on 2026-10-18 03:18
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_recipe_attribute_prefix_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Recipe",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("title", models.CharField(max_length=255)),
+                ("time_minutes", models.IntegerField()),
+                ("price", models.DecimalField(decimal_places=2, max_digits=5)),
+                ("link", models.CharField(blank=True, max_length=255)),
+                ("ingredients", models.ManyToManyField(to="core.Ingredient")),
+                ("tags", models.ManyToManyField(to="core.Tag")),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="recipe",
+            index=models.Index(fields=["user", "id"], name="core_recipe_user_id_idx"),
+        ),
+    ]
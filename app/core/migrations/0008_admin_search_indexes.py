@@ -0,0 +1,46 @@
+from django.db import migrations
+
+TABLES = ("core_tag", "core_ingredient")
+
+
+def create_search_indexes(apps, schema_editor):
+    """Index the columns searched from the admin across all users
+
+    PostgreSQL gets pattern ops indexes for the LIKE 'prefix%' lookups of
+    the email and name searches. Other backends seek name_key with a range
+    and get a plain index for it.
+    """
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX core_user_email_prefix_idx ON core_user "
+            "(UPPER(email) text_pattern_ops)"
+        )
+        for table in TABLES:
+            schema_editor.execute(
+                "CREATE INDEX %s_key_prefix_idx ON %s "
+                "(name_key varchar_pattern_ops)" % (table, table)
+            )
+        return
+
+    for table in TABLES:
+        schema_editor.execute(
+            "CREATE INDEX %s_key_prefix_idx ON %s (name_key)" % (table, table)
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS core_user_email_prefix_idx")
+    for table in TABLES:
+        schema_editor.execute("DROP INDEX IF EXISTS %s_key_prefix_idx" % table)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_recipe"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
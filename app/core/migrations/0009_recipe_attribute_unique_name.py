@@ -0,0 +1,82 @@
+from django.db import migrations, transaction
+from django.db.models import Count, F, Min
+
+BATCH_SIZE = 1000
+
+
+def merge_duplicates(apps, schema_editor):
+    """Merge the attributes sharing a name_key into their oldest row
+
+    Recipes are relinked to the kept row before the duplicates are
+    deleted, and the collection version of every owner is bumped so ETags
+    and cached lists listing the duplicates are not served again. Each
+    batch of duplicate names commits on its own, so large tables are not
+    locked for the whole merge.
+    """
+    using = schema_editor.connection.alias
+    Recipe = apps.get_model("core", "Recipe")
+    versions = apps.get_model("core", "CollectionVersion").objects.using(using)
+    for model_name, relation in (("Tag", "tags"), ("Ingredient", "ingredients")):
+        model = apps.get_model("core", model_name)
+        links = getattr(Recipe, relation).through.objects.using(using)
+        column = "%s_id" % model_name.lower()
+        groups = (
+            model.objects.using(using)
+            .values("user_id", "name_key")
+            .annotate(keep=Min("id"), rows=Count("id"))
+            .filter(rows__gt=1)
+            .order_by()
+        )
+        while True:
+            with transaction.atomic(using=using):
+                batch = list(groups[:BATCH_SIZE])
+                if not batch:
+                    break
+                for group in batch:
+                    duplicates = list(
+                        model.objects.using(using)
+                        .filter(user_id=group["user_id"], name_key=group["name_key"])
+                        .exclude(id=group["keep"])
+                        .values_list("id", flat=True)
+                    )
+                    linked = links.filter(**{column: group["keep"]})
+                    moved = links.filter(**{"%s__in" % column: duplicates})
+                    # One link per recipe may move, the others are dropped
+                    moved.filter(recipe_id__in=linked.values("recipe_id")).delete()
+                    first = moved.values("recipe_id").annotate(first=Min("id"))
+                    moved.exclude(id__in=first.values("first")).delete()
+                    moved.update(**{column: group["keep"]})
+                    model.objects.using(using).filter(id__in=duplicates).delete()
+                versions.filter(
+                    user_id__in={group["user_id"] for group in batch},
+                    collection=model_name.lower(),
+                ).update(version=F("version") + 1)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("core", "0008_admin_search_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name="ingredient",
+            unique_together={("user", "name_key")},
+        ),
+        migrations.AlterUniqueTogether(
+            name="tag",
+            unique_together={("user", "name_key")},
+        ),
+        migrations.RemoveIndex(
+            model_name="ingredient",
+            name="core_ingredient_user_key_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="tag",
+            name="core_tag_user_key_idx",
+        ),
+    ]
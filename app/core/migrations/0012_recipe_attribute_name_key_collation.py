@@ -0,0 +1,58 @@
+from django.db import migrations
+
+TABLES = ("core_tag", "core_ingredient")
+
+
+def use_c_collation(apps, schema_editor):
+    """Store name_key with the C collation on PostgreSQL
+
+    Under any other collation a B-tree on name_key can serve either the
+    LIKE prefix filter, through pattern ops, or the ORDER BY, but not
+    both. With the C collation the (user, name_key) unique index serves
+    prefix ranges and name_key ordering alike, as on SQLite, so the
+    pattern ops indexes are replaced. Only the collation changes, so the
+    table is not rewritten, but the indexes on name_key are rebuilt.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for table in TABLES:
+        schema_editor.execute(
+            'ALTER TABLE %s ALTER COLUMN name_key TYPE varchar(255) COLLATE "C"' % table
+        )
+        schema_editor.execute("DROP INDEX IF EXISTS %s_user_key_prefix_idx" % table)
+        schema_editor.execute("DROP INDEX IF EXISTS %s_key_prefix_idx" % table)
+        schema_editor.execute(
+            "CREATE INDEX %s_key_prefix_idx ON %s (name_key)" % (table, table)
+        )
+
+
+def use_default_collation(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for table in TABLES:
+        schema_editor.execute("DROP INDEX IF EXISTS %s_key_prefix_idx" % table)
+        schema_editor.execute(
+            'ALTER TABLE %s ALTER COLUMN name_key TYPE varchar(255) COLLATE "default"'
+            % table
+        )
+        schema_editor.execute(
+            "CREATE INDEX %s_key_prefix_idx ON %s "
+            "(name_key varchar_pattern_ops)" % (table, table)
+        )
+        schema_editor.execute(
+            "CREATE INDEX %s_user_key_prefix_idx ON %s "
+            "(user_id, name_key varchar_pattern_ops)" % (table, table)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0011_recipe_attribute_user_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(use_c_collation, use_default_collation),
+    ]
@@ -0,0 +1,27 @@
+from rest_framework.permissions import SAFE_METHODS
+from core.db.routers import replica_reads
+
+
+class ReplicaReadMixin:
+    """Serve the safe requests of a view from a read replica
+
+    Authentication and permission checks run against the primary first;
+    only the handler's reads go to a replica. Writes pin the user to the
+    primary for a short while so the next reads see them.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        routing = replica_reads(
+            request.user.pk if request.user.is_authenticated else None,
+            reads=request.method in SAFE_METHODS,
+        )
+        routing.__enter__()
+        self._replica_routing = routing
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        routing = getattr(self, "_replica_routing", None)
+        if routing is not None:
+            routing.__exit__(None, None, None)
+            self._replica_routing = None
+        return super().finalize_response(request, response, *args, **kwargs)
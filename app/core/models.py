@@ -3,8 +3,11 @@ from django.contrib.auth.models import (
     BaseUserManager,
     PermissionsMixin,
 )
+from django.db.models import F
 from django.conf import settings
-from django.db import models
+from django.db import connections, models, transaction
+import random
+import sys
 
 
 class UserManager(BaseUserManager):
@@ -41,27 +44,318 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = "email"
 
 
-class Tag(models.Model):
-    """Tags to be used for a recipe"""
+def normalize_name(name):
+    """Return the case folded key used to order and look up names"""
+    return name.casefold()[:255]
+
+
+class RecipeAttributeQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        """Creates objects in bulk, filling in their normalized names"""
+        objs = list(objs)
+        for obj in objs:
+            obj.name_key = normalize_name(obj.name)
+
+        created = super().bulk_create(objs, *args, **kwargs)
+        collection = self.model._meta.model_name
+        for user_id in {obj.user_id for obj in objs}:
+            CollectionVersion.objects.db_manager(self.db).bump(user_id, collection)
+
+        return created
+
+    def upsert(self, user_id, names, batch_size=1000):
+        """Create the names a user does not have yet, ignoring case
+
+        Returns the objects for names in order, existing ones included, and
+        the number of rows inserted. Names matching the same key map to
+        one object, which keeps the name it was first stored with.
+        PostgreSQL inserts and reads back each batch in one statement;
+        SQLite inserts with INSERT OR IGNORE and reads the batch back.
+        """
+        self._for_write = True
+        names = list(names)
+        pending = {}
+        for name in names:
+            pending.setdefault(normalize_name(name), name)
+
+        connection = connections[self.db]
+        fields = [self.model._meta.get_field(f) for f in ("name", "name_key", "user")]
+        batch_size = max(
+            min(batch_size, connection.ops.bulk_batch_size(fields, names)), 1
+        )
+        items = list(pending.items())
+        by_key = {}
+        created = 0
+        with transaction.atomic(using=self.db, savepoint=False):
+            for start in range(0, len(items), batch_size):
+                stop = start + batch_size
+                batch = items[start:stop]
+                if connection.vendor == "postgresql":
+                    rows, inserted = self._insert_returning(connection, user_id, batch)
+                elif connection.vendor == "sqlite":
+                    rows, inserted = self._insert_or_ignore(connection, user_id, batch)
+                else:
+                    rows, inserted = self._get_or_create_each(user_id, batch)
+                for row in rows:
+                    obj = self.model.from_db(
+                        self.db, ("id", "name", "name_key", "user_id"), row
+                    )
+                    by_key[obj.name_key] = obj
+                created += inserted
+
+            # Rows committed by concurrent transactions after the snapshot
+            missing = [key for key in pending if key not in by_key]
+            if missing:
+                for obj in self.filter(user_id=user_id, name_key__in=missing):
+                    by_key[obj.name_key] = obj
+
+            if created:
+                CollectionVersion.objects.db_manager(self.db).bump(
+                    user_id, self.model._meta.model_name
+                )
+
+        return [by_key[normalize_name(name)] for name in names], created
+
+    def _insert_returning(self, connection, user_id, batch):
+        """Insert with ON CONFLICT DO NOTHING, selecting existing rows too
+
+        The select runs on the snapshot taken before the insert, so it
+        only sees the rows that already existed. Unlike DO UPDATE, nothing
+        is written for names that exist.
+        """
+        sql = (
+            "WITH input (name, name_key) AS (VALUES {values}), "
+            "inserted AS ("
+            "INSERT INTO {table} (name, name_key, user_id) "
+            "SELECT name, name_key, %s FROM input "
+            "ON CONFLICT (user_id, name_key) DO NOTHING "
+            "RETURNING id, name, name_key, user_id"
+            ") "
+            "SELECT id, name, name_key, user_id, true FROM inserted "
+            "UNION ALL "
+            "SELECT id, name, name_key, user_id, false FROM {table} "
+            "WHERE user_id = %s AND name_key IN (SELECT name_key FROM input)"
+        ).format(
+            table=connection.ops.quote_name(self.model._meta.db_table),
+            values=", ".join(["(%s, %s)"] * len(batch)),
+        )
+        params = [value for key, name in batch for value in (name, key)]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params + [user_id, user_id])
+            rows = cursor.fetchall()
+
+        return [row[:4] for row in rows], sum(row[4] for row in rows)
+
+    def _insert_or_ignore(self, connection, user_id, batch):
+        sql = "INSERT OR IGNORE INTO %s (name, name_key, user_id) VALUES %s" % (
+            connection.ops.quote_name(self.model._meta.db_table),
+            ", ".join(["(%s, %s, %s)"] * len(batch)),
+        )
+        params = [value for key, name in batch for value in (name, key, user_id)]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            inserted = cursor.rowcount
+
+        rows = self.filter(user_id=user_id, name_key__in=[key for key, _ in batch])
+        return rows.values_list("id", "name", "name_key", "user_id"), inserted
+
+    def _get_or_create_each(self, user_id, batch):
+        rows = []
+        inserted = 0
+        for key, name in batch:
+            obj, created = self.get_or_create(
+                user_id=user_id, name_key=key, defaults={"name": name}
+            )
+            rows.append((obj.pk, obj.name, obj.name_key, obj.user_id))
+            inserted += created
+        return rows, inserted
+
+    def prefix_search(self, prefix):
+        """Filter to names starting with prefix, ignoring case
+
+        Matches are a half open range on name_key, which compares by code
+        point: SQLite does so by default and PostgreSQL stores the column
+        with the C collation. The (user, name_key) index thus serves both
+        the range and ordering by name_key.
+        """
+        key = normalize_name(prefix)
+        if not key:
+            return self.none()
+
+        queryset = self.filter(name_key__gte=key)
+        upper = ord(key[-1]) + 1
+        if upper > sys.maxunicode:
+            return queryset.filter(name_key__startswith=key)
+        if 0xD800 <= upper <= 0xDFFF:
+            # Surrogates cannot be encoded, nothing sorts between them
+            upper = 0xE000
+        return queryset.filter(name_key__lt=key[:-1] + chr(upper))
+
+
+class RecipeAttribute(models.Model):
+    """Base model for user owned recipe attributes"""
 
     name = models.CharField(max_length=255)
+    # Collated as "C" on PostgreSQL, see migration 0012
+    name_key = models.CharField(max_length=255, editable=False)
+    # Lookups by user are served by the (user, name_key) and (user, name)
+    # indexes, which makes a separate index on the column redundant
     user = models.ForeignKey(
         to=settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
+        db_index=False,
     )
 
+    objects = RecipeAttributeQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+        # Names are unique per user ignoring case; the constraint's index
+        # also serves lookups and ordering by (user, name_key)
+        unique_together = (("user", "name_key"),)
+
+    def validate_unique(self, exclude=None):
+        """Check the name against the user's names, as name_key is not edited"""
+        self.name_key = normalize_name(self.name)
+        if exclude is not None and "name" not in exclude:
+            exclude = [field for field in exclude if field != "name_key"]
+
+        super().validate_unique(exclude)
+
+    def save(self, *args, **kwargs):
+        """Keep the normalized name in step with the name"""
+        self.name_key = normalize_name(self.name)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "name" in update_fields:
+            kwargs["update_fields"] = set(update_fields) | {"name_key"}
+
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.name
 
 
-class Ingredient(models.Model):
+class Tag(RecipeAttribute):
+    """Tags to be used for a recipe"""
+
+    class Meta(RecipeAttribute.Meta):
+        indexes = [
+            models.Index(fields=["user", "name", "id"], name="core_tag_user_name_idx"),
+        ]
+
+
+class Ingredient(RecipeAttribute):
     """Ingredient to be used in a recipe"""
 
-    name = models.CharField(max_length=255)
+    class Meta(RecipeAttribute.Meta):
+        indexes = [
+            models.Index(
+                fields=["user", "name", "id"], name="core_ingredient_user_name_idx"
+            ),
+        ]
+
+
+class Recipe(models.Model):
+    """Recipe object"""
+
     user = models.ForeignKey(
         to=settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
     )
+    title = models.CharField(max_length=255)
+    time_minutes = models.IntegerField()
+    price = models.DecimalField(max_digits=5, decimal_places=2)
+    link = models.CharField(max_length=255, blank=True)
+    ingredients = models.ManyToManyField("Ingredient")
+    tags = models.ManyToManyField("Tag")
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "id"], name="core_recipe_user_id_idx")]
 
     def __str__(self):
-        return self.name
+        return self.title
+
+
+class CollectionVersionManager(models.Manager):
+    def initial_version(self):
+        """Returns a random starting point so versions are never reused"""
+        return random.getrandbits(48)
+
+    def current(self, user_id, collection):
+        """Returns the version of a user's collection, creating it if needed"""
+        versions = self.filter(user_id=user_id, collection=collection)
+        version = versions.values_list("version", flat=True)[:1]
+        if version:
+            return version[0]
+
+        obj, _ = self.get_or_create(
+            user_id=user_id,
+            collection=collection,
+            defaults={"version": self.initial_version()},
+        )
+        return obj.version
+
+    def bump(self, user_id, collection, create=True):
+        """Increments the version of a user's collection"""
+        versions = self.filter(user_id=user_id, collection=collection)
+        if not versions.update(version=F("version") + 1) and create:
+            self.get_or_create(
+                user_id=user_id,
+                collection=collection,
+                defaults={"version": self.initial_version()},
+            )
+
+
+class CollectionVersion(models.Model):
+    """Change counter for one user's collection of recipe attributes"""
+
+    user = models.ForeignKey(
+        to=settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+    )
+    collection = models.CharField(max_length=50)
+    version = models.BigIntegerField()
+
+    objects = CollectionVersionManager()
+
+    class Meta:
+        unique_together = (("user", "collection"),)
+
+    def __str__(self):
+        return "%s %s" % (self.collection, self.version)
+
+
+class AccountDeletion(models.Model):
+    """Progress of the background deletion of a user account
+
+    Keeps the user id rather than a foreign key so the record outlives
+    the user it describes.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUSES = (
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    )
+
+    user_id = models.IntegerField(unique=True)
+    status = models.CharField(max_length=10, choices=STATUSES, default=PENDING)
+    step = models.CharField(max_length=50, blank=True)
+    rows_deleted = models.BigIntegerField(default=0)
+    error = models.TextField(blank=True)
+    requested_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "id"], name="core_deletion_status_idx")
+        ]
+
+    def __str__(self):
+        return "user %s %s" % (self.user_id, self.status)
@@ -0,0 +1,23 @@
+from rest_framework.negotiation import DefaultContentNegotiation
+
+
+class FastContentNegotiation(DefaultContentNegotiation):
+    """Content negotiation that skips parsing for the common Accept headers
+
+    Requests that accept anything, or exactly the first renderer's media
+    type, and that do not ask for a format get the first renderer straight
+    away. Everything else goes through DRF's full negotiation.
+    """
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        accept = request.META.get("HTTP_ACCEPT", "*/*")
+        format_query_param = self.settings.URL_FORMAT_OVERRIDE
+        if (
+            renderers
+            and not format_suffix
+            and format_query_param not in request.query_params
+            and accept in ("*/*", "", renderers[0].media_type)
+        ):
+            return renderers[0], renderers[0].media_type
+
+        return super().select_renderer(request, renderers, format_suffix)
@@ -0,0 +1,24 @@
+from rest_framework.exceptions import ParseError
+from rest_framework import parsers
+from django.conf import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class JSONParser(parsers.JSONParser):
+    """JSON parser backed by orjson when it is installed"""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Parse a UTF-8 JSON body, deferring to DRF for anything else"""
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace("_", "-") != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except ValueError as exc:
+            raise ParseError("JSON parse error - %s" % exc)
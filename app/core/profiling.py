@@ -0,0 +1,98 @@
+from collections import Counter
+import threading
+import cProfile
+import marshal
+import pstats
+import sys
+import io
+
+
+class DeterministicProfiler:
+    """cProfile based profiler producing pstats data"""
+
+    extension = "prof"
+    content_type = "application/octet-stream"
+
+    def __init__(self, **kwargs):
+        self.profile = cProfile.Profile()
+
+    def __enter__(self):
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profile.disable()
+
+    def data(self):
+        """Return the profile in the binary format read by pstats.Stats"""
+        self.profile.create_stats()
+        return marshal.dumps(self.profile.stats)
+
+    def summary(self, limit=30):
+        """Return the most expensive calls by cumulative time as text"""
+        stream = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=stream)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return stream.getvalue()
+
+
+class SamplingProfiler:
+    """Statistical profiler sampling the stack of the profiled thread
+
+    A background thread reads the frame of the thread that entered the
+    profiler every ``interval`` seconds through ``sys._current_frames``.
+    The overhead does not depend on the number of calls, so the timings
+    stay close to an unprofiled run. Results are in the collapsed stack
+    format understood by flamegraph.pl and speedscope.
+    """
+
+    extension = "collapsed"
+    content_type = "text/plain; charset=utf-8"
+
+    def __init__(self, interval=0.001, **kwargs):
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread_id = None
+
+    def __enter__(self):
+        self.thread_id = threading.get_ident()
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    "%s (%s:%d)" % (code.co_name, code.co_filename, code.co_firstlineno)
+                )
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def data(self):
+        """Return one "frame;frame;frame count" line per distinct stack"""
+        lines = ("%s %d\n" % item for item in sorted(self.stacks.items()))
+        return "".join(lines).encode("utf-8")
+
+    def summary(self, limit=30):
+        """Return the leaf frames seen most often as text"""
+        leaves = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        total = sum(leaves.values()) or 1
+        lines = ["%d samples" % sum(leaves.values())]
+        for frame, count in leaves.most_common(limit):
+            lines.append("%6.1f%%  %s" % (count * 100.0 / total, frame))
+        return "\n".join(lines) + "\n"
+
+
+PROFILERS = {"cprofile": DeterministicProfiler, "sample": SamplingProfiler}
@@ -0,0 +1,142 @@
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import EmailValidator
+from concurrent.futures import ProcessPoolExecutor
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from collections import OrderedDict
+from django.apps import apps
+import django
+import time
+
+MIN_PASSWORD_LENGTH = 5
+
+
+def init_worker():
+    """Prepare a pool process to hash passwords"""
+    if not apps.ready:
+        django.setup()
+
+
+def clean_rows(rows):
+    """Validate and normalize rows of users to provision
+
+    Returns the valid rows, keyed by normalized email in input order with
+    later repeats dropped, and a list of (index, email, error) for the
+    rejected ones. The checks match what the signup endpoint enforces.
+    """
+    User = get_user_model()
+    validate_email = EmailValidator()
+    max_length = User._meta.get_field("email").max_length
+    name_length = User._meta.get_field("name").max_length
+    valid = OrderedDict()
+    errors = []
+    for index, row in enumerate(rows):
+        row = row if isinstance(row, dict) else {}
+        email = row.get("email")
+        email = (
+            User.objects.normalize_email(email.strip())
+            if isinstance(email, str)
+            else ""
+        )
+        name = row.get("name") or ""
+        password = row.get("password") or None
+        try:
+            validate_email(email)
+            if len(email) > max_length:
+                raise ValidationError("Email is too long")
+        except ValidationError:
+            errors.append((index, email, "invalid email"))
+            continue
+        if not isinstance(name, str) or len(name) > name_length:
+            errors.append((index, email, "invalid name"))
+        elif password is not None and (
+            not isinstance(password, str) or len(password) < MIN_PASSWORD_LENGTH
+        ):
+            errors.append((index, email, "invalid password"))
+        elif email in valid:
+            errors.append((index, email, "repeated email"))
+        else:
+            valid[email] = (name, password)
+
+    return valid, errors
+
+
+def hash_passwords(passwords, executor=None, workers=1):
+    """Hash passwords, across the executor's processes when given
+
+    Rows without a password get an unusable one, which costs nothing.
+    """
+    if executor is None:
+        return [make_password(password) for password in passwords]
+
+    # A few chunks per worker keeps them busy without a round trip per hash
+    chunksize = max(len(passwords) // (workers * 4), 1)
+    return list(executor.map(make_password, passwords, chunksize=chunksize))
+
+
+def insert_batch(batch, executor=None, workers=1, retry=True):
+    """Create the users of a batch that do not exist yet
+
+    Existing emails are found with one query, so only new users have
+    their passwords hashed. Returns the created and existing emails.
+    """
+    User = get_user_model()
+    emails = list(batch)
+    existing = set(
+        User.objects.filter(email__in=emails).values_list("email", flat=True)
+    )
+    new = [email for email in emails if email not in existing]
+    hashes = hash_passwords([batch[email][1] for email in new], executor, workers)
+    users = [
+        User(email=email, name=batch[email][0], password=password)
+        for email, password in zip(new, hashes)
+    ]
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+    except IntegrityError:
+        if not retry:
+            raise
+        # Another request created some of these users since the check
+        return insert_batch(batch, executor, workers, retry=False)
+
+    return new, sorted(existing)
+
+
+def provision_users(rows, batch_size=500, workers=1):
+    """Create users in bulk, hashing their passwords in parallel
+
+    rows are dicts with an email and optionally a name and password.
+    Returns a report with the created and existing emails, the rejected
+    rows and the users created per second.
+    """
+    started = time.monotonic()
+    valid, errors = clean_rows(rows)
+    items = list(valid.items())
+    created, existing = [], []
+    executor = None
+    if workers > 1 and len(items) > 1:
+        executor = ProcessPoolExecutor(workers, initializer=init_worker)
+    try:
+        for start in range(0, len(items), batch_size):
+            stop = start + batch_size
+            batch_created, batch_existing = insert_batch(
+                OrderedDict(items[start:stop]), executor, workers
+            )
+            created += batch_created
+            existing += batch_existing
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    elapsed = max(time.monotonic() - started, 1e-9)
+
+    return OrderedDict(
+        [
+            ("created", len(created)),
+            ("existing", existing),
+            ("errors", [{"row": i, "email": e, "error": m} for i, e, m in errors]),
+            ("seconds", round(elapsed, 3)),
+            ("users_per_sec", round(len(created) / elapsed, 1)),
+        ]
+    )
@@ -0,0 +1,133 @@
+from django.db.migrations.executor import MigrationExecutor
+from concurrent.futures import ThreadPoolExecutor
+from django.db.utils import DatabaseError
+from collections import OrderedDict
+from django.db import connections
+from django.conf import settings
+import threading
+import random
+import time
+
+
+def backoff_delays(initial=0.1, maximum=5.0, factor=2.0):
+    """Yield exponentially growing delays with jitter
+
+    Each delay is drawn between half and all of the exponential step so
+    that containers started together do not retry in lockstep.
+    """
+    step = initial
+    while True:
+        yield random.uniform(step / 2, step)
+        step = min(step * factor, maximum)
+
+
+def check_database(alias):
+    """Run a query on alias, raising DatabaseError when unavailable
+
+    Opening a cursor is not enough: a pooled or persistent connection can
+    hand out a cursor on a socket the server has already closed.
+    """
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+def pending_migrations(alias):
+    """Return the names of the migrations not yet applied to alias"""
+    executor = MigrationExecutor(connections[alias])
+    plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    return ["%s.%s" % (migration.app_label, migration.name) for migration, _ in plan]
+
+
+def check_alias(alias, migrations=False, close=False):
+    """Check one alias and return (ok, detail)
+
+    With close the connection is closed afterwards, for checks running in
+    short lived threads that would otherwise leak it.
+    """
+    try:
+        check_database(alias)
+        if migrations:
+            pending = pending_migrations(alias)
+            if pending:
+                return False, "%d unapplied migrations" % len(pending)
+    except DatabaseError as exc:
+        return False, str(exc).strip() or exc.__class__.__name__
+    finally:
+        if close:
+            connections[alias].close()
+
+    return True, "ok"
+
+
+def check_all(aliases=None, migrations=False):
+    """Check every alias concurrently, returning {alias: (ok, detail)}"""
+    aliases = list(aliases or connections)
+    if len(aliases) == 1:
+        return OrderedDict([(aliases[0], check_alias(aliases[0], migrations))])
+
+    with ThreadPoolExecutor(len(aliases)) as executor:
+        results = executor.map(
+            lambda alias: check_alias(alias, migrations, close=True), aliases
+        )
+        return OrderedDict(zip(aliases, results))
+
+
+def wait_until_ready(aliases=None, migrations=False, timeout=None, on_retry=None):
+    """Check aliases until they all pass or timeout seconds have elapsed
+
+    Aliases that passed are not checked again. ``on_retry`` is called with
+    the failing results and the delay before the next attempt. Returns the
+    results of the last attempt.
+    """
+    aliases = list(aliases or connections)
+    started = time.monotonic()
+    slept = 0.0
+    results = OrderedDict()
+    for delay in backoff_delays():
+        results.update(check_all(aliases, migrations))
+        aliases = [alias for alias, (ok, _) in results.items() if not ok]
+        if not aliases:
+            return results
+
+        if timeout:
+            remaining = timeout - max(time.monotonic() - started, slept)
+            if remaining <= 0:
+                return results
+            delay = min(delay, remaining)
+        if on_retry:
+            on_retry({alias: results[alias] for alias in aliases}, delay)
+        time.sleep(delay)
+        slept += delay
+
+
+class ReadinessCache:
+    """Readiness results shared by concurrent probes for a few seconds
+
+    Probes arriving while a check is running wait for its result instead
+    of starting their own, so the database sees at most one round of
+    checks per ``READINESS_CACHE_TTL`` seconds per process.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checked_at = None
+        self.results = None
+
+    def get(self):
+        ttl = getattr(settings, "READINESS_CACHE_TTL", 5)
+        with self.lock:
+            now = time.monotonic()
+            if self.checked_at is None or now - self.checked_at >= ttl:
+                migrations = getattr(settings, "READINESS_CHECK_MIGRATIONS", True)
+                self.results = check_all(migrations=migrations)
+                self.checked_at = time.monotonic()
+
+            return self.results
+
+    def clear(self):
+        with self.lock:
+            self.checked_at = None
+            self.results = None
+
+
+readiness_cache = ReadinessCache()
@@ -0,0 +1,41 @@
+from django.db.models.signals import post_delete, post_save
+from core.models import Tag, Ingredient, CollectionVersion
+from rest_framework.authtoken.models import Token
+from core.authentication import token_cache
+from django.dispatch import receiver
+from django.conf import settings
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_cached_token(sender, instance, **kwargs):
+    """Forget a token as soon as it is rotated or deleted"""
+    token_cache.invalidate(instance.key)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Forget the tokens of a user whose account has changed"""
+    token_cache.invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_save, sender=Ingredient)
+def bump_version_on_save(sender, instance, **kwargs):
+    """Mark the owner's collection as changed"""
+    CollectionVersion.objects.bump(instance.user_id, sender._meta.model_name)
+
+
+@receiver(post_delete, sender=Tag)
+@receiver(post_delete, sender=Ingredient)
+def bump_version_on_delete(sender, instance, **kwargs):
+    """Mark the owner's collection as changed
+
+    A missing counter is not created here: nobody can hold an ETag for it,
+    and creating one while the owner is being deleted would break the
+    cascade.
+    """
+    CollectionVersion.objects.bump(
+        instance.user_id, sender._meta.model_name, create=False
+    )
@@ -1,6 +1,11 @@
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
-from django.test import TestCase, Client
+from core.admin import EstimatedCountPaginator
+from django.db import connection
+from unittest.mock import patch
 from django.urls import reverse
+from core import models
 
 
 class AdminSiteTests(TestCase):
@@ -34,3 +39,89 @@ class AdminSiteTests(TestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, 200)
+
+    def test_search_users_by_email_prefix(self):
+        """Test that the user search matches the start of emails"""
+        url = reverse("admin:core_user_changelist")
+        response = self.client.get(url, {"q": "JOHN@"})
+
+        self.assertContains(response, self.user.email)
+        self.assertNotContains(response, "admin@example.com</a>")
+
+    def test_tags_are_listed_without_querying_each_owner(self):
+        """Test that the tag changelist loads owners with the tags"""
+        url = reverse("admin:core_tag_changelist")
+
+        def add_tags(start, stop):
+            for i in range(start, stop):
+                owner = get_user_model().objects.create_user(f"owner{i}@example.com")
+                models.Tag.objects.create(user=owner, name=f"Tag {i}")
+
+        add_tags(0, 2)
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(url)
+        add_tags(2, 10)
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(url)
+
+        self.assertEqual(len(many), len(few))
+        self.assertContains(response, "Tag 9")
+        self.assertNotContains(response, "total")
+
+    def test_search_ingredients_by_name_prefix(self):
+        """Test that the ingredient search matches the start of names"""
+        models.Ingredient.objects.create(user=self.user, name="Salt")
+        models.Ingredient.objects.create(user=self.user, name="Sea salt")
+        url = reverse("admin:core_ingredient_changelist")
+        response = self.client.get(url, {"q": "sal"})
+
+        self.assertContains(response, "Salt")
+        self.assertNotContains(response, "Sea salt")
+
+    def test_user_field_uses_autocomplete(self):
+        """Test that tag owners are picked with an autocomplete widget"""
+        url = reverse("admin:core_tag_add")
+        response = self.client.get(url)
+
+        self.assertContains(response, "admin-autocomplete")
+        self.assertNotContains(response, "john@example.com</option>")
+
+    def test_recipe_change_page(self):
+        """Test that the recipe edit page works"""
+        recipe = models.Recipe.objects.create(
+            user=self.user, title="Soup", time_minutes=5, price=1
+        )
+        url = reverse("admin:core_recipe_change", args=[recipe.id])
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        for i in range(3):
+            get_user_model().objects.create_user(f"user{i}@example.com", "testing")
+        self.queryset = get_user_model().objects.order_by("id")
+
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=100)
+    def test_large_estimates_are_used(self):
+        """Test that estimates above the threshold replace COUNT(*)"""
+        with patch("core.admin.estimate_count", return_value=5000000):
+            with self.assertNumQueries(0):
+                paginator = EstimatedCountPaginator(self.queryset, 100)
+                self.assertEqual(paginator.count, 5000000)
+
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=100)
+    def test_small_estimates_are_counted(self):
+        """Test that small tables get an exact count"""
+        with patch("core.admin.estimate_count", return_value=50):
+            paginator = EstimatedCountPaginator(self.queryset, 100)
+
+            self.assertEqual(paginator.count, 3)
+
+    def test_exact_count_without_estimate(self):
+        """Test that backends without estimates are counted exactly"""
+        paginator = EstimatedCountPaginator(self.queryset, 100)
+
+        self.assertEqual(paginator.count, 3)
@@ -0,0 +1,136 @@
+from core.authentication import CachedTokenAuthentication, TokenCache, token_cache
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.authtoken.models import Token
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.test import TestCase
+from django.urls import reverse
+
+ME_URL = reverse("user:me")
+
+
+class TokenCacheTests(TestCase):
+    """Test the bounded token cache"""
+
+    def setUp(self) -> None:
+        self.now = 0
+        self.cache = TokenCache(max_size=2, ttl=10, clock=lambda: self.now)
+        self.users = [
+            get_user_model().objects.create_user(f"user{i}@example.com", "testing")
+            for i in range(3)
+        ]
+        self.tokens = [Token.objects.create(user=user) for user in self.users]
+
+    def test_cache_hit_returns_fresh_instances(self):
+        """Test that every hit builds new user and token instances"""
+        user, token = self.users[0], self.tokens[0]
+        self.cache.set(token.key, user, token)
+
+        first_user, first_token = self.cache.get(token.key)
+        second_user, _ = self.cache.get(token.key)
+
+        self.assertEqual(first_user, user)
+        self.assertEqual(first_token.user, user)
+        self.assertIsNot(first_user, second_user)
+        self.assertEqual(self.cache.stats()["hits"], 2)
+
+    def test_cache_miss_is_counted(self):
+        """Test that looking up an unknown key counts as a miss"""
+        self.assertIsNone(self.cache.get("missing"))
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_entries_expire_after_ttl(self):
+        """Test that entries are dropped once the TTL has passed"""
+        self.cache.set(self.tokens[0].key, self.users[0], self.tokens[0])
+        self.now = 10
+
+        self.assertIsNone(self.cache.get(self.tokens[0].key))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test that the cache never grows past its maximum size"""
+        for user, token in zip(self.users[:2], self.tokens[:2]):
+            self.cache.set(token.key, user, token)
+        self.cache.get(self.tokens[0].key)
+        self.cache.set(self.tokens[2].key, self.users[2], self.tokens[2])
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.get(self.tokens[1].key))
+        self.assertIsNotNone(self.cache.get(self.tokens[0].key))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_invalidate_user(self):
+        """Test that all of a user's entries can be dropped at once"""
+        self.cache.set(self.tokens[0].key, self.users[0], self.tokens[0])
+        self.cache.set(self.tokens[1].key, self.users[1], self.tokens[1])
+
+        self.cache.invalidate_user(self.users[0].pk)
+
+        self.assertIsNone(self.cache.get(self.tokens[0].key))
+        self.assertIsNotNone(self.cache.get(self.tokens[1].key))
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test authenticating requests through the token cache"""
+
+    def setUp(self) -> None:
+        token_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            "john@example.com", "Testing123"
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.auth = CachedTokenAuthentication()
+
+    def test_second_lookup_does_not_query_the_database(self):
+        """Test that a cached token is authenticated without queries"""
+        self.auth.authenticate_credentials(self.token.key)
+
+        with self.assertNumQueries(0):
+            user, token = self.auth.authenticate_credentials(self.token.key)
+
+        self.assertEqual(user, self.user)
+        self.assertEqual(token.key, self.token.key)
+
+    def test_deleted_token_is_rejected(self):
+        """Test that deleting a token invalidates the cached entry"""
+        self.auth.authenticate_credentials(self.token.key)
+        self.token.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_deactivated_user_is_rejected(self):
+        """Test that deactivating a user invalidates the cached entry"""
+        self.auth.authenticate_credentials(self.token.key)
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_password_change_refreshes_user(self):
+        """Test that a password change is visible on the next lookup"""
+        self.auth.authenticate_credentials(self.token.key)
+        self.user.set_password("NewPassword123")
+        self.user.save()
+
+        user, _ = self.auth.authenticate_credentials(self.token.key)
+
+        self.assertTrue(user.check_password("NewPassword123"))
+
+    def test_default_ttl_bounds_revocation(self):
+        """Test that other workers stop trusting a revoked token within seconds"""
+        self.assertLessEqual(token_cache.ttl, 5)
+
+    def test_token_authenticated_request(self):
+        """Test that views accept a token through the cached authentication"""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+        client.get(ME_URL)
+        response = client.get(ME_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["email"], self.user.email)
+        self.assertEqual(token_cache.stats()["hits"], 1)
@@ -1,23 +1,363 @@
-from django.core.management import call_command
+from core.management.commands.import_recipe_attributes import insert_batch
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.core.management import call_command, CommandError
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
 from django.db.utils import OperationalError
 from unittest.mock import MagicMock, patch
-from django.test import TestCase
+from core.models import Tag, Ingredient
+from core.loadtest import Server
+from collections import Counter
+from io import StringIO
+import http.client
+import tempfile
+import shutil
+import json
+import os
 
 
 class CommandTests(TestCase):
     def test_wait_for_db_ready(self):
         """Test waiting for db when db is available"""
-        conn = MagicMock(return_value=None)
-        with patch("django.db.utils.ConnectionHandler.__getitem__", return_value=conn):
-            call_command("wait_for_db")
-            conn.cursor.assert_called_once()
+        with patch("core.readiness.check_database") as check:
+            call_command("wait_for_db", stdout=StringIO())
+
+        checked = [call[0][0] for call in check.call_args_list]
+        self.assertEqual(sorted(checked), sorted(connections))
 
     @patch("time.sleep", return_value=None)
     def test_wait_for_db(self, ts):
         """Test waiting for the db"""
+        failures = {"default": [OperationalError] * 5}
+        checked = Counter()
+
+        def check_database(alias):
+            checked[alias] += 1
+            if failures.get(alias):
+                raise failures[alias].pop()
+
+        with patch("core.readiness.check_database", side_effect=check_database):
+            call_command("wait_for_db", stdout=StringIO())
+
+        self.assertEqual(checked["default"], 6)
+        self.assertEqual(set(checked), set(connections))
+        for alias in set(connections) - {"default"}:
+            self.assertEqual(checked[alias], 1)
+
+    @patch("time.sleep", return_value=None)
+    def test_wait_for_db_backs_off(self, ts):
+        """Test that retries wait longer each time, with jitter"""
+        conn = MagicMock(return_value=None)
+        with patch("django.db.utils.ConnectionHandler.__getitem__", return_value=conn):
+            conn.cursor.side_effect = [OperationalError] * 6 + [MagicMock()]
+            call_command("wait_for_db", database=["default"], stdout=StringIO())
+
+        delays = [call[0][0] for call in ts.call_args_list]
+        self.assertEqual(len(delays), 6)
+        self.assertLess(delays[0], 0.11)
+        self.assertGreater(delays[-1], delays[0])
+
+    @patch("time.sleep", return_value=None)
+    def test_wait_for_db_times_out(self, ts):
+        """Test that waiting fails once the timeout has been used up"""
         conn = MagicMock(return_value=None)
         with patch("django.db.utils.ConnectionHandler.__getitem__", return_value=conn):
-            conn.cursor.side_effect = [OperationalError] * 5 + [True]
-            call_command("wait_for_db")
+            conn.cursor.side_effect = OperationalError("connection refused")
+            with self.assertRaisesMessage(CommandError, "connection refused"):
+                call_command(
+                    "wait_for_db", database=["default"], timeout=3, stdout=StringIO()
+                )
+
+        self.assertAlmostEqual(sum(call[0][0] for call in ts.call_args_list), 3)
+
+    @patch("time.sleep", return_value=None)
+    def test_wait_for_migrations(self, ts):
+        """Test that unapplied migrations are waited for when asked"""
+        pending = [["core.0007_new"], []]
+        with patch("core.readiness.pending_migrations", side_effect=pending):
+            call_command(
+                "wait_for_db",
+                database=["default"],
+                check_migrations=True,
+                stdout=StringIO(),
+            )
+
+        self.assertEqual(ts.call_count, 1)
+
+
+class ImportRecipeAttributesTests(TestCase):
+    """Test bulk importing tags and ingredients"""
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            "john@example.com", "Testing123"
+        )
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def write_file(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(content)
+
+        return path
+
+    def test_import_csv(self):
+        """Test importing ingredients from a CSV file"""
+        path = self.write_file("ingredients.csv", 'name\nKale\nSalt\n"Oil, Olive"\n')
+        out = StringIO()
+
+        call_command(
+            "import_recipe_attributes",
+            path,
+            model="ingredient",
+            user=self.user.email,
+            batch_size=2,
+            stdout=out,
+        )
+
+        names = Ingredient.objects.filter(user=self.user).values_list("name", flat=True)
+        self.assertEqual(sorted(names), ["Kale", "Oil, Olive", "Salt"])
+        self.assertIn("Imported 3 rows", out.getvalue())
+        self.assertIn("rows/s", out.getvalue())
+
+    def test_import_jsonl_skips_invalid_rows(self):
+        """Test importing tags from JSON lines, skipping rows without a name"""
+        lines = [{"name": "Vegan"}, {"name": ""}, {"other": 1}, {"name": "Dessert"}]
+        path = self.write_file(
+            "tags.jsonl", "\n".join(json.dumps(line) for line in lines)
+        )
+        out = StringIO()
+
+        call_command(
+            "import_recipe_attributes",
+            path,
+            model="tag",
+            user=self.user.email,
+            stdout=out,
+        )
+
+        tags = Tag.objects.filter(user=self.user)
+        self.assertEqual(tags.count(), 2)
+        self.assertEqual(tags.get(name="Vegan").name_key, "vegan")
+        self.assertIn("Skipped 2 invalid rows", out.getvalue())
+
+    def test_import_jsonl_skips_malformed_lines(self):
+        """Test that unparsable or non-object lines are skipped and reported"""
+        path = self.write_file(
+            "tags.jsonl",
+            '{"name": "Vegan"}\n{"name": \n[]\n"Spicy"\n{"name": "Dessert"}\n',
+        )
+        out, err = StringIO(), StringIO()
+
+        call_command(
+            "import_recipe_attributes",
+            path,
+            model="tag",
+            user=self.user.email,
+            stdout=out,
+            stderr=err,
+        )
+
+        names = Tag.objects.filter(user=self.user).values_list("name", flat=True)
+        self.assertEqual(sorted(names), ["Dessert", "Vegan"])
+        self.assertIn("Skipped 3 invalid rows", out.getvalue())
+        self.assertIn("line 2: invalid JSON", err.getvalue())
+        self.assertIn("line 3: not a JSON object", err.getvalue())
+        self.assertIn("line 4: not a JSON object", err.getvalue())
+
+    def test_import_skips_existing_names(self):
+        """Test that names the user already has are not imported again"""
+        Ingredient.objects.create(user=self.user, name="Kale")
+        path = self.write_file("ingredients.csv", "name\nkale\nSalt\nSALT\n")
+        out = StringIO()
+
+        call_command(
+            "import_recipe_attributes",
+            path,
+            model="ingredient",
+            user=self.user.email,
+            stdout=out,
+        )
+
+        names = Ingredient.objects.filter(user=self.user).values_list("name", flat=True)
+        self.assertEqual(sorted(names), ["Kale", "Salt"])
+        self.assertIn("Skipped 2 names the user already had", out.getvalue())
+        self.assertIn("Imported 1 rows", out.getvalue())
+
+    def test_batches_in_one_transaction(self):
+        """Test that consecutive batches can share an enclosing transaction"""
+        with transaction.atomic():
+            inserted = [
+                insert_batch("tag", self.user.pk, names)
+                for names in (["Vegan", "Dessert"], ["vegan", "Spicy"])
+            ]
+
+        self.assertEqual(inserted, [2, 1])
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 3)
+
+    def test_import_unknown_user(self):
+        """Test that importing for a missing user fails"""
+        path = self.write_file("tags.csv", "name\nVegan\n")
+
+        with self.assertRaises(CommandError):
+            call_command(
+                "import_recipe_attributes", path, model="tag", user="nobody@example.com"
+            )
+
+
+class ProvisionUsersCommandTests(TestCase):
+    """Test creating users in bulk from a file"""
+
+    @override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+    def test_provision_users_csv(self):
+        """Test that users are created and bad rows reported"""
+        get_user_model().objects.create_user("jane@example.com", "Testing123")
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "users.csv")
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(
+                "email,name,password\n"
+                "john@example.com,John,Testing123\n"
+                "jane@example.com,Jane,Testing123\n"
+                "bad,Bad,Testing123\n"
+            )
+        out, err = StringIO(), StringIO()
+
+        call_command("provision_users", path, workers=1, stdout=out, stderr=err)
+
+        user = get_user_model().objects.get(email="john@example.com")
+        self.assertTrue(user.check_password("Testing123"))
+        self.assertIn("Skipped 1 existing users", out.getvalue())
+        self.assertIn("Created 1 users", out.getvalue())
+        self.assertIn("Row 2 (bad): invalid email", err.getvalue())
+
+
+class BenchmarkCommandTests(TestCase):
+    """Test the benchmark runner"""
+
+    def test_list_suites(self):
+        """Test that the registered suites are listed"""
+        out = StringIO()
+        call_command("benchmark", list=True, stdout=out)
+
+        self.assertIn("login", out.getvalue().split())
+        self.assertIn("serializers", out.getvalue().split())
+
+    def test_run_suites(self):
+        """Test that suites report their results as JSON"""
+        out = StringIO()
+        call_command(
+            "benchmark",
+            "login",
+            "serializers",
+            "renderers",
+            "autocomplete",
+            quick=True,
+            stdout=out,
+            stderr=StringIO(),
+        )
+
+        report = json.loads(out.getvalue())
+        for results in report.values():
+            self.assertTrue(results)
+            self.assertTrue(all(result["ops_per_sec"] > 0 for result in results))
+
+    def test_unknown_suite(self):
+        """Test that asking for an unknown suite fails"""
+        with self.assertRaises(CommandError):
+            call_command("benchmark", "missing")
+
+
+@override_settings(ALLOWED_HOSTS=["localhost"])
+class LoadtestCommandTests(TransactionTestCase):
+    """Test the HTTP load test harness"""
+
+    def test_report_per_endpoint(self):
+        """Test that every scenario is reported and the users are removed"""
+        out = StringIO()
+        call_command(
+            "loadtest", clients=1, requests=40, rows=5, duration=30, stdout=out
+        )
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(report["total"]["requests"], 40)
+        self.assertEqual(report["total"]["errors"], 0)
+        self.assertGreater(report["token"]["queries_per_request"], 0)
+        for key in ("rps", "p50_ms", "p95_ms", "p99_ms"):
+            self.assertGreater(report["me"][key], 0)
+        self.assertFalse(get_user_model().objects.exists())
+
+    def test_request_threads_close_connections(self):
+        """Test that each request thread closes its database connections"""
+
+        def application(environ, start_response):
+            start_response("204 No Content", [])
+            return []
+
+        with patch("core.loadtest.connections") as connections:
+            with Server(application=application) as server:
+                # Joined on exit, so the thread has finished when checked
+                server.httpd.daemon_threads = False
+                client = http.client.HTTPConnection(*server.address)
+                client.request("GET", "/")
+                client.getresponse().read()
+                client.close()
+
+        connections.close_all.assert_called_once_with()
+
+
+@override_settings(ALLOWED_HOSTS=["localhost"])
+class ProfileUrlCommandTests(TestCase):
+    """Test profiling a URL through the test client"""
+
+    def setUp(self) -> None:
+        get_user_model().objects.create_user("john@example.com", "Testing123")
+
+    def test_profile_url(self):
+        """Test that a summary is printed and the profile saved"""
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        output = os.path.join(tmpdir, "tags.prof")
+        out, err = StringIO(), StringIO()
+
+        call_command(
+            "profile_url",
+            "/api/recipe/tags/",
+            user="john@example.com",
+            output=output,
+            stdout=out,
+            stderr=err,
+        )
+
+        self.assertIn("-> 200", err.getvalue())
+        self.assertIn("cumulative", out.getvalue())
+        self.assertTrue(os.path.getsize(output))
+
+    def test_sampling_profiler(self):
+        """Test that the sampling profiler can be selected"""
+        out = StringIO()
+
+        call_command(
+            "profile_url",
+            "/api/recipe/tags/",
+            profiler="sample",
+            repeat=20,
+            stdout=out,
+            stderr=StringIO(),
+        )
+
+        self.assertIn("samples", out.getvalue())
+
+
+class WarmupCommandTests(TestCase):
+    """Test the warm up command"""
+
+    def test_report_timings(self):
+        """Test that the selected steps are timed and printed as JSON"""
+        out = StringIO()
+        call_command("warmup", "urls", "models", stdout=out)
 
-            self.assertEqual(conn.cursor.call_count, 6)
+        report = json.loads(out.getvalue())
+        self.assertEqual(list(report), ["urls", "models", "total_ms"])
@@ -0,0 +1,123 @@
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from core import deletion, models
+from django.db import connection
+from unittest.mock import patch
+from io import StringIO
+
+
+def sample_catalog(user, rows):
+    """Give a user rows tags and ingredients and a recipe using them"""
+    tags, _ = models.Tag.objects.upsert(user.pk, [f"Tag {i}" for i in range(rows)])
+    ingredients, _ = models.Ingredient.objects.upsert(
+        user.pk, [f"Ingredient {i}" for i in range(rows)]
+    )
+    recipe = models.Recipe.objects.create(
+        user=user, title="Soup", time_minutes=5, price=1
+    )
+    recipe.tags.set(tags)
+    recipe.ingredients.set(ingredients)
+    return recipe
+
+
+class AccountDeletionTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            "john@example.com", "Testing123"
+        )
+        self.other_user = get_user_model().objects.create_user(
+            "jane@example.com", "Testing123"
+        )
+
+    def test_request_deactivates_user(self):
+        """Test that a requested deletion locks the user out at once"""
+        Token.objects.create(user=self.user)
+
+        record = deletion.request_deletion(self.user)
+
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertFalse(Token.objects.filter(user=self.user).exists())
+        self.assertEqual(record.status, models.AccountDeletion.PENDING)
+        self.assertEqual(record.user_id, self.user.pk)
+
+    def test_process_deletes_account_data(self):
+        """Test that every row owned by the user is deleted in batches"""
+        sample_catalog(self.user, 5)
+        kept = sample_catalog(self.other_user, 2)
+        record = deletion.request_deletion(self.user)
+
+        record = deletion.process_deletion(record.pk, batch_size=2)
+
+        self.assertEqual(record.status, models.AccountDeletion.DONE)
+        self.assertIsNotNone(record.finished_at)
+        # 10 links, a recipe, 10 attributes, 2 versions and the user
+        self.assertEqual(record.rows_deleted, 24)
+        self.assertFalse(get_user_model().objects.filter(pk=self.user.pk).exists())
+        self.assertFalse(models.Tag.objects.filter(user_id=self.user.pk).exists())
+        self.assertFalse(models.Recipe.objects.filter(user_id=self.user.pk).exists())
+        self.assertEqual(kept.tags.count(), 2)
+        self.assertEqual(kept.ingredients.count(), 2)
+
+    def test_queries_do_not_grow_with_rows(self):
+        """Test that a batch costs the same whatever the number of rows"""
+        counts = []
+        for rows in (5, 50):
+            user = get_user_model().objects.create_user(f"user{rows}@example.com")
+            sample_catalog(user, rows)
+            record = deletion.request_deletion(user)
+
+            with CaptureQueriesContext(connection) as queries:
+                deletion.process_deletion(record.pk, batch_size=1000)
+            counts.append(len(queries))
+
+        self.assertEqual(counts[0], counts[1])
+
+    def test_failure_is_recorded(self):
+        """Test that a failing deletion is marked as failed with the error"""
+        record = deletion.request_deletion(self.user)
+
+        with patch("core.deletion.delete_batch", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError), self.assertLogs("core.deletion"):
+                deletion.process_deletion(record.pk)
+
+        record.refresh_from_db()
+        self.assertEqual(record.status, models.AccountDeletion.FAILED)
+        self.assertEqual(record.error, "boom")
+        self.assertTrue(get_user_model().objects.filter(pk=self.user.pk).exists())
+
+    def test_command_processes_pending_deletions(self):
+        """Test that the command deletes the accounts waiting for it"""
+        sample_catalog(self.user, 3)
+        deletion.request_deletion(self.user)
+        out = StringIO()
+
+        call_command("process_account_deletions", stdout=out)
+
+        self.assertIn("Deleted user %d" % self.user.pk, out.getvalue())
+        self.assertFalse(get_user_model().objects.filter(pk=self.user.pk).exists())
+        self.assertTrue(get_user_model().objects.filter(pk=self.other_user.pk).exists())
+
+
+class BackgroundDeletionTests(TransactionTestCase):
+    def test_deletion_starts_after_commit(self):
+        """Test that the background thread is started once committed"""
+        user = get_user_model().objects.create_user("john@example.com")
+
+        with patch("core.deletion.start_background") as start:
+            record = deletion.request_deletion(user)
+
+        start.assert_called_once_with(record.pk)
+
+    def test_background_thread_processes_deletion(self):
+        """Test that the thread runs the deletion and closes its connections"""
+        with patch("core.deletion.process_deletion") as process, patch(
+            "core.deletion.connections"
+        ) as connections:
+            deletion.start_background(42).join()
+
+        process.assert_called_once_with(42)
+        connections.close_all.assert_called_once()
@@ -0,0 +1,55 @@
+from django.contrib.auth.hashers import identify_hasher
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.urls import reverse
+
+TOKEN_URL = reverse("user:token")
+
+
+def iterations(user):
+    return int(user.password.split("$")[1])
+
+
+class PasswordHasherTests(TestCase):
+    """Test the settings driven password hashing"""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.payload = {"email": "john@example.com", "password": "Testing123"}
+
+    @override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+    def test_iterations_come_from_settings(self):
+        """Test that new passwords use the configured iteration count"""
+        user = get_user_model().objects.create_user(**self.payload)
+
+        self.assertEqual(identify_hasher(user.password).algorithm, "pbkdf2_sha256")
+        self.assertEqual(iterations(user), 1000)
+
+    def test_hash_is_upgraded_on_login(self):
+        """Test that logging in re-encodes a hash made with another cost"""
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=1000):
+            user = get_user_model().objects.create_user(**self.payload)
+
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            response = self.client.post(TOKEN_URL, self.payload)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertEqual(iterations(user), 2000)
+        self.assertTrue(user.check_password(self.payload["password"]))
+
+    def test_hash_is_kept_on_failed_login(self):
+        """Test that a wrong password never re-encodes the stored hash"""
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=1000):
+            user = get_user_model().objects.create_user(**self.payload)
+
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            response = self.client.post(
+                TOKEN_URL, {"email": user.email, "password": "wrong"}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        user.refresh_from_db()
+        self.assertEqual(iterations(user), 1000)
@@ -0,0 +1,97 @@
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from django.urls import reverse
+from core.models import Tag
+import re
+
+TAGS_URL = reverse("recipe:tag-list")
+
+re_metric = re.compile(r'^(\w+);dur=(\d+\.\d{3})(?:;desc="([^"]*)")?$')
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for metric in header.split(", "):
+        name, duration, desc = re_metric.match(metric).groups()
+        metrics[name] = (float(duration), desc)
+    return metrics
+
+
+class TimingMiddlewareTests(TestCase):
+    """Test the request timing middleware"""
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            "john@example.com", "Testing123"
+        )
+        self.user.is_staff = True
+        self.user.save()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_server_timing_header(self):
+        """Test that the DB, view and render phases are reported"""
+        Tag.objects.create(user=self.user, name="Vegan")
+
+        response = self.client.get(TAGS_URL)
+
+        metrics = parse_server_timing(response["Server-Timing"])
+        self.assertEqual(list(metrics), ["db", "view", "render", "total"])
+        self.assertRegex(metrics["db"][1], r"^[1-9]\d* queries$")
+        self.assertLessEqual(metrics["view"][0], metrics["total"][0])
+
+    def test_query_count_without_debug(self):
+        """Test that queries are counted while DEBUG is off"""
+        with self.settings(DEBUG=False):
+            response = self.client.get(TAGS_URL)
+
+        metrics = parse_server_timing(response["Server-Timing"])
+        self.assertNotEqual(metrics["db"][1], "0 queries")
+
+    @override_settings(SERVER_TIMING_ENABLED=False)
+    def test_header_can_be_disabled(self):
+        """Test that the header is left out when disabled"""
+        response = self.client.get(TAGS_URL)
+
+        self.assertNotIn("Server-Timing", response)
+
+    def test_header_only_sent_to_staff(self):
+        """Test that other users and anonymous clients get no timings"""
+        user = get_user_model().objects.create_user("jane@example.com", "Testing123")
+        self.client.force_authenticate(user)
+
+        response = self.client.get(TAGS_URL)
+        anonymous = APIClient().post(reverse("user:token"), {"email": "x@x.com"})
+
+        self.assertNotIn("Server-Timing", response)
+        self.assertNotIn("Server-Timing", anonymous)
+
+    def test_header_sent_to_anyone_with_debug(self):
+        """Test that everyone gets the header while DEBUG is on"""
+        with self.settings(DEBUG=True):
+            response = APIClient().get(TAGS_URL)
+
+        self.assertIn("Server-Timing", response)
+
+    @override_settings(SLOW_REQUEST_THRESHOLD_MS=0)
+    def test_slow_request_is_logged(self):
+        """Test that slow requests are logged with the view name"""
+        with self.assertLogs("core.middleware", "WARNING") as logs:
+            self.client.get(TAGS_URL)
+
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("Slow request", logs.output[0])
+        self.assertIn("recipe:tag-list GET %s status=200" % TAGS_URL, logs.output[0])
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_slow_queries_are_logged(self):
+        """Test that each slow query is logged with its SQL"""
+        with self.assertLogs("core.middleware", "WARNING") as logs:
+            self.client.get(TAGS_URL)
+
+        self.assertTrue(
+            any(
+                "recipe:tag-list" in line and "core_tag" in line for line in logs.output
+            )
+        )
@@ -1,4 +1,6 @@
+from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection
 from django.test import TestCase
 from core import models
 
@@ -53,3 +55,157 @@ class ModelTests(TestCase):
         )
 
         self.assertEqual(str(ingredient), ingredient.name)
+
+    def test_recipe_str(self):
+        """Test the recipe string representation"""
+        recipe = models.Recipe.objects.create(
+            user=sample_user(),
+            title="Steak and mushroom sauce",
+            time_minutes=5,
+            price=5.00,
+        )
+
+        self.assertEqual(str(recipe), recipe.title)
+
+    def test_name_key_is_case_folded(self):
+        """Test that the normalized name is stored when saving"""
+        tag = models.Tag.objects.create(user=sample_user(), name="Straße")
+
+        self.assertEqual(tag.name_key, "strasse")
+
+    def test_bulk_create_sets_name_key(self):
+        """Test that bulk created attributes get a normalized name"""
+        user = sample_user()
+        models.Ingredient.objects.using("default").bulk_create(
+            [models.Ingredient(user=user, name="Kale")]
+        )
+
+        ingredient = models.Ingredient.objects.get(user=user)
+        self.assertEqual(ingredient.name_key, "kale")
+
+
+class UpsertTests(TestCase):
+    def setUp(self) -> None:
+        self.user = sample_user()
+
+    def test_names_are_unique_per_user_ignoring_case(self):
+        """Test that a user cannot own two tags differing only in case"""
+        models.Tag.objects.create(user=self.user, name="Vegan")
+        models.Tag.objects.create(user=sample_user("jane@example.com"), name="Vegan")
+
+        with self.assertRaises(IntegrityError):
+            models.Tag.objects.create(user=self.user, name="VEGAN")
+
+    def test_validate_unique_checks_name(self):
+        """Test that model validation reports duplicate names"""
+        models.Tag.objects.create(user=self.user, name="Vegan")
+
+        with self.assertRaises(ValidationError):
+            models.Tag(user=self.user, name="vegan").validate_unique(
+                exclude=["name_key"]
+            )
+
+    def test_upsert_creates_missing_names(self):
+        """Test that upsert inserts new names and returns every object"""
+        vegan = models.Tag.objects.create(user=self.user, name="Vegan")
+
+        objs, created = models.Tag.objects.upsert(
+            self.user.pk, ["VEGAN", "Dessert", "dessert", "Fruity"]
+        )
+
+        self.assertEqual(created, 2)
+        self.assertEqual(
+            [obj.name for obj in objs], ["Vegan", "Dessert", "Dessert", "Fruity"]
+        )
+        self.assertEqual(objs[0].pk, vegan.pk)
+        self.assertIs(objs[1], objs[2])
+        self.assertEqual(models.Tag.objects.filter(user=self.user).count(), 3)
+        self.assertTrue(all(obj.pk for obj in objs))
+
+    def test_upsert_in_batches(self):
+        """Test that upsert splits large inputs"""
+        names = [f"Ingredient {i}" for i in range(25)]
+
+        objs, created = models.Ingredient.objects.upsert(self.user.pk, names, 10)
+
+        self.assertEqual(created, 25)
+        self.assertEqual([obj.name for obj in objs], names)
+
+    def test_upsert_queries(self):
+        """Test that an upsert of existing names only reads them back"""
+        models.Tag.objects.upsert(self.user.pk, ["Vegan", "Dessert"])
+        version = models.CollectionVersion.objects.current(self.user.pk, "tag")
+
+        # PostgreSQL inserts and reads back in one statement
+        queries = 1 if connection.vendor == "postgresql" else 2
+        with self.assertNumQueries(queries):
+            _, created = models.Tag.objects.upsert(self.user.pk, ["vegan", "Dessert"])
+
+        self.assertEqual(created, 0)
+        self.assertEqual(
+            models.CollectionVersion.objects.current(self.user.pk, "tag"), version
+        )
+
+    def test_upsert_bumps_version(self):
+        """Test that inserting names marks the collection as changed"""
+        version = models.CollectionVersion.objects.current(self.user.pk, "tag")
+
+        models.Tag.objects.upsert(self.user.pk, ["Vegan"])
+
+        self.assertNotEqual(
+            models.CollectionVersion.objects.current(self.user.pk, "tag"), version
+        )
+
+
+class IndexTests(TestCase):
+    """Test that user scoped listings are served from the composite indexes"""
+
+    def setUp(self) -> None:
+        users = [
+            get_user_model().objects.create_user(f"user{i}@example.com", "testing")
+            for i in range(5)
+        ]
+        for model in (models.Tag, models.Ingredient):
+            model.objects.bulk_create(
+                model(user=user, name=f"Name {i}") for user in users for i in range(200)
+            )
+        self.user = users[0]
+
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("ANALYZE core_tag")
+                cursor.execute("ANALYZE core_ingredient")
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            elif connection.vendor == "sqlite":
+                cursor.execute("ANALYZE")
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+        self.assertNotIn("TEMP B-TREE", plan.upper())
+        self.assertNotIn("SORT", plan.upper().replace("SORT KEY", ""))
+
+    def test_tag_listing_uses_index(self):
+        """Test that a page of a user's tags is read from the (user, name) index"""
+        queryset = models.Tag.objects.filter(user=self.user).order_by("-name", "-id")
+
+        self.assertUsesIndex(queryset[:20], "core_tag_user_name_idx")
+
+    def test_ingredient_listing_uses_index(self):
+        """Test that a keyset page of ingredients uses the (user, name) index"""
+        queryset = models.Ingredient.objects.filter(
+            user=self.user, name__lt="Name 5"
+        ).order_by("-name", "-id")
+
+        self.assertUsesIndex(queryset[:20], "core_ingredient_user_name_idx")
+
+    def test_prefix_search_uses_index(self):
+        """Test that a prefix search seeks the name_key index in order"""
+        queryset = (
+            models.Ingredient.objects.filter(user=self.user)
+            .prefix_search("name 1")
+            .order_by("name_key")[:10]
+        )
+
+        # The index of the unique (user, name_key) constraint
+        self.assertUsesIndex(queryset, "core_ingredient_user_id_name_key_")
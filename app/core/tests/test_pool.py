@@ -0,0 +1,341 @@
+from django.core.exceptions import ImproperlyConfigured
+from core.db.pool import ConnectionPool, PoolTimeout
+from django.test import SimpleTestCase, TestCase
+from django.contrib.auth import get_user_model
+from unittest.mock import MagicMock, patch
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.db import connections
+from unittest import skipUnless
+from django.urls import reverse
+from core.db import pool
+import threading
+import itertools
+
+POOLS_URL = reverse("health-pools")
+
+try:
+    from core.db.backends.postgresql import base as pooled_backend
+except ImportError:
+    pooled_backend = None
+
+
+class FakeConnection:
+    ids = itertools.count(1)
+
+    def __init__(self):
+        self.id = next(self.ids)
+        self.closed = 0
+        self.alive = True
+        self.isolation_level = None
+        self.status = 0
+        self.rollbacks = 0
+        self.queries = []
+        self._autocommit = True
+
+    @property
+    def autocommit(self):
+        return self._autocommit
+
+    @autocommit.setter
+    def autocommit(self, value):
+        if self.status != 0:
+            raise RuntimeError("set_session cannot be used inside a transaction")
+        self._autocommit = value
+
+    def close(self):
+        self.closed = 1
+
+    def get_transaction_status(self):
+        return self.status
+
+    def cursor(self):
+        cursor = MagicMock()
+        cursor.__enter__.return_value.execute.side_effect = self.execute
+        return cursor
+
+    def execute(self, sql, params=None):
+        self.queries.append(sql)
+        if not self._autocommit:
+            self.status = 2
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = 0
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    """Test the generic connection pool"""
+
+    def make_pool(self, **kwargs):
+        kwargs.setdefault("ping", lambda connection: connection.alive)
+        return ConnectionPool(FakeConnection, **kwargs)
+
+    def test_connections_are_reused(self):
+        """Test that a released connection is handed out again"""
+        pool = self.make_pool()
+        first = pool.acquire()
+        pool.release(first)
+
+        self.assertIs(pool.acquire(), first)
+        stats = pool.stats()
+        self.assertEqual((stats["created"], stats["reused"]), (1, 1))
+        self.assertEqual((stats["size"], stats["in_use"], stats["idle"]), (1, 1, 0))
+
+    def test_most_recently_released_first(self):
+        """Test that idle connections are reused newest first"""
+        pool = self.make_pool()
+        first, second = pool.acquire(), pool.acquire()
+        pool.release(first)
+        pool.release(second)
+
+        self.assertIs(pool.acquire(), second)
+
+    def test_size_is_bounded(self):
+        """Test that callers wait for a release once the pool is full"""
+        pool = self.make_pool(max_size=1, acquire_timeout=5)
+        connection = pool.acquire()
+        acquired = []
+        waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+        waiter.start()
+        waiter.join(0.05)
+
+        self.assertEqual(acquired, [])
+        pool.release(connection)
+        waiter.join(5)
+
+        self.assertEqual(acquired, [connection])
+        self.assertEqual(pool.stats()["waits"], 1)
+
+    def test_acquire_timeout(self):
+        """Test that waiting for a connection gives up after the timeout"""
+        pool = self.make_pool(max_size=1, acquire_timeout=0.01)
+        pool.acquire()
+
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+        self.assertEqual(pool.stats()["timeouts"], 1)
+
+    def test_idle_connections_expire(self):
+        """Test that connections idle for too long are closed"""
+        pool = self.make_pool(idle_timeout=0)
+        first = pool.acquire()
+        pool.release(first)
+
+        second = pool.acquire()
+
+        self.assertIsNot(second, first)
+        self.assertTrue(first.closed)
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_pre_ping_replaces_dead_connections(self):
+        """Test that a connection failing the ping is never handed out"""
+        pool = self.make_pool()
+        dead = pool.acquire()
+        pool.release(dead)
+        dead.alive = False
+
+        connection = pool.acquire()
+
+        self.assertIsNot(connection, dead)
+        self.assertTrue(dead.closed)
+        self.assertEqual(pool.stats()["ping_failures"], 1)
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_ping_errors_count_as_dead(self):
+        """Test that a ping raising an error discards the connection"""
+
+        def ping(connection):
+            raise OSError("server closed the connection")
+
+        pool = self.make_pool(ping=ping)
+        pool.release(pool.acquire())
+
+        pool.acquire()
+
+        self.assertEqual(pool.stats()["ping_failures"], 1)
+
+    def test_discard(self):
+        """Test that a discarded connection is closed and frees its slot"""
+        pool = self.make_pool(max_size=1)
+        connection = pool.acquire()
+        pool.release(connection, discard=True)
+
+        self.assertTrue(connection.closed)
+        self.assertIsNot(pool.acquire(), connection)
+
+    def test_failed_connect_frees_the_slot(self):
+        """Test that a connection error does not shrink the pool"""
+        pool = ConnectionPool(lambda: 1 / 0, max_size=1)
+
+        for _ in range(2):
+            with self.assertRaises(ZeroDivisionError):
+                pool.acquire()
+        self.assertEqual(pool.stats()["size"], 0)
+
+    def test_close_all(self):
+        """Test that every idle connection is closed"""
+        pool = self.make_pool()
+        connections = [pool.acquire() for _ in range(3)]
+        for connection in connections:
+            pool.release(connection)
+
+        pool.close_all()
+
+        self.assertTrue(all(connection.closed for connection in connections))
+        self.assertEqual(pool.stats()["size"], 0)
+
+    def test_connections_are_not_shared_after_fork(self):
+        """Test that a child process opens its own connections"""
+        pool = self.make_pool()
+        inherited = pool.acquire()
+        pool.release(inherited)
+
+        with patch("core.db.pool.os.getpid", return_value=-1):
+            connection = pool.acquire()
+            stats = pool.stats()
+
+        self.assertIsNot(connection, inherited)
+        self.assertFalse(inherited.closed)
+        self.assertEqual((stats["created"], stats["size"]), (1, 1))
+
+
+@skipUnless(pooled_backend, "psycopg2 is not installed")
+class PooledBackendTests(SimpleTestCase):
+    """Test the PostgreSQL backend borrowing pooled connections"""
+
+    def setUp(self) -> None:
+        settings_dict = {"NAME": "app", "OPTIONS": {}, "POOL": {"MAX_SIZE": 2}}
+        self.wrapper = pooled_backend.DatabaseWrapper(settings_dict, alias="pooltest")
+        self.addCleanup(pool.registry.pop, "pooltest:app", None)
+        patcher = patch.object(
+            pooled_backend.base.Database,
+            "connect",
+            side_effect=lambda **params: FakeConnection(),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def connect(self):
+        self.wrapper.connection = self.wrapper.get_new_connection({"database": "app"})
+        return self.wrapper.connection
+
+    def test_close_returns_the_connection(self):
+        """Test that closing puts the connection back into the pool"""
+        connection = self.connect()
+        self.wrapper._close()
+
+        self.assertFalse(connection.closed)
+        self.assertIs(self.connect(), connection)
+        self.assertEqual(pool.pool_stats()["pooltest:app"]["reused"], 1)
+
+    def test_open_transaction_is_rolled_back(self):
+        """Test that a connection is returned outside any transaction"""
+        connection = self.connect()
+        connection.status = pooled_backend.extensions.TRANSACTION_STATUS_INERROR
+        self.wrapper._close()
+
+        self.assertEqual(connection.rollbacks, 1)
+        self.assertIs(self.connect(), connection)
+
+    def test_connection_is_reset_for_reuse(self):
+        """Test that a connection left out of autocommit is reset on release"""
+        connection = self.connect()
+        connection.autocommit = False
+        connection.execute("SET statement_timeout = 1000")
+        self.wrapper._close()
+
+        self.assertIs(self.connect(), connection)
+        self.assertTrue(connection.autocommit)
+        self.assertEqual(connection.status, 0)
+        self.assertIn("DISCARD ALL", connection.queries)
+
+    def test_ping_leaves_no_transaction_open(self):
+        """Test that pinging a connection outside autocommit rolls back"""
+        connection = FakeConnection()
+        connection.autocommit = False
+
+        pooled_backend.ping(connection)
+
+        self.assertEqual(connection.queries, ["SELECT 1"])
+        self.assertEqual((connection.rollbacks, connection.status), (1, 0))
+
+    def test_persistent_connections_are_rejected(self):
+        """Test that CONN_MAX_AGE cannot keep pooled connections checked out"""
+        settings_dict = {"NAME": "app", "OPTIONS": {}, "CONN_MAX_AGE": 60}
+
+        with self.assertRaises(ImproperlyConfigured):
+            pooled_backend.DatabaseWrapper(settings_dict, alias="pooltest")
+
+    def test_broken_connection_is_discarded(self):
+        """Test that a connection in an unknown state is not reused"""
+        connection = self.connect()
+        connection.status = pooled_backend.extensions.TRANSACTION_STATUS_UNKNOWN
+        self.wrapper._close()
+
+        self.assertTrue(connection.closed)
+        self.assertIsNot(self.connect(), connection)
+
+
+@skipUnless(connections["default"].vendor == "postgresql", "PostgreSQL only")
+class PooledBackendPostgresTests(SimpleTestCase):
+    """Test reusing pooled connections against a real server"""
+
+    def setUp(self) -> None:
+        settings_dict = dict(
+            connections["default"].settings_dict, CONN_MAX_AGE=0, POOL={"MAX_SIZE": 1}
+        )
+        self.wrapper = pooled_backend.DatabaseWrapper(settings_dict, alias="pooltest")
+        name = "pooltest:%s" % settings_dict["NAME"]
+        self.addCleanup(lambda: pool.registry.pop(name).close_all())
+        self.addCleanup(self.wrapper.close)
+
+    def test_session_state_is_not_reused(self):
+        """Test that the next borrower gets a connection as if new"""
+        self.wrapper.ensure_connection()
+        raw = self.wrapper.connection
+        with self.wrapper.cursor() as cursor:
+            cursor.execute("SET statement_timeout = 1234")
+            cursor.execute("CREATE TEMPORARY TABLE pooltest (id int)")
+        self.wrapper.set_autocommit(False)
+        with self.wrapper.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        self.wrapper.close()
+
+        self.wrapper.ensure_connection()
+        self.assertIs(self.wrapper.connection, raw)
+        self.assertTrue(self.wrapper.get_autocommit())
+        with self.wrapper.cursor() as cursor:
+            cursor.execute("SHOW statement_timeout")
+            self.assertEqual(cursor.fetchone()[0], "0")
+            cursor.execute("SELECT to_regclass('pooltest')")
+            self.assertIsNone(cursor.fetchone()[0])
+
+
+class DatabasePoolsApiTests(TestCase):
+    """Test the pool statistics endpoint"""
+
+    def test_staff_only(self):
+        """Test that regular users cannot read the pool statistics"""
+        user = get_user_model().objects.create_user("john@example.com", "Testing123")
+        client = APIClient()
+        client.force_authenticate(user)
+
+        response = client.get(POOLS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_pool_stats(self):
+        """Test that staff users see every registered pool"""
+        user = get_user_model().objects.create_user(
+            "admin@example.com", "Testing123", is_staff=True
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+        pool.get_pool("test:app", lambda: ConnectionPool(FakeConnection))
+        self.addCleanup(pool.registry.pop, "test:app")
+
+        response = client.get(POOLS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["test:app"]["max_size"], 10)
@@ -0,0 +1,104 @@
+from core.profiling import DeterministicProfiler, SamplingProfiler
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from django.urls import reverse
+import tempfile
+import marshal
+import shutil
+import time
+import os
+
+TAGS_URL = reverse("recipe:tag-list")
+
+
+def busy_loop(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class ProfilerTests(TestCase):
+    """Test the profilers"""
+
+    def test_deterministic_profile(self):
+        """Test that cProfile output can be loaded as pstats data"""
+        profiler = DeterministicProfiler()
+        with profiler:
+            busy_loop(0.01)
+
+        stats = marshal.loads(profiler.data())
+        self.assertIn("busy_loop", [key[2] for key in stats])
+        self.assertIn("busy_loop", profiler.summary())
+
+    def test_sampled_stacks(self):
+        """Test that samples are collapsed into flamegraph stacks"""
+        profiler = SamplingProfiler(interval=0.001)
+        with profiler:
+            busy_loop(0.1)
+
+        lines = profiler.data().decode("utf-8").splitlines()
+        self.assertTrue(lines)
+        stack, count = lines[0].rsplit(" ", 1)
+        self.assertGreater(int(count), 0)
+        self.assertTrue(any("busy_loop" in line for line in lines))
+
+
+@override_settings(PROFILING_ENABLED=True, PROFILING_OUTPUT_DIR=None)
+class ProfilingMiddlewareTests(TestCase):
+    """Test on demand profiling of API requests"""
+
+    def setUp(self) -> None:
+        self.staff = get_user_model().objects.create_user(
+            "admin@example.com", "Testing123", is_staff=True
+        )
+        self.client = APIClient()
+        token = Token.objects.create(user=self.staff)
+        self.client.credentials(HTTP_AUTHORIZATION="Token %s" % token.key)
+
+    def test_staff_receives_the_profile(self):
+        """Test that a staff request with the header gets the profile back"""
+        response = self.client.get(TAGS_URL, HTTP_X_PROFILE="cprofile")
+
+        self.assertEqual(response["Content-Type"], "application/octet-stream")
+        self.assertEqual(response["X-Profile-Status"], "200")
+        self.assertTrue(marshal.loads(response.content))
+
+    def test_sampling_with_query_flag(self):
+        """Test that the query flag selects the sampling profiler"""
+        response = self.client.get(TAGS_URL, {"profile": "sample"})
+
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertIn(".collapsed", response["Content-Disposition"])
+
+    def test_profile_is_stored(self):
+        """Test that profiles are written to the output directory"""
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir)
+
+        with self.settings(PROFILING_OUTPUT_DIR=output_dir):
+            response = self.client.get(TAGS_URL, HTTP_X_PROFILE="cprofile")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, [])
+        self.assertEqual(os.listdir(output_dir), [response["X-Profile"]])
+        self.assertIn("recipe-tag-list", response["X-Profile"])
+
+    def test_non_staff_is_not_profiled(self):
+        """Test that the flag is ignored for regular users"""
+        user = get_user_model().objects.create_user("john@example.com", "Testing123")
+        client = APIClient()
+        client.force_login(user)
+
+        response = client.get(TAGS_URL, HTTP_X_PROFILE="cprofile")
+
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertNotIn("X-Profile-Status", response)
+
+    def test_disabled_by_default(self):
+        """Test that nothing is profiled unless enabled in the settings"""
+        with self.settings(PROFILING_ENABLED=False):
+            response = self.client.get(TAGS_URL, HTTP_X_PROFILE="cprofile")
+
+        self.assertEqual(response["Content-Type"], "application/json")
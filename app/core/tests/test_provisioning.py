@@ -0,0 +1,106 @@
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from django.db.models.signals import pre_save
+from django.db import connection
+from core import provisioning
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+class ProvisioningTests(TestCase):
+    def test_clean_rows(self):
+        """Test that invalid and repeated rows are rejected with a reason"""
+        rows = [
+            {"email": "john@EXAMPLE.com", "name": "John", "password": "Testing123"},
+            {"email": "not an email"},
+            {"email": "jane@example.com", "password": "1234"},
+            {"email": "john@example.com"},
+            "john",
+            {"email": "jane@example.com"},
+        ]
+
+        valid, errors = provisioning.clean_rows(rows)
+
+        self.assertEqual(
+            dict(valid),
+            {
+                "john@example.com": ("John", "Testing123"),
+                "jane@example.com": ("", None),
+            },
+        )
+        self.assertEqual(
+            errors,
+            [
+                (1, "not an email", "invalid email"),
+                (2, "jane@example.com", "invalid password"),
+                (3, "john@example.com", "repeated email"),
+                (4, "", "invalid email"),
+            ],
+        )
+
+    def test_provision_users(self):
+        """Test that users are created with hashed or unusable passwords"""
+        get_user_model().objects.create_user("jane@example.com", "Testing123")
+        rows = [
+            {"email": "john@example.com", "name": "John", "password": "Testing123"},
+            {"email": "jane@example.com", "password": "Changed123"},
+            {"email": "sso@example.com"},
+        ]
+
+        report = provisioning.provision_users(rows)
+
+        self.assertEqual(report["created"], 2)
+        self.assertEqual(report["existing"], ["jane@example.com"])
+        self.assertEqual(report["errors"], [])
+        self.assertGreater(report["users_per_sec"], 0)
+        users = get_user_model().objects
+        self.assertTrue(
+            users.get(email="john@example.com").check_password("Testing123")
+        )
+        self.assertTrue(
+            users.get(email="jane@example.com").check_password("Testing123")
+        )
+        self.assertFalse(users.get(email="sso@example.com").has_usable_password())
+
+    def test_one_query_per_batch_for_existing_users(self):
+        """Test that uniqueness is checked with one query per batch"""
+        rows = [{"email": f"user{i}@example.com"} for i in range(10)]
+
+        with CaptureQueriesContext(connection) as queries:
+            report = provisioning.provision_users(rows, batch_size=4)
+
+        statements = [query["sql"].split()[0] for query in queries]
+        self.assertEqual(statements.count("SELECT"), 3)
+        self.assertEqual(statements.count("INSERT"), 3)
+        self.assertEqual(report["created"], 10)
+
+    def test_users_are_not_saved_one_by_one(self):
+        """Test that users are inserted in bulk, without save()"""
+        saves = []
+
+        def receiver(**kwargs):
+            saves.append(kwargs["instance"])
+
+        pre_save.connect(receiver, sender=get_user_model())
+        try:
+            provisioning.provision_users([{"email": "john@example.com"}])
+        finally:
+            pre_save.disconnect(receiver, sender=get_user_model())
+
+        self.assertEqual(saves, [])
+        self.assertTrue(
+            get_user_model().objects.filter(email="john@example.com").exists()
+        )
+
+    def test_passwords_hashed_in_process_pool(self):
+        """Test that hashing across processes produces valid hashes"""
+        rows = [
+            {"email": f"user{i}@example.com", "password": f"Password{i}"}
+            for i in range(4)
+        ]
+
+        report = provisioning.provision_users(rows, workers=2)
+
+        self.assertEqual(report["created"], 4)
+        user = get_user_model().objects.get(email="user3@example.com")
+        self.assertTrue(user.check_password("Password3"))
@@ -0,0 +1,111 @@
+from django.test import TestCase, override_settings
+from django.db.utils import OperationalError
+from unittest.mock import MagicMock, patch
+from core.readiness import readiness_cache
+from rest_framework.test import APIClient
+from core.db.pool import PoolTimeout
+from rest_framework import status
+from django.urls import reverse
+from core import readiness
+
+READY_URL = reverse("health-ready")
+
+
+class CheckTests(TestCase):
+    """Test the readiness checks"""
+
+    def test_aliases_are_checked_concurrently(self):
+        """Test that each alias gets its own result"""
+        default, replica = MagicMock(), MagicMock()
+        replica.cursor.side_effect = OperationalError("replica is down")
+        conns = {"default": default, "replica": replica}
+
+        with patch(
+            "django.db.utils.ConnectionHandler.__getitem__",
+            side_effect=lambda alias: conns[alias],
+        ):
+            results = readiness.check_all(["default", "replica"])
+
+        self.assertEqual(results["default"], (True, "ok"))
+        self.assertEqual(results["replica"], (False, "replica is down"))
+        replica.close.assert_called_once()
+
+    def test_query_is_executed(self):
+        """Test that a connection is only ready once a query succeeds"""
+        conn = MagicMock()
+        cursor = conn.cursor.return_value.__enter__.return_value
+        cursor.execute.side_effect = OperationalError("server closed the connection")
+
+        with patch("django.db.utils.ConnectionHandler.__getitem__", return_value=conn):
+            result = readiness.check_alias("default")
+
+        self.assertEqual(result, (False, "server closed the connection"))
+        cursor.execute.assert_called_once_with("SELECT 1")
+        conn.cursor.return_value.__exit__.assert_called_once()
+
+    def test_no_pending_migrations(self):
+        """Test that the test database is reported as fully migrated"""
+        self.assertEqual(readiness.pending_migrations("default"), [])
+
+    def test_backoff_is_capped(self):
+        """Test that backoff delays stop growing at the maximum"""
+        delays = readiness.backoff_delays(initial=1, maximum=4)
+        steps = [next(delays) for _ in range(10)]
+
+        self.assertTrue(all(0.5 <= delay <= 4 for delay in steps))
+        self.assertTrue(all(delay >= 2 for delay in steps[3:]))
+
+
+class ReadinessApiTests(TestCase):
+    """Test the readiness endpoint"""
+
+    def setUp(self) -> None:
+        readiness_cache.clear()
+        self.addCleanup(readiness_cache.clear)
+        self.client = APIClient()
+
+    def test_ready(self):
+        """Test that a reachable, migrated database is ready"""
+        response = self.client.get(READY_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "ready")
+        self.assertEqual(response.data["databases"]["default"], "ok")
+
+    def test_unapplied_migrations(self):
+        """Test that pending migrations make the service unavailable"""
+        with patch("core.readiness.pending_migrations", return_value=["core.0007"]):
+            response = self.client.get(READY_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(
+            response.data["databases"]["default"], "1 unapplied migrations"
+        )
+
+    def test_pool_exhausted(self):
+        """Test that an exhausted connection pool makes the service unavailable"""
+        timeout = PoolTimeout("No connection available within 30s")
+        with patch("core.readiness.check_database", side_effect=timeout):
+            response = self.client.get(READY_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(
+            response.data["databases"]["default"], "No connection available within 30s"
+        )
+
+    def test_results_are_cached(self):
+        """Test that repeated probes reuse the previous result"""
+        with patch("core.readiness.check_all", wraps=readiness.check_all) as check:
+            self.client.get(READY_URL)
+            self.client.get(READY_URL)
+
+        self.assertEqual(check.call_count, 1)
+
+    @override_settings(READINESS_CACHE_TTL=0)
+    def test_cache_can_be_disabled(self):
+        """Test that a zero TTL checks on every probe"""
+        with patch("core.readiness.check_all", wraps=readiness.check_all) as check:
+            self.client.get(READY_URL)
+            self.client.get(READY_URL)
+
+        self.assertEqual(check.call_count, 2)
@@ -0,0 +1,100 @@
+from django.utils.translation import ugettext_lazy as _
+from core.negotiation import FastContentNegotiation
+from rest_framework.test import APIRequestFactory
+from rest_framework.exceptions import ParseError
+from rest_framework.request import Request
+from core.renderers import JSONRenderer
+from django.test import SimpleTestCase
+from rest_framework import renderers
+from core.parsers import JSONParser
+from unittest.mock import patch
+from decimal import Decimal
+import datetime
+import io
+
+SAMPLE = {
+    "ids": [1, 2, 3],
+    "name": "Crème fraîche     数",
+    "price": Decimal("4.50"),
+    "created": datetime.datetime(2022, 3, 21, 2, 59, 1, 123456, datetime.timezone.utc),
+    "day": datetime.date(2022, 3, 21),
+    "message": _("Invalid token."),
+    "nested": [{"empty": None, "flag": True, "ratio": 0.5}],
+}
+
+
+class JSONRendererTests(SimpleTestCase):
+    """Test the orjson backed JSON renderer"""
+
+    def test_output_matches_drf(self):
+        """Test that the output is byte for byte DRF's compact JSON"""
+        expected = renderers.JSONRenderer().render(SAMPLE)
+
+        self.assertEqual(JSONRenderer().render(SAMPLE), expected)
+
+    def test_indented_output_matches_drf(self):
+        """Test that indented output is still available"""
+        media_type = "application/json; indent=4"
+        expected = renderers.JSONRenderer().render(SAMPLE, media_type)
+
+        self.assertEqual(JSONRenderer().render(SAMPLE, media_type), expected)
+
+    def test_fallback_without_orjson(self):
+        """Test that the stdlib renderer is used when orjson is missing"""
+        expected = renderers.JSONRenderer().render(SAMPLE)
+
+        with patch("core.renderers.orjson", None):
+            self.assertEqual(JSONRenderer().render(SAMPLE), expected)
+
+    def test_none_renders_empty(self):
+        """Test that no data renders an empty body"""
+        self.assertEqual(JSONRenderer().render(None), b"")
+
+
+class JSONParserTests(SimpleTestCase):
+    """Test the orjson backed JSON parser"""
+
+    def parse(self, body, **context):
+        return JSONParser().parse(io.BytesIO(body), parser_context=context)
+
+    def test_parse(self):
+        """Test that a UTF-8 body is parsed"""
+        data = self.parse('{"name": "Crème", "ids": [1, 2]}'.encode("utf-8"))
+
+        self.assertEqual(data, {"name": "Crème", "ids": [1, 2]})
+
+    def test_invalid_json(self):
+        """Test that malformed JSON raises a parse error"""
+        with self.assertRaises(ParseError):
+            self.parse(b'{"name": ')
+
+    def test_other_encodings(self):
+        """Test that bodies in other encodings are still decoded"""
+        data = self.parse('{"name": "Crème"}'.encode("latin-1"), encoding="latin-1")
+
+        self.assertEqual(data, {"name": "Crème"})
+
+
+class FastContentNegotiationTests(SimpleTestCase):
+    """Test the short cut content negotiation"""
+
+    def setUp(self) -> None:
+        self.renderers = [JSONRenderer(), renderers.BrowsableAPIRenderer()]
+        self.negotiation = FastContentNegotiation()
+
+    def select(self, path="/", **headers):
+        request = Request(APIRequestFactory().get(path, **headers))
+        renderer, media_type = self.negotiation.select_renderer(request, self.renderers)
+        return renderer.format, media_type
+
+    def test_any_media_type(self):
+        """Test that */* picks the first renderer"""
+        self.assertEqual(self.select(HTTP_ACCEPT="*/*"), ("json", "application/json"))
+
+    def test_explicit_media_type(self):
+        """Test that other Accept headers go through full negotiation"""
+        self.assertEqual(self.select(HTTP_ACCEPT="text/html")[0], "api")
+
+    def test_format_override(self):
+        """Test that the format query parameter is honoured"""
+        self.assertEqual(self.select("/?format=api")[0], "api")
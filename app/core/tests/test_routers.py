@@ -0,0 +1,175 @@
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from core.db.routers import ReplicaRouter, replica_reads
+from core.checks import check_replica_pin_cache
+from core.models import Tag, CollectionVersion
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from django.core.checks import run_checks
+from django.core.cache import cache
+from django.db import connections
+from django.conf import settings
+from unittest.mock import patch
+from django.urls import reverse
+from unittest import skipUnless
+from core.db import pool
+
+TAGS_URL = reverse("recipe:tag-list")
+TAGS_EXPORT_URL = reverse("recipe:tag-export")
+
+LOCAL_REPLICA = next(
+    (
+        alias
+        for alias in settings.DATABASE_REPLICAS
+        if not settings.DATABASES[alias].get("TEST", {}).get("MIRROR")
+    ),
+    None,
+)
+
+
+@patch("core.db.routers.replicas", return_value=["replica1", "replica2"])
+class ReplicaRouterTests(SimpleTestCase):
+    """Test routing reads to replicas"""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.router = ReplicaRouter()
+
+    def test_primary_outside_replica_reads(self, replicas):
+        """Test that code outside a view reads from the primary"""
+        self.assertEqual(self.router.db_for_read(Tag), "default")
+        self.assertEqual(self.router.db_for_write(Tag), "default")
+
+    def test_round_robin(self, replicas):
+        """Test that consecutive requests spread over the replicas"""
+        chosen = set()
+        for _ in range(2):
+            with replica_reads(1):
+                chosen.add(self.router.db_for_read(Tag))
+
+        self.assertEqual(chosen, {"replica1", "replica2"})
+
+    def test_replica_is_kept_for_the_request(self, replicas):
+        """Test that every read of a request uses the same replica"""
+        with replica_reads(1):
+            chosen = {self.router.db_for_read(Tag) for _ in range(4)}
+
+        self.assertEqual(len(chosen), 1)
+
+    def test_write_pins_the_user_to_the_primary(self, replicas):
+        """Test that a user reads from the primary after writing"""
+        with replica_reads(1, reads=False):
+            self.router.db_for_write(Tag)
+
+        with replica_reads(1):
+            self.assertEqual(self.router.db_for_read(Tag), "default")
+        with replica_reads(2):
+            self.assertIn(self.router.db_for_read(Tag), ("replica1", "replica2"))
+
+    @override_settings(REPLICA_PIN_SECONDS=0)
+    def test_pin_expires(self, replicas):
+        """Test that reads go back to the replicas after the pin window"""
+        with replica_reads(1, reads=False):
+            self.router.db_for_write(Tag)
+            self.assertEqual(self.router.db_for_read(Tag), "default")
+
+        with replica_reads(1):
+            self.assertNotEqual(self.router.db_for_read(Tag), "default")
+
+    def test_safe_request_writes_do_not_pin(self, replicas):
+        """Test that writes made while serving a read do not pin the user"""
+        with replica_reads(1):
+            self.router.db_for_write(CollectionVersion)
+            self.assertEqual(self.router.db_for_read(Tag), "default")
+
+        with replica_reads(1):
+            self.assertIn(self.router.db_for_read(Tag), ("replica1", "replica2"))
+
+    def test_process_local_pin_cache_warning(self, replicas):
+        """Test that pins kept in a per process cache are reported"""
+        locmem = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        shared = {"BACKEND": "django.core.cache.backends.memcached.MemcachedCache"}
+
+        with patch("core.checks.replicas", replicas):
+            with override_settings(CACHES={"default": locmem}):
+                warnings = check_replica_pin_cache(None)
+            with override_settings(CACHES={"default": shared}):
+                self.assertEqual(check_replica_pin_cache(None), [])
+
+        self.assertEqual([warning.id for warning in warnings], ["core.W001"])
+
+    def test_pin_cache_warning_runs_with_system_checks(self, replicas):
+        """Test that the pin cache check runs without the --database flag"""
+        locmem = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+
+        with patch("core.checks.replicas", replicas):
+            with override_settings(CACHES={"default": locmem}):
+                messages = run_checks()
+
+        self.assertIn("core.W001", [message.id for message in messages])
+
+    def test_unsafe_requests_read_from_the_primary(self, replicas):
+        """Test that reads of a writing request stay on the primary"""
+        with replica_reads(1, reads=False):
+            self.assertEqual(self.router.db_for_read(Tag), "default")
+
+    def test_transactions_read_from_the_primary(self, replicas):
+        """Test that reads inside a transaction on the primary stay there"""
+        with replica_reads(1), patch.object(
+            connections["default"], "in_atomic_block", True
+        ):
+            self.assertEqual(self.router.db_for_read(Tag), "default")
+
+    @override_settings(REPLICA_SELECTION="least_loaded")
+    def test_least_loaded(self, replicas):
+        """Test that the replica with the fewest pooled connections in use wins"""
+        busy = pool.ConnectionPool(object, max_size=2)
+        idle = pool.ConnectionPool(object, max_size=2)
+        busy.acquire()
+        stats = {"replica1:app": busy, "replica2:app": idle}
+
+        with patch.dict(pool.registry, stats):
+            for _ in range(2):
+                with replica_reads(1):
+                    self.assertEqual(self.router.db_for_read(Tag), "replica2")
+
+
+@skipUnless(LOCAL_REPLICA, "no standalone replica database is configured")
+class ReplicaApiTests(TransactionTestCase):
+    """Test reading from a standalone replica database through the API"""
+
+    multi_db = True
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            "john@example.com", "Testing123"
+        )
+        self.user.save(using=LOCAL_REPLICA)
+        Tag.objects.create(user=self.user, name="Primary")
+        Tag.objects.using(LOCAL_REPLICA).create(user=self.user, name="Replica")
+        CollectionVersion.objects.db_manager(LOCAL_REPLICA).current(self.user.pk, "tag")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def names(self):
+        return sorted(tag["name"] for tag in self.client.get(TAGS_URL).data)
+
+    @override_settings(DATABASE_REPLICAS=[LOCAL_REPLICA])
+    def test_reads_your_writes(self):
+        """Test that lists come from the replica except right after a write"""
+        self.assertEqual(self.names(), ["Replica"])
+
+        self.client.post(TAGS_URL, {"name": "New"})
+        self.assertEqual(self.names(), ["New", "Primary"])
+
+        cache.clear()
+        self.assertEqual(self.names(), ["Replica"])
+
+    @override_settings(DATABASE_REPLICAS=[LOCAL_REPLICA])
+    def test_export_streams_from_the_replica(self):
+        """Test that the streamed export reads from the request's replica"""
+        response = self.client.get(TAGS_EXPORT_URL, HTTP_ACCEPT="text/csv")
+
+        body = b"".join(response.streaming_content).decode("utf-8")
+        self.assertIn("Replica", body)
+        self.assertNotIn("Primary", body)
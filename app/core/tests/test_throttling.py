@@ -0,0 +1,111 @@
+from rest_framework.test import APIRequestFactory, force_authenticate
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.request import Request
+from core.parsers import JSONParser
+from django.core.cache import cache
+from core import throttling
+
+
+class FixedClockThrottle(throttling.LoginIPThrottle):
+    rate = "10/min"
+    now = 600.0
+
+    def timer(self):
+        return FixedClockThrottle.now
+
+
+def token_request(email="john@example.com", ip="10.0.0.1"):
+    factory = APIRequestFactory()
+    request = factory.post(
+        "/api/user/token/", {"email": email}, format="json", REMOTE_ADDR=ip
+    )
+    return Request(request, parsers=[JSONParser()])
+
+
+class SlidingWindowThrottleTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        FixedClockThrottle.now = 600.0
+
+    def make_requests(self, count):
+        return [
+            FixedClockThrottle().allow_request(token_request(), None)
+            for _ in range(count)
+        ]
+
+    def test_requests_within_rate_are_allowed(self):
+        """Test that requests up to the rate pass and the next one is throttled"""
+        self.assertEqual(self.make_requests(11), [True] * 10 + [False])
+
+    def test_previous_window_is_weighted(self):
+        """Test that the previous window counts for the part still overlapping"""
+        self.make_requests(10)
+        # A quarter into the next window, 7.5 requests are still counted
+        FixedClockThrottle.now = 675.0
+
+        self.assertEqual(self.make_requests(4), [True, True, True, False])
+
+    def test_window_expires(self):
+        """Test that requests are allowed again once the window has passed"""
+        self.make_requests(10)
+        FixedClockThrottle.now = 720.0
+
+        self.assertEqual(self.make_requests(10), [True] * 10)
+
+    def test_wait_until_estimate_drops(self):
+        """Test that the wait is the time until the next request is allowed"""
+        self.make_requests(10)
+        FixedClockThrottle.now = 630.0
+        throttle = FixedClockThrottle()
+
+        self.assertFalse(throttle.allow_request(token_request(), None))
+        # The next window starts in 30s, with all 10 requests as previous
+        self.assertAlmostEqual(throttle.wait(), 30.0)
+
+        FixedClockThrottle.now = 675.0
+        self.make_requests(3)
+        throttle = FixedClockThrottle()
+        self.assertFalse(throttle.allow_request(token_request(), None))
+        # 7.5 previous and 3 current requests, below 10 once 30% in
+        self.assertAlmostEqual(throttle.wait(), 3.0)
+
+        FixedClockThrottle.now += 3.001
+        self.assertTrue(FixedClockThrottle().allow_request(token_request(), None))
+
+    def test_ips_are_counted_separately(self):
+        """Test that the per IP throttle keys requests by client address"""
+        self.make_requests(10)
+
+        throttle = FixedClockThrottle()
+        self.assertTrue(throttle.allow_request(token_request(ip="10.0.0.2"), None))
+
+    @override_settings(THROTTLING_ENABLED=False)
+    def test_throttling_can_be_disabled(self):
+        """Test that THROTTLING_ENABLED turns every throttle off"""
+        self.assertEqual(self.make_requests(20), [True] * 20)
+
+    def test_email_key_ignores_case(self):
+        """Test that emails differing in case share a counter"""
+        throttle = throttling.LoginEmailThrottle()
+
+        self.assertEqual(
+            throttle.get_cache_key(token_request(email="John@Example.com "), None),
+            throttle.get_cache_key(token_request(email="john@example.com"), None),
+        )
+
+    def test_create_throttle_only_counts_posts(self):
+        """Test that the create throttle leaves reads alone"""
+        user = get_user_model().objects.create_user("john@example.com", "testing")
+        factory = APIRequestFactory()
+        throttle = throttling.CreateThrottle()
+        for method, expected in (
+            ("get", None),
+            ("post", "throttle:create:%d" % user.pk),
+        ):
+            request = getattr(factory, method)("/api/recipe/tags/")
+            force_authenticate(request, user)
+            request = Request(request)
+            request.user = user
+
+            self.assertEqual(throttle.get_cache_key(request, None), expected)
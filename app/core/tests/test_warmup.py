@@ -0,0 +1,87 @@
+from django.db.utils import OperationalError
+from django.db import connections
+from django.test import TestCase
+from unittest.mock import patch
+from core import warmup
+import importlib
+import os
+
+ENSURE_CONNECTION = "django.db.backends.base.base.BaseDatabaseWrapper.ensure_connection"
+
+
+class WarmupTests(TestCase):
+    """Test warming up the application before serving"""
+
+    def test_named_routes_are_resolved(self):
+        """Test that every route without arguments is reversed and resolved"""
+        names = [
+            name for name, _ in warmup.iter_patterns(warmup.get_resolver().url_patterns)
+        ]
+
+        self.assertIn("recipe:tag-list", names)
+        self.assertIn("user:me", names)
+        self.assertGreaterEqual(warmup.warm_urls(), 10)
+
+    def test_serializers_are_built(self):
+        """Test that the serializer of each API view is instantiated"""
+        with patch("recipe.serializers.TagSerializer.get_fields") as get_fields:
+            get_fields.return_value = {}
+            count = warmup.warm_serializers()
+
+        get_fields.assert_called_once()
+        self.assertGreaterEqual(count, 3)
+
+    def test_connections_are_closed_for_forking(self):
+        """Test that connections are opened and closed again"""
+        with patch.object(connections, "close_all") as close_all:
+            warmup.warm_connections()
+
+        close_all.assert_called_once()
+
+    def test_report(self):
+        """Test that every step is timed"""
+        with patch.object(connections, "close_all"):
+            with self.assertLogs("core.warmup", "INFO"):
+                report = warmup.warm_up()
+
+        self.assertEqual(
+            list(report),
+            ["urls", "models", "serializers", "framework", "connections", "total_ms"],
+        )
+        self.assertGreater(report["total_ms"], 0)
+
+    def test_wsgi_warm_up_is_opt_in(self):
+        """Test that the WSGI module only warms up when asked to"""
+        import app.wsgi
+
+        with patch("core.warmup.warm_up") as warm_up:
+            importlib.reload(app.wsgi)
+            warm_up.assert_not_called()
+
+            with patch.dict(os.environ, {"WSGI_WARMUP": "1"}):
+                importlib.reload(app.wsgi)
+            warm_up.assert_called_once()
+
+    def test_failing_step_is_reported(self):
+        """Test that a failing step is logged and the others still run"""
+        with patch.object(connections, "close_all") as close_all, patch(
+            ENSURE_CONNECTION, side_effect=OperationalError("connection refused")
+        ), self.assertLogs("core.warmup", "ERROR") as logs:
+            report = warmup.warm_up(["connections", "models"])
+
+        self.assertEqual(report["connections"]["error"], "connection refused")
+        self.assertIn("count", report["models"])
+        self.assertIn("Warm up step connections failed", logs.output[0])
+        close_all.assert_called_once()
+
+    def test_wsgi_application_survives_a_failing_warm_up(self):
+        """Test that a database down at boot does not stop the worker"""
+        import app.wsgi
+
+        with patch.object(connections, "close_all"), patch(
+            ENSURE_CONNECTION, side_effect=OperationalError("connection refused")
+        ), patch.dict(os.environ, {"WSGI_WARMUP": "1"}):
+            with self.assertLogs("core.warmup", "ERROR"):
+                importlib.reload(app.wsgi)
+
+        self.assertTrue(callable(app.wsgi.application))
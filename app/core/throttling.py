@@ -0,0 +1,118 @@
+from rest_framework.throttling import SimpleRateThrottle
+from rest_framework.settings import api_settings
+from django.core.cache import caches
+from django.conf import settings
+import hashlib
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """Rate throttle counting requests in a sliding window
+
+    The window is approximated from two fixed window counters, the current
+    one and the previous one weighted by how much of it still overlaps the
+    window. Each request costs one get_many and one incr on the cache,
+    whatever the rate, where DRF's throttles read, trim and write back a
+    list holding the timestamp of every request in the window.
+
+    Rates are read from DEFAULT_THROTTLE_RATES on every request. A rate
+    of None disables the throttle, as does THROTTLING_ENABLED.
+    """
+
+    cache_format = "throttle:%(scope)s:%(ident)s"
+
+    def __init__(self):
+        self.cache = caches[getattr(settings, "THROTTLE_CACHE_ALIAS", "default")]
+        super().__init__()
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def allow_request(self, request, view):
+        if self.rate is None or not getattr(settings, "THROTTLING_ENABLED", True):
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, offset = divmod(self.now, self.duration)
+        current_key = "%s:%d" % (self.key, window)
+        previous_key = "%s:%d" % (self.key, window - 1)
+        counts = self.cache.get_many([previous_key, current_key])
+        self.previous = counts.get(previous_key, 0)
+        self.current = counts.get(current_key, 0)
+        self.elapsed = offset / self.duration
+        if self.previous * (1 - self.elapsed) + self.current >= self.num_requests:
+            return self.throttle_failure()
+
+        # Both windows must outlive the next one
+        timeout = int(self.duration * 2) + 1
+        if not self.cache.add(current_key, 1, timeout):
+            try:
+                self.cache.incr(current_key)
+            except ValueError:
+                # Evicted since add
+                self.cache.set(current_key, 1, timeout)
+        return True
+
+    def wait(self):
+        """Return the seconds until the estimate drops below the rate"""
+        if self.current >= self.num_requests:
+            # The next window starts with the current count as its previous
+            fraction = 1 - self.elapsed + 1 - self.num_requests / self.current
+        else:
+            remaining = self.num_requests - self.current
+            fraction = 1 - remaining / self.previous - self.elapsed
+        return max(fraction, 0) * self.duration
+
+
+class LoginIPThrottle(SlidingWindowThrottle):
+    """Limit token requests per client IP"""
+
+    scope = "login_ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+class LoginEmailThrottle(SlidingWindowThrottle):
+    """Limit token requests per email, whichever IPs they come from"""
+
+    scope = "login_email"
+
+    def get_cache_key(self, request, view):
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+
+        # Hashed so any submitted string makes a valid cache key
+        ident = hashlib.md5(email.strip().casefold().encode("utf-8")).hexdigest()
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+class SignupThrottle(SlidingWindowThrottle):
+    """Limit account creation per client IP"""
+
+    scope = "signup"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+class CreateThrottle(SlidingWindowThrottle):
+    """Limit POST requests creating objects per authenticated user"""
+
+    scope = "create"
+
+    def get_cache_key(self, request, view):
+        if request.method != "POST" or not request.user.is_authenticated:
+            return None
+
+        return self.cache_format % {"scope": self.scope, "ident": request.user.pk}
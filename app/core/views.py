@@ -0,0 +1,39 @@
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.permissions import AllowAny, IsAdminUser
+from core.authentication import CachedTokenAuthentication
+from rest_framework.response import Response
+from core.readiness import readiness_cache
+from rest_framework.views import APIView
+from core.db.pool import pool_stats
+from rest_framework import status
+
+
+class ReadinessView(APIView):
+    """Report whether every database is reachable and fully migrated"""
+
+    authentication_classes = ()
+    permission_classes = (AllowAny,)
+
+    def get(self, request):
+        """Return 200 when ready, 503 otherwise, from cached check results"""
+        results = readiness_cache.get()
+        ready = all(ok for ok, _ in results.values())
+        checks = {alias: detail for alias, (_, detail) in results.items()}
+
+        response = Response(
+            {"status": "ready" if ready else "unavailable", "databases": checks},
+            status=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+        response["Cache-Control"] = "no-store"
+        return response
+
+
+class DatabasePoolsView(APIView):
+    """Report the statistics of the database connection pools to staff"""
+
+    authentication_classes = (CachedTokenAuthentication, SessionAuthentication)
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        """Return the size and counters of every pool in this process"""
+        return Response(pool_stats())
@@ -0,0 +1,151 @@
+from django.urls import URLPattern, URLResolver, NoReverseMatch, get_resolver
+from django.contrib.auth.hashers import get_hashers
+from rest_framework.settings import api_settings
+from django.urls import resolve, reverse
+from django.utils import translation
+from collections import OrderedDict
+from django.db import connections
+from django.conf import settings
+from django.apps import apps
+from core.db import pool
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def iter_patterns(patterns, namespace=None):
+    """Yield (namespaced name, pattern) for every named URL pattern"""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            nested = pattern.namespace
+            if nested:
+                nested = "%s:%s" % (namespace, nested) if namespace else nested
+            else:
+                nested = namespace
+            yield from iter_patterns(pattern.url_patterns, nested)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            name = "%s:%s" % (namespace, pattern.name) if namespace else pattern.name
+            yield name, pattern
+
+
+def warm_urls():
+    """Populate every resolver and reverse and resolve each named route"""
+    resolver = get_resolver()
+    resolver.reverse_dict
+    routes = 0
+    for name, pattern in iter_patterns(resolver.url_patterns):
+        try:
+            path = reverse(name)
+        except NoReverseMatch:
+            # Routes needing arguments still had their resolver populated
+            continue
+        resolve(path)
+        routes += 1
+
+    return routes
+
+
+def warm_serializers():
+    """Build the fields of the serializer of every DRF view once"""
+    seen = set()
+    for _, pattern in iter_patterns(get_resolver().url_patterns):
+        view_class = getattr(pattern.callback, "cls", None)
+        serializer_class = getattr(view_class, "serializer_class", None)
+        if serializer_class is None or serializer_class in seen:
+            continue
+        seen.add(serializer_class)
+        serializer_class().fields
+
+    return len(seen)
+
+
+def warm_models():
+    """Build the field caches of every model's options"""
+    models = apps.get_models()
+    for model in models:
+        model._meta.get_fields()
+        model._meta.concrete_fields
+        model._meta.related_objects
+
+    return len(models)
+
+
+def warm_framework():
+    """Import the configured DRF classes, password hashers and translations"""
+    api_settings.DEFAULT_RENDERER_CLASSES
+    api_settings.DEFAULT_PARSER_CLASSES
+    api_settings.DEFAULT_CONTENT_NEGOTIATION_CLASS
+    get_hashers()
+    translation.activate(settings.LANGUAGE_CODE)
+    translation.deactivate()
+
+
+def warm_connections(close=True):
+    """Connect to every database, closing the connections afterwards
+
+    This loads the driver and checks the databases are reachable. Open
+    connections must not be inherited by forked workers, who would share
+    their sockets, so they are closed, pooled ones included, before
+    returning.
+    """
+    try:
+        for alias in connections:
+            connections[alias].ensure_connection()
+    finally:
+        if close:
+            connections.close_all()
+            for connection_pool in pool.registry.values():
+                connection_pool.close_all()
+
+    return len(connections.databases)
+
+
+STEPS = (
+    ("urls", warm_urls),
+    ("models", warm_models),
+    ("serializers", warm_serializers),
+    ("framework", warm_framework),
+    ("connections", warm_connections),
+)
+
+
+def warm_up(steps=None):
+    """Run the warm up steps and return their timings in milliseconds
+
+    Meant to run once in the master process of a preloading server (e.g.
+    gunicorn --preload), so workers are forked with everything built.
+    Warming up is best effort: a failing step, such as a database not yet
+    accepting connections at boot, is logged and reported, and the other
+    steps still run.
+    """
+    started = time.perf_counter()
+    report = OrderedDict()
+    for name, step in STEPS:
+        if steps is not None and name not in steps:
+            continue
+        step_started = time.perf_counter()
+        try:
+            count = step()
+        except Exception as exc:
+            logger.exception("Warm up step %s failed", name)
+            count = None
+            error = str(exc).strip() or exc.__class__.__name__
+        else:
+            error = None
+        report[name] = OrderedDict(
+            [("ms", round((time.perf_counter() - step_started) * 1000, 3))]
+        )
+        if count is not None:
+            report[name]["count"] = count
+        if error is not None:
+            report[name]["error"] = error
+    total = round((time.perf_counter() - started) * 1000, 3)
+
+    logger.info(
+        "Warmed up in %.1f ms (%s)",
+        total,
+        ", ".join("%s %.1f ms" % (name, step["ms"]) for name, step in report.items()),
+    )
+    report["total_ms"] = total
+    return report
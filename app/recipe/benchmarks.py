@@ -0,0 +1,161 @@
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.serializers import ListSerializer
+from core.benchmarks import register, timeit, result
+from core.models import Ingredient, normalize_name
+from rest_framework.renderers import JSONRenderer
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from recipe.views import IngredientViewSet
+from django.test import override_settings
+from contextlib import contextmanager
+from recipe import serializers
+from itertools import islice
+from core import renderers
+import random
+import uuid
+
+
+def unique_names(names):
+    """Skip names matching an earlier one ignoring case, as users cannot own both"""
+    seen = set()
+    for name in names:
+        key = normalize_name(name)
+        if key not in seen:
+            seen.add(key)
+            yield name
+
+
+@contextmanager
+def seeded_user(model, rows, names=None):
+    """Yield a user owning rows objects, rolling everything back afterwards
+
+    The user gets a random address, so a real account is never touched.
+    """
+    names = unique_names(names or ("Item %06d" % i for i in range(rows)))
+    email = "benchmark-%s@example.invalid" % uuid.uuid4().hex
+    with transaction.atomic():
+        try:
+            user = get_user_model().objects.create_user(email)
+            model.objects.bulk_create(
+                (model(user=user, name=name) for name in islice(names, rows)),
+                batch_size=500,
+            )
+            yield user
+        finally:
+            transaction.set_rollback(True)
+
+
+def sizes(quick):
+    return (100,) if quick else (10000, 100000)
+
+
+def model_serializer_list(queryset):
+    """Serialize through the default ListSerializer and model instances"""
+    child = serializers.IngredientSerializer()
+    return ListSerializer(queryset.all(), child=child).data
+
+
+def values_list_serializer_list(queryset):
+    """Serialize through the fast values_list based list serializer"""
+    return serializers.IngredientSerializer(queryset.all(), many=True).data
+
+
+@register("serializers")
+def serializer_modes(quick=False):
+    """Serialize a user's ingredient list with and without the fast list mode"""
+    cases = (
+        ("ModelSerializer", model_serializer_list),
+        ("ValuesListSerializer", values_list_serializer_list),
+    )
+    results = []
+    for rows in sizes(quick):
+        with seeded_user(Ingredient, rows) as user:
+            queryset = Ingredient.objects.filter(user=user).order_by("-name", "-id")
+            for case, serialize in cases:
+                runs, elapsed = timeit(
+                    lambda: serialize(queryset), min_time=0 if quick else 1.0
+                )
+                results.append(result(case, runs, elapsed, rows=rows))
+
+    return results
+
+
+@register("renderers")
+def renderer_modes(quick=False):
+    """Render a large ingredient list with the stdlib and orjson renderers"""
+    cases = (
+        ("DRF JSONRenderer", JSONRenderer()),
+        ("core JSONRenderer", renderers.JSONRenderer()),
+    )
+    results = []
+    for rows in sizes(quick):
+        data = [{"id": i, "name": "Ingrédient %06d" % i} for i in range(rows)]
+        for case, renderer in cases:
+            runs, elapsed = timeit(
+                lambda: renderer.render(data), min_time=0 if quick else 1.0
+            )
+            results.append(
+                result(case, runs, elapsed, rows=rows, orjson=bool(renderers.orjson))
+            )
+
+    return results
+
+
+def ingredient_names(seed=0):
+    """Yield an endless stream of varied, pronounceable ingredient names"""
+    rng = random.Random(seed)
+    syllables = ("ba", "ca", "de", "fi", "go", "ka", "li", "ma", "no", "pe", "ri")
+    syllables += ("sa", "to", "ve", "za", "chi", "mon", "ter", "pra", "sto", "lin")
+    while True:
+        words = (
+            "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+            for _ in range(rng.randint(1, 3))
+        )
+        yield " ".join(words).capitalize()
+
+
+@register("autocomplete")
+@override_settings(ALLOWED_HOSTS=["testserver"])
+def autocomplete_requests(quick=False):
+    """Time autocomplete requests for a user with many ingredients"""
+    view = IngredientViewSet.as_view({"get": "autocomplete"})
+    list_view = IngredientViewSet.as_view({"get": "list"})
+    factory = APIRequestFactory()
+    rows = 100 if quick else 100000
+
+    def request(view, **params):
+        request = factory.get("/", params)
+        force_authenticate(request, user)
+        response = view(request)
+        response.render()
+        return response
+
+    results = []
+    with seeded_user(Ingredient, rows, ingredient_names()) as user:
+        # Statistics of the seeded table only, inside the rolled back block
+        with connection.cursor() as cursor:
+            for model in (Ingredient, get_user_model()):
+                table = connection.ops.quote_name(model._meta.db_table)
+                cursor.execute("ANALYZE %s" % table)
+        for search in ("s", "sa", "sal", "salin"):
+            matches = Ingredient.objects.filter(user=user).prefix_search(search)
+            runs, elapsed = timeit(
+                lambda: request(view, search=search), min_time=0 if quick else 1.0
+            )
+            results.append(
+                result(
+                    "autocomplete %r" % search,
+                    runs,
+                    elapsed,
+                    rows=rows,
+                    matches=matches.count(),
+                )
+            )
+
+        with override_settings(RECIPE_LIST_CACHE_TIMEOUT=0):
+            runs, elapsed = timeit(
+                lambda: request(list_view), min_time=0 if quick else 1.0
+            )
+        results.append(result("uncached full list", runs, elapsed, rows=rows))
+
+    return results
@@ -0,0 +1,92 @@
+from django.core.cache import caches
+from django.conf import settings
+import threading
+import time
+
+
+class ListCache:
+    """Cache of serialized list bodies stored in Django's cache framework
+
+    Every entry is stamped with the collection version it was built from.
+    Writes bump the version in the same transaction, so an entry built
+    before a change is never served again; it counts as an eviction and is
+    replaced on the next request.
+
+    Concurrent misses for the same key are collapsed: the first request
+    takes a short lived lock through ``cache.add`` and builds the body,
+    the others poll for the result for up to ``wait_timeout`` seconds
+    before building it themselves.
+    """
+
+    def __init__(self, lock_timeout=10, wait_timeout=2.0, poll_interval=0.02):
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._counters = dict.fromkeys(("hits", "misses", "evictions", "waits"), 0)
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, "RECIPE_LIST_CACHE_ALIAS", "default")]
+
+    @property
+    def timeout(self):
+        return getattr(settings, "RECIPE_LIST_CACHE_TIMEOUT", 300)
+
+    def get_or_set(self, key, version, compute):
+        """Return the cached body for key at version, building it on a miss"""
+        if not self.timeout:
+            return compute()
+
+        data = self._lookup(key, version, count=True)
+        if data is not None:
+            return data
+
+        lock_key = "%s:lock" % key
+        if not self.cache.add(lock_key, 1, self.lock_timeout):
+            deadline = time.monotonic() + self.wait_timeout
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                data = self._lookup(key, version)
+                if data is not None:
+                    self._count("waits")
+                    return data
+            return compute()
+
+        try:
+            data = compute()
+            self.cache.set(key, (version, data), self.timeout)
+        finally:
+            self.cache.delete(lock_key)
+
+        return data
+
+    def stats(self):
+        """Return the cache counters for monitoring"""
+        with self._lock:
+            return dict(self._counters)
+
+    def reset_stats(self):
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def _lookup(self, key, version, count=False):
+        entry = self.cache.get(key)
+        if entry is not None and entry[0] == version:
+            if count:
+                self._count("hits")
+            return entry[1]
+
+        if count:
+            self._count("misses")
+            if entry is not None:
+                self._count("evictions")
+        return None
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+
+list_cache = ListCache()
@@ -0,0 +1,77 @@
+from rest_framework.renderers import BaseRenderer
+import json
+import csv
+
+
+class Echo:
+    """File-like object that hands back whatever is written to it"""
+
+    def write(self, value):
+        return value
+
+
+def _batched(lines, batch_size):
+    """Join lines into byte chunks of roughly batch_size lines"""
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= batch_size:
+            yield "".join(batch).encode("utf-8")
+            batch = []
+    if batch:
+        yield "".join(batch).encode("utf-8")
+
+
+def ndjson_lines(fields, rows):
+    """Yield one JSON document per row"""
+    for row in rows:
+        yield json.dumps(dict(zip(fields, row)), ensure_ascii=False) + "\n"
+
+
+def csv_lines(fields, rows):
+    """Yield a CSV header followed by one line per row"""
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Renderer for newline delimited JSON"""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def stream(self, fields, rows, batch_size=1000):
+        """Return byte chunks for the rows of a values_list queryset"""
+        return _batched(ndjson_lines(fields, rows), batch_size)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render a list as one line per item, anything else as one line"""
+        items = data if isinstance(data, list) else [data]
+        return "".join(json.dumps(item) + "\n" for item in items).encode("utf-8")
+
+
+class CSVRenderer(BaseRenderer):
+    """Renderer for comma separated values"""
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def stream(self, fields, rows, batch_size=1000):
+        """Return byte chunks for the rows of a values_list queryset"""
+        return _batched(csv_lines(fields, rows), batch_size)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render a list of objects as rows or a single object as key/values"""
+        if isinstance(data, dict):
+            lines = csv_lines(("key", "value"), data.items())
+        elif data:
+            fields = list(data[0])
+            lines = csv_lines(fields, ([item[f] for f in fields] for item in data))
+        else:
+            lines = ()
+
+        return "".join(lines).encode("utf-8")
@@ -0,0 +1,134 @@
+from rest_framework.utils.urls import replace_query_param
+from django.utils.translation import ugettext_lazy as _
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from rest_framework.pagination import BasePagination
+from recipe.serializers import ValuesListSerializer
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from collections import OrderedDict
+from django.conf import settings
+from django.db.models import Q
+import binascii
+import json
+
+
+class KeysetPagination(BasePagination):
+    """Opt in keyset pagination over (name, id) in descending order
+
+    Pagination only kicks in when the client sends a page size or a cursor,
+    so existing clients keep receiving the full list. Each page seeks
+    straight to the cursor position through the (user, name, id) index and
+    no COUNT query is issued, so every page costs the same. Views whose
+    serializer lists with ValuesListSerializer get their page read as
+    values, without instantiating models.
+    """
+
+    ordering = ("-name", "-id")
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = _("Invalid cursor")
+
+    def __init__(self):
+        self.page_size = getattr(settings, "RECIPE_PAGE_SIZE", 100)
+        self.max_page_size = getattr(settings, "RECIPE_MAX_PAGE_SIZE", 1000)
+        self.next_position = None
+        self.base_url = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return the requested page or None when pagination was not asked for"""
+        params = request.query_params
+        if self.page_size_query_param not in params and (
+            self.cursor_query_param not in params
+        ):
+            return None
+
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            name, pk = position
+            queryset = queryset.filter(name__lte=name).filter(
+                Q(name__lt=name) | Q(id__lt=pk)
+            )
+
+        fields = self.get_values_fields(view)
+        if fields is None:
+            rows = list(queryset[: page_size + 1])
+        else:
+            values = queryset.values_list(*fields)[: page_size + 1]
+            rows = [dict(zip(fields, row)) for row in values]
+        page = rows[:page_size]
+        if len(rows) > page_size:
+            last = page[-1]
+            if fields is None:
+                self.next_position = (last.name, last.pk)
+            else:
+                self.next_position = (last["name"], last["id"])
+
+        self.base_url = request.build_absolute_uri()
+        return page
+
+    def get_values_fields(self, view):
+        """Return the fields to read the page with when it may be read as values
+
+        Only views listing with ValuesListSerializer qualify, and the fields
+        must hold the (name, id) cursor position.
+        """
+        if view is None:
+            return None
+
+        meta = getattr(view.get_serializer_class(), "Meta", None)
+        list_serializer_class = getattr(meta, "list_serializer_class", None)
+        if list_serializer_class is None or not issubclass(
+            list_serializer_class, ValuesListSerializer
+        ):
+            return None
+
+        fields = tuple(meta.fields)
+        return fields if {"id", "name"} <= set(fields) else None
+
+    def get_paginated_response(self, data):
+        """Wrap a page of results with the link to the next page"""
+        return Response(
+            OrderedDict([("next", self.get_next_link()), ("results", data)])
+        )
+
+    def get_page_size(self, request):
+        """Return the requested page size capped at the maximum"""
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self):
+        """Return the URL of the next page, if there is one"""
+        if self.next_position is None:
+            return None
+
+        encoded = self.encode_cursor(self.next_position)
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def encode_cursor(self, position):
+        """Return an opaque cursor for a (name, id) position"""
+        payload = json.dumps(position, separators=(",", ":")).encode("utf-8")
+        return urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+    def decode_cursor(self, request):
+        """Return the (name, id) position encoded in the request cursor"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            name, pk = json.loads(urlsafe_b64decode(padded.encode("ascii")))
+            if not isinstance(name, str) or not isinstance(pk, int):
+                raise ValueError
+        except (TypeError, ValueError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+        return name, pk
@@ -1,5 +1,29 @@
-from core.models import Tag, Ingredient
+from rest_framework.relations import MANY_RELATION_KWARGS
+from django.utils.translation import ugettext_lazy as _
+from core.models import Tag, Ingredient, Recipe
 from rest_framework import serializers
+from django.db.models import QuerySet
+
+
+class ValuesListSerializer(serializers.ListSerializer):
+    """List serializer that reads querysets as plain values
+
+    Rows are fetched with values_list and emitted as dicts, skipping model
+    instantiation and per field serialization. Only suitable for children
+    whose fields are plain model fields rendered as is. Querysets already
+    evaluated, e.g. by prefetch_related, are serialized from their cache.
+    Lists of dicts, such as the pages KeysetPagination reads as values,
+    are taken as already serialized.
+    """
+
+    def to_representation(self, data):
+        if isinstance(data, QuerySet) and data._result_cache is None:
+            fields = self.child.Meta.fields
+            return [dict(zip(fields, row)) for row in data.values_list(*fields)]
+        if isinstance(data, list) and data and isinstance(data[0], dict):
+            return data
+
+        return super().to_representation(data)
 
 
 class TagSerializer(serializers.ModelSerializer):
@@ -9,6 +33,7 @@ class TagSerializer(serializers.ModelSerializer):
         model = Tag
         fields = ("id", "name")
         read_only_fields = ("id",)
+        list_serializer_class = ValuesListSerializer
 
 
 class IngredientSerializer(serializers.ModelSerializer):
@@ -18,3 +43,74 @@ class IngredientSerializer(serializers.ModelSerializer):
         model = Ingredient
         fields = ("id", "name")
         read_only_fields = ("id",)
+        list_serializer_class = ValuesListSerializer
+
+
+class ManyPrimaryKeysField(serializers.ManyRelatedField):
+    """Many related field validating every submitted key in one query"""
+
+    default_error_messages = {
+        "does_not_exist": _('Invalid pk "{pk_value}" - object does not exist.'),
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+
+        pks = []
+        for item in data:
+            if isinstance(item, bool):
+                self.child_relation.fail("incorrect_type", data_type="bool")
+            try:
+                pks.append(int(item))
+            except (TypeError, ValueError):
+                self.child_relation.fail(
+                    "incorrect_type", data_type=type(item).__name__
+                )
+
+        objs = self.child_relation.get_queryset().in_bulk(pks)
+        for pk in pks:
+            if pk not in objs:
+                self.fail("does_not_exist", pk_value=pk)
+
+        return [objs[pk] for pk in dict.fromkeys(pks)]
+
+
+class UserPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key field only accepting objects of the requesting user"""
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return ManyPrimaryKeysField(**list_kwargs)
+
+    def get_queryset(self):
+        return super().get_queryset().filter(user=self.context["request"].user)
+
+
+class RecipeSerializer(serializers.ModelSerializer):
+    """Serialize a recipe"""
+
+    ingredients = UserPrimaryKeyRelatedField(
+        many=True, required=False, queryset=Ingredient.objects.all()
+    )
+    tags = UserPrimaryKeyRelatedField(
+        many=True, required=False, queryset=Tag.objects.all()
+    )
+
+    class Meta:
+        model = Recipe
+        fields = ("id", "title", "ingredients", "tags", "time_minutes", "price", "link")
+        read_only_fields = ("id",)
+
+
+class RecipeDetailSerializer(RecipeSerializer):
+    """Serialize a recipe detail"""
+
+    ingredients = IngredientSerializer(many=True, read_only=True)
+    tags = TagSerializer(many=True, read_only=True)
@@ -0,0 +1,89 @@
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from core.models import Tag, Ingredient
+from rest_framework import status
+from django.urls import reverse
+
+TAGS_AUTOCOMPLETE_URL = reverse("recipe:tag-autocomplete")
+INGREDIENTS_AUTOCOMPLETE_URL = reverse("recipe:ingredient-autocomplete")
+
+
+class PublicAutocompleteApiTests(TestCase):
+    """Test the autocomplete endpoints without authentication"""
+
+    def test_login_required(self):
+        """Test that login is required to autocomplete"""
+        response = APIClient().get(TAGS_AUTOCOMPLETE_URL, {"search": "v"})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateAutocompleteApiTests(TestCase):
+    """Test prefix autocompletion of recipe attribute names"""
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            "john@example.com", "Testing123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def names(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["name"] for item in response.data]
+
+    def test_prefix_matches_ignore_case(self):
+        """Test that names starting with the prefix are returned in order"""
+        for name in ("salt", "Sage", "Basil", "SAFFRON", "Salsa Verde"):
+            Ingredient.objects.create(user=self.user, name=name)
+
+        names = self.names(INGREDIENTS_AUTOCOMPLETE_URL, search="Sa")
+
+        self.assertEqual(names, ["SAFFRON", "Sage", "Salsa Verde", "salt"])
+
+    def test_prefix_is_not_a_substring_match(self):
+        """Test that only the start of the name is matched"""
+        Tag.objects.create(user=self.user, name="Vegan")
+        Tag.objects.create(user=self.user, name="Not vegan")
+
+        self.assertEqual(self.names(TAGS_AUTOCOMPLETE_URL, search="veg"), ["Vegan"])
+
+    def test_matches_are_scoped_to_the_user(self):
+        """Test that other users' names are never suggested"""
+        other_user = get_user_model().objects.create_user(
+            "jane@example.com", "Testing123"
+        )
+        Tag.objects.create(user=other_user, name="Vegetarian")
+        Tag.objects.create(user=self.user, name="Vegan")
+
+        self.assertEqual(self.names(TAGS_AUTOCOMPLETE_URL, search="ve"), ["Vegan"])
+
+    def test_empty_search_returns_nothing(self):
+        """Test that a blank prefix does not list the whole collection"""
+        Tag.objects.create(user=self.user, name="Vegan")
+
+        self.assertEqual(self.names(TAGS_AUTOCOMPLETE_URL, search=" "), [])
+
+    @override_settings(RECIPE_AUTOCOMPLETE_MAX_LIMIT=3)
+    def test_limit_is_capped(self):
+        """Test that the number of suggestions is limited"""
+        for i in range(5):
+            Ingredient.objects.create(user=self.user, name=f"Pepper {i}")
+
+        self.assertEqual(
+            len(self.names(INGREDIENTS_AUTOCOMPLETE_URL, search="pe", limit=2)), 2
+        )
+        self.assertEqual(
+            len(self.names(INGREDIENTS_AUTOCOMPLETE_URL, search="pe", limit=100)), 3
+        )
+
+    def test_non_ascii_prefix(self):
+        """Test that case folding applies to the prefix as well"""
+        Ingredient.objects.create(user=self.user, name="Straße Salz")
+        Ingredient.objects.create(user=self.user, name="Strudel")
+
+        names = self.names(INGREDIENTS_AUTOCOMPLETE_URL, search="STRASS")
+
+        self.assertEqual(names, ["Straße Salz"])
@@ -0,0 +1,117 @@
+from django.test.utils import CaptureQueriesContext
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from core.models import Tag, Ingredient
+from django.db import connection
+from rest_framework import status
+from django.urls import reverse
+
+TAGS_BULK_URL = reverse("recipe:tag-bulk")
+INGREDIENTS_BULK_URL = reverse("recipe:ingredient-bulk")
+
+
+class PublicBulkApiTests(TestCase):
+    """Test the bulk create endpoints without authentication"""
+
+    def test_login_required(self):
+        """Test that login is required to bulk create"""
+        response = APIClient().post(TAGS_BULK_URL, [{"name": "Vegan"}], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateBulkApiTests(TestCase):
+    """Test bulk creating recipe attributes"""
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            "john@example.com", "Testing123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_create_ingredients(self):
+        """Test creating a batch of ingredients returns their ids"""
+        payload = [{"name": "Kale"}, {"name": "Salt"}, {"name": "Tumeric"}]
+
+        response = self.client.post(INGREDIENTS_BULK_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        ingredients = Ingredient.objects.filter(user=self.user)
+        self.assertEqual(
+            sorted(item["id"] for item in response.data),
+            sorted(ingredients.values_list("id", flat=True)),
+        )
+        self.assertEqual(
+            [item["name"] for item in response.data], ["Kale", "Salt", "Tumeric"]
+        )
+        self.assertEqual(ingredients.get(name="Kale").name_key, "kale")
+
+    def test_bulk_create_tags(self):
+        """Test creating a batch of tags"""
+        payload = [{"name": "Vegan"}, {"name": "Dessert"}]
+
+        response = self.client.post(TAGS_BULK_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 2)
+
+    def test_invalid_item_rejects_the_whole_batch(self):
+        """Test that nothing is created when any item is invalid"""
+        payload = [{"name": "Kale"}, {"name": ""}]
+
+        response = self.client.post(INGREDIENTS_BULK_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Ingredient.objects.exists())
+
+    def test_payload_must_be_a_list(self):
+        """Test that a single object is rejected by the bulk endpoint"""
+        response = self.client.post(TAGS_BULK_URL, {"name": "Vegan"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(RECIPE_BULK_MAX_BATCH_SIZE=2)
+    def test_batch_size_is_limited(self):
+        """Test that batches larger than the configured maximum are rejected"""
+        payload = [{"name": "Kale"}, {"name": "Salt"}, {"name": "Tumeric"}]
+
+        response = self.client.post(INGREDIENTS_BULK_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Ingredient.objects.exists())
+
+    def test_batch_is_a_single_insert(self):
+        """Test that the whole batch is persisted with one INSERT"""
+        payload = [{"name": f"Ingredient {i}"} for i in range(50)]
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(INGREDIENTS_BULK_URL, payload, format="json")
+
+        inserts = [q for q in queries if 'INTO "core_ingredient"' in q["sql"]]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(Ingredient.objects.filter(user=self.user).count(), 50)
+
+    def test_bulk_create_is_idempotent(self):
+        """Test that existing and repeated names resolve to one object each"""
+        kale = Ingredient.objects.create(user=self.user, name="Kale")
+        payload = [{"name": "kale"}, {"name": "Salt"}, {"name": "SALT"}]
+
+        response = self.client.post(INGREDIENTS_BULK_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data[0], {"id": kale.id, "name": "Kale"})
+        self.assertEqual(response.data[1], response.data[2])
+        self.assertEqual(Ingredient.objects.filter(user=self.user).count(), 2)
+
+    def test_bulk_create_existing_names(self):
+        """Test that a batch creating nothing answers 200"""
+        Ingredient.objects.create(user=self.user, name="Kale")
+
+        response = self.client.post(
+            INGREDIENTS_BULK_URL, [{"name": "KALE"}], format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Ingredient.objects.filter(user=self.user).count(), 1)
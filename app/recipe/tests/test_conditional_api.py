@@ -0,0 +1,87 @@
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from core.models import Tag, Ingredient
+from rest_framework import status
+from django.test import TestCase
+from django.urls import reverse
+
+TAGS_URL = reverse("recipe:tag-list")
+TAGS_BULK_URL = reverse("recipe:tag-bulk")
+INGREDIENTS_URL = reverse("recipe:ingredient-list")
+
+
+class ConditionalListApiTests(TestCase):
+    """Test ETag based conditional requests on the recipe attribute lists"""
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            "john@example.com", "Testing123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_etag(self, url=TAGS_URL, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response["ETag"]
+
+    def test_unchanged_list_is_not_modified(self):
+        """Test that a matching If-None-Match returns 304 without listing"""
+        Tag.objects.create(user=self.user, name="Vegan")
+        etag = self.get_etag()
+
+        with self.assertNumQueries(1):
+            response = self.client.get(TAGS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertFalse(response.content)
+
+    def test_creating_a_tag_changes_the_etag(self):
+        """Test that adding a tag invalidates the previous ETag"""
+        etag = self.get_etag()
+        self.client.post(TAGS_URL, {"name": "Vegan"})
+
+        response = self.client.get(TAGS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.data), 1)
+
+    def test_bulk_create_changes_the_etag(self):
+        """Test that bulk creating tags invalidates the previous ETag"""
+        etag = self.get_etag()
+        self.client.post(TAGS_BULK_URL, [{"name": "Vegan"}], format="json")
+
+        self.assertNotEqual(self.get_etag(), etag)
+
+    def test_deleting_a_tag_changes_the_etag(self):
+        """Test that removing a tag invalidates the previous ETag"""
+        tag = Tag.objects.create(user=self.user, name="Vegan")
+        etag = self.get_etag()
+        tag.delete()
+
+        self.assertNotEqual(self.get_etag(), etag)
+
+    def test_other_collections_keep_their_etag(self):
+        """Test that changing ingredients or another user's tags is ignored"""
+        other_user = get_user_model().objects.create_user(
+            "jane@example.com", "Testing123"
+        )
+        etag = self.get_etag()
+        Ingredient.objects.create(user=self.user, name="Kale")
+        Tag.objects.create(user=other_user, name="Fruity")
+
+        self.assertEqual(self.get_etag(), etag)
+
+    def test_query_string_is_part_of_the_etag(self):
+        """Test that different pages get different ETags"""
+        self.assertNotEqual(self.get_etag(), self.get_etag(page_size=10))
+
+    def test_ingredients_support_conditional_requests(self):
+        """Test that the ingredient list answers conditional requests"""
+        etag = self.get_etag(INGREDIENTS_URL)
+
+        response = self.client.get(INGREDIENTS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
@@ -0,0 +1,94 @@
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from core.models import Tag, Ingredient
+from rest_framework import status
+from django.test import TestCase
+from django.urls import reverse
+import json
+import gzip
+
+TAGS_EXPORT_URL = reverse("recipe:tag-export")
+INGREDIENTS_EXPORT_URL = reverse("recipe:ingredient-export")
+
+
+def read_body(response):
+    return b"".join(response.streaming_content)
+
+
+class PublicExportApiTests(TestCase):
+    """Test the export endpoints without authentication"""
+
+    def test_login_required(self):
+        """Test that login is required to export"""
+        response = APIClient().get(TAGS_EXPORT_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateExportApiTests(TestCase):
+    """Test streaming exports of recipe attributes"""
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            "john@example.com", "Testing123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_export_ingredients_as_ndjson(self):
+        """Test that ingredients are streamed one JSON document per line"""
+        kale = Ingredient.objects.create(user=self.user, name="Kale")
+        salt = Ingredient.objects.create(user=self.user, name="Salt")
+
+        response = self.client.get(INGREDIENTS_EXPORT_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertIn("ingredients.ndjson", response["Content-Disposition"])
+        lines = read_body(response).decode("utf-8").splitlines()
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            [{"id": salt.id, "name": "Salt"}, {"id": kale.id, "name": "Kale"}],
+        )
+
+    def test_export_tags_as_csv(self):
+        """Test that tags can be exported as CSV"""
+        tag = Tag.objects.create(user=self.user, name="Comfort, Food")
+
+        response = self.client.get(TAGS_EXPORT_URL, {"format": "csv"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+        self.assertEqual(
+            read_body(response).decode("utf-8"),
+            f'id,name\r\n{tag.id},"Comfort, Food"\r\n',
+        )
+
+    def test_export_is_scoped_to_the_user(self):
+        """Test that only the authenticated user's rows are exported"""
+        other_user = get_user_model().objects.create_user(
+            "jane@example.com", "Testing123"
+        )
+        Tag.objects.create(user=other_user, name="Fruity")
+        Tag.objects.create(user=self.user, name="Vegan")
+
+        response = self.client.get(TAGS_EXPORT_URL)
+
+        lines = read_body(response).decode("utf-8").splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["name"], "Vegan")
+
+    def test_export_is_gzipped_when_accepted(self):
+        """Test that the stream is compressed when the client accepts gzip"""
+        for i in range(100):
+            Ingredient.objects.create(user=self.user, name=f"Ingredient {i}")
+
+        response = self.client.get(
+            INGREDIENTS_EXPORT_URL, HTTP_ACCEPT_ENCODING="gzip, deflate"
+        )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        lines = gzip.decompress(read_body(response)).decode("utf-8").splitlines()
+        self.assertEqual(len(lines), 100)
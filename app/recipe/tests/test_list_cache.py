@@ -0,0 +1,124 @@
+from django.test import TestCase, SimpleTestCase, override_settings
+from recipe.caching import ListCache, list_cache
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from django.core.cache import cache
+from rest_framework import status
+from core.models import Tag
+from django.urls import reverse
+import threading
+
+TAGS_URL = reverse("recipe:tag-list")
+
+
+class ListCacheTests(SimpleTestCase):
+    """Test the version stamped list cache"""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.cache = ListCache(wait_timeout=5)
+
+    def test_hit_for_current_version(self):
+        """Test that a body is reused while the version is unchanged"""
+        calls = []
+        compute = lambda: calls.append(1) or ["body"]  # noqa: E731
+
+        self.assertEqual(self.cache.get_or_set("key", 1, compute), ["body"])
+        self.assertEqual(self.cache.get_or_set("key", 1, compute), ["body"])
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_new_version_evicts_the_entry(self):
+        """Test that a body built for an older version is never served"""
+        self.cache.get_or_set("key", 1, lambda: ["old"])
+
+        self.assertEqual(self.cache.get_or_set("key", 2, lambda: ["new"]), ["new"])
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    @override_settings(RECIPE_LIST_CACHE_TIMEOUT=0)
+    def test_cache_can_be_disabled(self):
+        """Test that a zero timeout always builds the body"""
+        self.cache.get_or_set("key", 1, lambda: ["first"])
+
+        self.assertEqual(
+            self.cache.get_or_set("key", 1, lambda: ["second"]), ["second"]
+        )
+
+    def test_concurrent_misses_build_the_body_once(self):
+        """Test that requests missing at the same time wait for one build"""
+        started, release = threading.Event(), threading.Event()
+        calls, results = [], []
+
+        def slow_compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return ["body"]
+
+        builder = threading.Thread(
+            target=lambda: results.append(self.cache.get_or_set("key", 1, slow_compute))
+        )
+        builder.start()
+        started.wait(5)
+        waiter = threading.Thread(
+            target=lambda: results.append(self.cache.get_or_set("key", 1, slow_compute))
+        )
+        waiter.start()
+        release.set()
+        builder.join(5)
+        waiter.join(5)
+
+        self.assertEqual(results, [["body"], ["body"]])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.cache.stats()["waits"], 1)
+
+
+class CachedListApiTests(TestCase):
+    """Test caching of the recipe attribute lists"""
+
+    def setUp(self) -> None:
+        cache.clear()
+        list_cache.reset_stats()
+        self.user = get_user_model().objects.create_user(
+            "john@example.com", "Testing123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_is_served_from_the_cache(self):
+        """Test that a repeated list only reads the version counter"""
+        Tag.objects.create(user=self.user, name="Vegan")
+        first = self.client.get(TAGS_URL)
+
+        with self.assertNumQueries(1):
+            second = self.client.get(TAGS_URL)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(list_cache.stats()["hits"], 1)
+
+    def test_create_invalidates_the_cached_list(self):
+        """Test that creating a tag is visible on the next list"""
+        self.client.get(TAGS_URL)
+        self.client.post(TAGS_URL, {"name": "Vegan"})
+
+        response = self.client.get(TAGS_URL)
+
+        self.assertEqual([tag["name"] for tag in response.data], ["Vegan"])
+        self.assertEqual(list_cache.stats()["evictions"], 1)
+
+    def test_cache_is_per_user(self):
+        """Test that users never see each other's cached lists"""
+        other_user = get_user_model().objects.create_user(
+            "jane@example.com", "Testing123"
+        )
+        Tag.objects.create(user=other_user, name="Fruity")
+        other_client = APIClient()
+        other_client.force_authenticate(other_user)
+        other_client.get(TAGS_URL)
+
+        response = self.client.get(TAGS_URL)
+
+        self.assertEqual(response.data, [])
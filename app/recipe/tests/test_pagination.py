@@ -0,0 +1,112 @@
+from django.test.utils import CaptureQueriesContext
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from core.models import Tag, Ingredient
+from rest_framework import status
+from django.db import connection
+from unittest.mock import patch
+from django.urls import reverse
+
+TAGS_URL = reverse("recipe:tag-list")
+INGREDIENTS_URL = reverse("recipe:ingredient-list")
+
+
+class KeysetPaginationTests(TestCase):
+    """Test keyset pagination of the recipe attribute lists"""
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            "john@example.com", "Testing123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def collect_pages(self, url, page_size):
+        names, pages = [], 0
+        next_url = f"{url}?page_size={page_size}"
+        while next_url:
+            response = self.client.get(next_url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            names.extend(item["name"] for item in response.data["results"])
+            next_url = response.data["next"]
+            pages += 1
+
+        return names, pages
+
+    def test_list_is_unpaginated_by_default(self):
+        """Test that the full list is returned when no page is requested"""
+        Tag.objects.create(user=self.user, name="Vegan")
+
+        response = self.client.get(TAGS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+
+    def test_pages_cover_the_whole_list_in_order(self):
+        """Test that following next links returns every row once, in order"""
+        for i in range(7):
+            Tag.objects.create(user=self.user, name=f"Tag {i}")
+
+        names, pages = self.collect_pages(TAGS_URL, 3)
+
+        expected = list(
+            Tag.objects.filter(user=self.user)
+            .order_by("-name", "-id")
+            .values_list("name", flat=True)
+        )
+        self.assertEqual(names, expected)
+        self.assertEqual(pages, 3)
+
+    def test_ingredients_are_paginated(self):
+        """Test that the ingredient list supports the same pagination"""
+        for name in ("Kale", "Salt", "Tumeric"):
+            Ingredient.objects.create(user=self.user, name=name)
+
+        names, _ = self.collect_pages(INGREDIENTS_URL, 2)
+
+        self.assertEqual(names, ["Tumeric", "Salt", "Kale"])
+
+    def test_page_is_a_single_query(self):
+        """Test that fetching a page does not run a COUNT query"""
+        for i in range(5):
+            Tag.objects.create(user=self.user, name=f"Tag {i}")
+        response = self.client.get(TAGS_URL, {"page_size": 2})
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(response.data["next"])
+
+        statements = [query["sql"] for query in queries]
+        self.assertEqual(len([sql for sql in statements if "core_tag" in sql]), 1)
+        self.assertFalse([sql for sql in statements if "COUNT(" in sql])
+
+    def test_page_is_read_as_values(self):
+        """Test that a page is serialized without instantiating models"""
+        for i in range(5):
+            Tag.objects.create(user=self.user, name=f"Tag {i}")
+
+        with patch.object(Tag, "from_db", side_effect=AssertionError):
+            response = self.client.get(TAGS_URL, {"page_size": 2})
+            response = self.client.get(response.data["next"])
+
+        self.assertEqual(
+            [item["name"] for item in response.data["results"]], ["Tag 2", "Tag 1"]
+        )
+        self.assertEqual(set(response.data["results"][0]), {"id", "name"})
+
+    @override_settings(RECIPE_MAX_PAGE_SIZE=2)
+    def test_page_size_is_capped(self):
+        """Test that the page size cannot exceed the configured maximum"""
+        for i in range(5):
+            Tag.objects.create(user=self.user, name=f"Tag {i}")
+
+        response = self.client.get(TAGS_URL, {"page_size": 100})
+
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNotNone(response.data["next"])
+
+    def test_invalid_cursor(self):
+        """Test that a malformed cursor is rejected"""
+        response = self.client.get(TAGS_URL, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
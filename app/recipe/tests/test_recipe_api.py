@@ -0,0 +1,283 @@
+from recipe.serializers import RecipeSerializer, RecipeDetailSerializer
+from core.models import Recipe, Tag, Ingredient
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.test import TestCase
+from django.urls import reverse
+
+RECIPES_URL = reverse("recipe:recipe-list")
+
+
+def detail_url(recipe_id):
+    """Return recipe detail URL"""
+    return reverse("recipe:recipe-detail", args=[recipe_id])
+
+
+def sample_tag(user, name="Main course"):
+    """Create and return a sample tag"""
+    return Tag.objects.create(user=user, name=name)
+
+
+def sample_ingredient(user, name="Cinnamon"):
+    """Create and return a sample ingredient"""
+    return Ingredient.objects.create(user=user, name=name)
+
+
+def sample_recipe(user, **params):
+    """Create and return a sample recipe"""
+    defaults = {"title": "Sample recipe", "time_minutes": 10, "price": 5.00}
+    defaults.update(params)
+
+    return Recipe.objects.create(user=user, **defaults)
+
+
+class PublicRecipeApiTests(TestCase):
+    """Test unauthenticated recipe API access"""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+
+    def test_auth_required(self):
+        """Test that authentication is required"""
+        response = self.client.get(RECIPES_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateRecipeApiTests(TestCase):
+    """Test authenticated recipe API access"""
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            "john@example.com", "Testing123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def request(self):
+        return self.client.get(RECIPES_URL).wsgi_request
+
+    def test_retrieve_recipes(self):
+        """Test retrieving a list of recipes"""
+        sample_recipe(user=self.user)
+        sample_recipe(user=self.user)
+
+        response = self.client.get(RECIPES_URL)
+
+        recipes = Recipe.objects.all().order_by("-id")
+        serializer = RecipeSerializer(recipes, many=True)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, serializer.data)
+
+    def test_recipes_limited_to_user(self):
+        """Test retrieving recipes for user"""
+        other_user = get_user_model().objects.create_user(
+            "jane@example.com", "Testing123"
+        )
+        sample_recipe(user=other_user)
+        sample_recipe(user=self.user)
+
+        response = self.client.get(RECIPES_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+
+    def test_view_recipe_detail(self):
+        """Test viewing a recipe detail"""
+        recipe = sample_recipe(user=self.user)
+        recipe.tags.add(sample_tag(user=self.user))
+        recipe.ingredients.add(sample_ingredient(user=self.user))
+
+        response = self.client.get(detail_url(recipe.id))
+
+        serializer = RecipeDetailSerializer(recipe)
+        self.assertEqual(response.data, serializer.data)
+
+    def test_list_query_count_is_constant(self):
+        """Test that listing costs the same queries for 1 or 20 recipes"""
+        tags = [sample_tag(self.user, f"Tag {i}") for i in range(3)]
+        ingredients = [sample_ingredient(self.user, f"Ing {i}") for i in range(3)]
+
+        def add_recipes(count):
+            for _ in range(count):
+                recipe = sample_recipe(user=self.user)
+                recipe.tags.set(tags)
+                recipe.ingredients.set(ingredients)
+
+        add_recipes(1)
+        with self.assertNumQueries(3):
+            self.client.get(RECIPES_URL)
+
+        add_recipes(19)
+        with self.assertNumQueries(3):
+            response = self.client.get(RECIPES_URL)
+
+        self.assertEqual(len(response.data), 20)
+        self.assertEqual(len(response.data[0]["tags"]), 3)
+
+    def test_detail_query_count(self):
+        """Test that a recipe detail is read with one query per relation"""
+        recipe = sample_recipe(user=self.user)
+        recipe.tags.add(sample_tag(user=self.user), sample_tag(self.user, "Vegan"))
+        recipe.ingredients.add(sample_ingredient(user=self.user))
+
+        with self.assertNumQueries(3):
+            response = self.client.get(detail_url(recipe.id))
+
+        self.assertEqual(len(response.data["tags"]), 2)
+
+    def test_create_basic_recipe(self):
+        """Test creating recipe"""
+        payload = {"title": "Chocolate cheesecake", "time_minutes": 30, "price": 5.00}
+
+        response = self.client.post(RECIPES_URL, payload)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        recipe = Recipe.objects.get(id=response.data["id"])
+        for key in payload.keys():
+            self.assertEqual(payload[key], getattr(recipe, key))
+
+    def test_create_recipe_with_tags(self):
+        """Test creating a recipe with tags"""
+        tag1 = sample_tag(user=self.user, name="Vegan")
+        tag2 = sample_tag(user=self.user, name="Dessert")
+        payload = {
+            "title": "Avocado lime cheesecake",
+            "tags": [tag1.id, tag2.id],
+            "time_minutes": 60,
+            "price": 20.00,
+        }
+
+        response = self.client.post(RECIPES_URL, payload)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        recipe = Recipe.objects.get(id=response.data["id"])
+        self.assertEqual(set(recipe.tags.all()), {tag1, tag2})
+
+    def test_create_recipe_with_ingredients(self):
+        """Test creating recipe with ingredients"""
+        ingredient1 = sample_ingredient(user=self.user, name="Prawns")
+        ingredient2 = sample_ingredient(user=self.user, name="Ginger")
+        payload = {
+            "title": "Thai prawn red curry",
+            "ingredients": [ingredient1.id, ingredient2.id],
+            "time_minutes": 20,
+            "price": 7.00,
+        }
+
+        response = self.client.post(RECIPES_URL, payload)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        recipe = Recipe.objects.get(id=response.data["id"])
+        self.assertEqual(set(recipe.ingredients.all()), {ingredient1, ingredient2})
+
+    def test_related_ids_are_validated_in_one_query(self):
+        """Test that submitted tag ids are looked up together"""
+        tags = [sample_tag(self.user, f"Tag {i}") for i in range(10)]
+        payload = {
+            "title": "Salad",
+            "tags": [tag.id for tag in tags],
+            "time_minutes": 5,
+            "price": 3.00,
+        }
+        request = self.request()
+
+        with self.assertNumQueries(1):
+            serializer = RecipeSerializer(data=payload, context={"request": request})
+            serializer.is_valid(raise_exception=True)
+
+    def test_other_users_tags_are_rejected(self):
+        """Test that a recipe cannot use another user's tags"""
+        other_user = get_user_model().objects.create_user(
+            "jane@example.com", "Testing123"
+        )
+        tag = sample_tag(user=other_user)
+        payload = {"title": "Soup", "tags": [tag.id], "time_minutes": 5, "price": 1}
+
+        response = self.client.post(RECIPES_URL, payload)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("tags", response.data)
+
+    def test_partial_update_recipe(self):
+        """Test updating a recipe with patch"""
+        recipe = sample_recipe(user=self.user)
+        recipe.tags.add(sample_tag(user=self.user))
+        new_tag = sample_tag(user=self.user, name="Curry")
+
+        self.client.patch(
+            detail_url(recipe.id), {"title": "Chicken tikka", "tags": [new_tag.id]}
+        )
+
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.title, "Chicken tikka")
+        self.assertEqual(list(recipe.tags.all()), [new_tag])
+
+    def test_full_update_recipe(self):
+        """Test updating a recipe with put"""
+        recipe = sample_recipe(user=self.user)
+        recipe.tags.add(sample_tag(user=self.user))
+        payload = {"title": "Spaghetti carbonara", "time_minutes": 25, "price": 5.00}
+
+        self.client.put(detail_url(recipe.id), payload)
+
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.title, payload["title"])
+        self.assertEqual(recipe.time_minutes, payload["time_minutes"])
+        self.assertEqual(recipe.tags.count(), 0)
+
+    def test_filter_recipes_by_tags(self):
+        """Test returning recipes with specific tags"""
+        recipe1 = sample_recipe(user=self.user, title="Thai vegetable curry")
+        recipe2 = sample_recipe(user=self.user, title="Aubergine with tahini")
+        recipe3 = sample_recipe(user=self.user, title="Fish and chips")
+        tag1 = sample_tag(user=self.user, name="Vegan")
+        tag2 = sample_tag(user=self.user, name="Vegetarian")
+        recipe1.tags.add(tag1)
+        recipe2.tags.add(tag1, tag2)
+
+        response = self.client.get(RECIPES_URL, {"tags": f"{tag1.id},{tag2.id}"})
+
+        ids = [item["id"] for item in response.data]
+        self.assertEqual(ids, [recipe2.id, recipe1.id])
+        self.assertNotIn(recipe3.id, ids)
+
+    def test_filter_recipes_by_ingredients(self):
+        """Test returning recipes with specific ingredients"""
+        recipe1 = sample_recipe(user=self.user, title="Posh beans on toast")
+        recipe2 = sample_recipe(user=self.user, title="Chicken cacciatore")
+        sample_recipe(user=self.user, title="Steak and mushrooms")
+        ingredient1 = sample_ingredient(user=self.user, name="Feta cheese")
+        ingredient2 = sample_ingredient(user=self.user, name="Chicken")
+        recipe1.ingredients.add(ingredient1)
+        recipe2.ingredients.add(ingredient2)
+
+        response = self.client.get(
+            RECIPES_URL, {"ingredients": f"{ingredient1.id},{ingredient2.id}"}
+        )
+
+        self.assertEqual(
+            [item["id"] for item in response.data], [recipe2.id, recipe1.id]
+        )
+
+    def test_filter_by_tags_and_ingredients(self):
+        """Test that both filters must match"""
+        tag = sample_tag(user=self.user)
+        ingredient = sample_ingredient(user=self.user)
+        both = sample_recipe(user=self.user)
+        both.tags.add(tag)
+        both.ingredients.add(ingredient)
+        sample_recipe(user=self.user).tags.add(tag)
+
+        response = self.client.get(
+            RECIPES_URL, {"tags": str(tag.id), "ingredients": str(ingredient.id)}
+        )
+
+        self.assertEqual([item["id"] for item in response.data], [both.id])
+
+    def test_invalid_filter(self):
+        """Test that non numeric ids are rejected"""
+        response = self.client.get(RECIPES_URL, {"tags": "1,vegan"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
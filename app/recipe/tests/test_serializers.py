@@ -0,0 +1,51 @@
+from recipe.serializers import TagSerializer, IngredientSerializer
+from rest_framework.serializers import ListSerializer
+from django.contrib.auth import get_user_model
+from rest_framework.renderers import JSONRenderer
+from core.models import Tag, Ingredient
+from django.test import TestCase
+
+
+class ValuesListSerializerTests(TestCase):
+    """Test the fast list mode against the ModelSerializer output"""
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            "john@example.com", "Testing123"
+        )
+        names = ["Kale", "Crème fraîche", 'Quote "marks"', "  padded  ", "数"]
+        for name in names:
+            Tag.objects.create(user=self.user, name=name)
+            Ingredient.objects.create(user=self.user, name=name)
+
+    def assertSameOutput(self, serializer_class, queryset):
+        fast = serializer_class(queryset, many=True).data
+        reference = ListSerializer(queryset, child=serializer_class()).data
+
+        self.assertEqual(fast, reference)
+        self.assertEqual(JSONRenderer().render(fast), JSONRenderer().render(reference))
+
+    def test_tag_output_matches_model_serializer(self):
+        """Test that the fast tag list renders exactly like the reference"""
+        queryset = Tag.objects.filter(user=self.user).order_by("-name", "-id")
+
+        self.assertSameOutput(TagSerializer, queryset)
+
+    def test_ingredient_output_matches_model_serializer(self):
+        """Test that the fast ingredient list renders exactly like the reference"""
+        queryset = Ingredient.objects.filter(user=self.user).order_by("-name", "-id")
+
+        self.assertSameOutput(IngredientSerializer, queryset)
+
+    def test_list_of_instances_uses_model_serializer(self):
+        """Test that plain lists of instances still serialize normally"""
+        tags = list(Tag.objects.filter(user=self.user).order_by("-name", "-id"))
+
+        self.assertSameOutput(TagSerializer, tags)
+
+    def test_queryset_is_read_as_values(self):
+        """Test that the fast mode does a single query for a queryset"""
+        queryset = Ingredient.objects.filter(user=self.user)
+
+        with self.assertNumQueries(1):
+            IngredientSerializer(queryset, many=True).data
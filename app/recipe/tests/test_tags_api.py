@@ -1,8 +1,10 @@
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from recipe.serializers import TagSerializer
 from rest_framework.test import APIClient
+from django.core.cache import cache
 from rest_framework import status
-from django.test import TestCase
+from django.conf import settings
 from django.urls import reverse
 from core.models import Tag
 
@@ -68,9 +70,56 @@ class PrivateTagsApiTests(TestCase):
 
         self.assertTrue(exists)
 
+    def test_create_existing_tag_returns_it(self):
+        """Test that creating a tag the user has, in any case, is idempotent"""
+        tag = Tag.objects.create(user=self.user, name="Vegan")
+
+        response = self.client.post(TAGS_URL, {"name": "VEGAN"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"id": tag.id, "name": "Vegan"})
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 1)
+
     def create_tag_invalid(self):
         """Test creating a new tag with invalid payload"""
         tag_data = {"name": ""}
         response = self.client.post(TAGS_URL, tag_data)
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(
+    REST_FRAMEWORK=dict(
+        settings.REST_FRAMEWORK, DEFAULT_THROTTLE_RATES={"create": "2/min"}
+    )
+)
+class ThrottledTagsApiTests(TestCase):
+    """Test the rate limit on creating tags"""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            "john@example.com", "Testing123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_creates_throttled_per_user(self):
+        """Test that a user's creates are limited but not their reads"""
+        codes = [
+            self.client.post(TAGS_URL, {"name": f"Tag {i}"}).status_code
+            for i in range(3)
+        ]
+
+        self.assertEqual(
+            codes,
+            [status.HTTP_201_CREATED] * 2 + [status.HTTP_429_TOO_MANY_REQUESTS],
+        )
+        self.assertEqual(self.client.get(TAGS_URL).status_code, status.HTTP_200_OK)
+
+        other_user = get_user_model().objects.create_user(
+            "jane@example.com", "Testing123"
+        )
+        self.client.force_authenticate(other_user)
+        response = self.client.post(TAGS_URL, {"name": "Tag"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
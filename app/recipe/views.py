@@ -1,25 +1,206 @@
-from rest_framework.authentication import TokenAuthentication
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from core.models import Tag, Ingredient, Recipe, CollectionVersion
+from core.authentication import CachedTokenAuthentication
 from rest_framework.permissions import IsAuthenticated
-from rest_framework import viewsets, mixins
-from core.models import Tag, Ingredient
+from rest_framework.serializers import ValidationError
+from recipe.export import NDJSONRenderer, CSVRenderer
+from rest_framework import viewsets, mixins, status
+from django.utils.translation import ugettext as _
+from django.utils.text import compress_sequence
+from recipe.pagination import KeysetPagination
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from core.throttling import CreateThrottle
+from django.utils.http import quote_etag
+from core.mixins import ReplicaReadMixin
+from django.db.models import Prefetch
+from recipe.caching import list_cache
+from django.conf import settings
 from recipe import serializers
+import hashlib
+import re
+
+re_accepts_gzip = re.compile(r"\bgzip\b")
 
 
 class BaseRecipeAttributesViewSet(
-    viewsets.GenericViewSet, mixins.ListModelMixin, mixins.CreateModelMixin
+    ReplicaReadMixin,
+    viewsets.GenericViewSet,
+    mixins.ListModelMixin,
+    mixins.CreateModelMixin,
 ):
     """Base viewset for user owned recipe attributes"""
 
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
+    throttle_classes = (CreateThrottle,)
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         """Return objects scoped to the current authenticated user"""
-        return self.queryset.filter(user=self.request.user).order_by("-name")
+        return self.queryset.filter(user=self.request.user).order_by("-name", "-id")
+
+    def get_collection_version(self):
+        """Return the change counter of the user's collection"""
+        return CollectionVersion.objects.current(
+            self.request.user.pk, self.queryset.model._meta.model_name
+        )
+
+    def get_list_variant(self):
+        """Return a digest of what, besides the data, shapes the list body
+
+        The host, the query string and the negotiated media type all change
+        the representation, e.g. pagination links or the renderer.
+        """
+        variant = "%s|%s|%s" % (
+            self.request.get_host(),
+            self.request.META.get("QUERY_STRING", ""),
+            self.request.accepted_media_type,
+        )
+        return hashlib.md5(variant.encode("utf-8")).hexdigest()[:12]
+
+    def list(self, request, *args, **kwargs):
+        """List the user's objects, answering 304 when the ETag matches
+
+        A matching If-None-Match is answered from the version counter alone,
+        without running the list query or the serializer. Otherwise the body
+        is served from the per user list cache when it is current.
+        """
+        version = self.get_collection_version()
+        variant = self.get_list_variant()
+        etag = quote_etag("%s-%s" % (version, variant))
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            key = "recipe-list:%s:%s:%s" % (
+                self.queryset.model._meta.model_name,
+                request.user.pk,
+                variant,
+            )
+            parent_list = super().list
+            data = list_cache.get_or_set(
+                key, version, lambda: parent_list(request, *args, **kwargs).data
+            )
+            response = Response(data)
+
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+    def create(self, request, *args, **kwargs):
+        """Create an object, or return the user's object with that name
+
+        Answers 201 when the name was new and 200 when it already existed,
+        so clients can create without listing first.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        created = self.perform_create(serializer)
+        headers = self.get_success_headers(serializer.data)
+        return Response(
+            serializer.data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+            headers=headers,
+        )
 
     def perform_create(self, serializer):
-        """Create a new recipe attribute"""
-        serializer.save(user=self.request.user)
+        """Upsert the recipe attribute, returning whether it was created"""
+        objs, created = self.queryset.model.objects.upsert(
+            self.request.user.pk, [serializer.validated_data["name"]]
+        )
+        serializer.instance = objs[0]
+        return bool(created)
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """Upsert a batch of recipe attributes from a JSON array
+
+        Answers 201 when any name was new and 200 when all already existed,
+        like a single create.
+        """
+        max_batch_size = getattr(settings, "RECIPE_BULK_MAX_BATCH_SIZE", 1000)
+        if isinstance(request.data, list) and len(request.data) > max_batch_size:
+            msg = _("A batch may contain at most %d items") % max_batch_size
+            raise ValidationError(msg, code="max_batch_size")
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        created = self.perform_bulk_create(serializer)
+
+        return Response(
+            serializer.data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+    def perform_bulk_create(self, serializer):
+        """Upsert the validated batch, returning how many rows were created
+
+        Names the user already has, in any case, resolve to the existing
+        objects, as do repeated names within the batch.
+        """
+        names = [item["name"] for item in serializer.validated_data]
+        model = self.queryset.model
+        objs, created = model.objects.upsert(self.request.user.pk, names)
+        serializer.instance = objs
+        return created
+
+    @action(detail=False)
+    def autocomplete(self, request):
+        """Return the first names starting with the search prefix
+
+        Matches ignore case and come back in name_key order, read through
+        the (user, name_key) index so only the returned rows are visited.
+        name_key is unique per user, so it alone orders the matches.
+        """
+        limit = getattr(settings, "RECIPE_AUTOCOMPLETE_LIMIT", 10)
+        max_limit = getattr(settings, "RECIPE_AUTOCOMPLETE_MAX_LIMIT", 50)
+        try:
+            limit = min(max(int(request.query_params["limit"]), 1), max_limit)
+        except (KeyError, ValueError):
+            pass
+
+        search = request.query_params.get("search", "").strip()
+        queryset = (
+            self.get_queryset().prefix_search(search).order_by("name_key")[:limit]
+        )
+        serializer = self.get_serializer(queryset, many=True)
+
+        return Response(serializer.data)
+
+    @action(detail=False, renderer_classes=(NDJSONRenderer, CSVRenderer))
+    def export(self, request):
+        """Stream every recipe attribute of the user as NDJSON or CSV
+
+        Rows are read through a server side cursor so memory use does not
+        depend on the number of rows. The body is gzipped on the fly when
+        the client accepts it.
+        """
+        fields = self.get_serializer_class().Meta.fields
+        chunk_size = getattr(settings, "RECIPE_EXPORT_CHUNK_SIZE", 2000)
+        queryset = self.get_queryset().values_list(*fields)
+        # The body is streamed after the view returns, once the replica
+        # routing of the request has ended, so the database is chosen now
+        rows = queryset.using(queryset.db).iterator(chunk_size=chunk_size)
+        content = request.accepted_renderer.stream(fields, rows)
+
+        gzip = re_accepts_gzip.search(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if gzip:
+            content = compress_sequence(content)
+
+        response = StreamingHttpResponse(
+            content, content_type=request.accepted_renderer.media_type
+        )
+        filename = "%s.%s" % (
+            self.queryset.model._meta.verbose_name_plural,
+            request.accepted_renderer.format,
+        )
+        response["Content-Disposition"] = 'attachment; filename="%s"' % filename
+        if gzip:
+            response["Content-Encoding"] = "gzip"
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        return response
 
 
 class TagViewSet(BaseRecipeAttributesViewSet):
@@ -34,3 +215,63 @@ class IngredientViewSet(BaseRecipeAttributesViewSet):
 
     serializer_class = serializers.IngredientSerializer
     queryset = Ingredient.objects.all()
+
+
+class RecipeViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
+    """Manage recipes in the database
+
+    Lists cost the same number of queries whatever their length: one for
+    the recipes and one per prefetched relation. Tag and ingredient
+    filters are IN subqueries on the link tables, so no join duplicates
+    rows and no DISTINCT is needed.
+    """
+
+    serializer_class = serializers.RecipeSerializer
+    queryset = Recipe.objects.all()
+    authentication_classes = (CachedTokenAuthentication,)
+    permission_classes = (IsAuthenticated,)
+    throttle_classes = (CreateThrottle,)
+
+    def _params_to_ints(self, qs):
+        """Convert a list of string IDs to a list of integers"""
+        try:
+            return [int(str_id) for str_id in qs.split(",") if str_id.strip()]
+        except ValueError:
+            raise ValidationError(_("Expected a comma separated list of ids"))
+
+    def get_queryset(self):
+        """Retrieve the recipes for the authenticated user"""
+        queryset = self.queryset.filter(user=self.request.user)
+
+        tags = self.request.query_params.get("tags")
+        ingredients = self.request.query_params.get("ingredients")
+        if tags:
+            queryset = queryset.filter(
+                id__in=Recipe.tags.through.objects.filter(
+                    tag_id__in=self._params_to_ints(tags)
+                ).values("recipe_id")
+            )
+        if ingredients:
+            queryset = queryset.filter(
+                id__in=Recipe.ingredients.through.objects.filter(
+                    ingredient_id__in=self._params_to_ints(ingredients)
+                ).values("recipe_id")
+            )
+
+        if self.action == "list":
+            return queryset.order_by("-id").prefetch_related(
+                Prefetch("tags", Tag.objects.only("id")),
+                Prefetch("ingredients", Ingredient.objects.only("id")),
+            )
+        return queryset.order_by("-id").prefetch_related("tags", "ingredients")
+
+    def get_serializer_class(self):
+        """Return appropriate serializer class"""
+        if self.action == "retrieve":
+            return serializers.RecipeDetailSerializer
+
+        return self.serializer_class
+
+    def perform_create(self, serializer):
+        """Create a new recipe"""
+        serializer.save(user=self.request.user)
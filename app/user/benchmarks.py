@@ -0,0 +1,127 @@
+from django.contrib.auth.hashers import get_hasher, get_hashers
+from rest_framework.throttling import SimpleRateThrottle
+from core.benchmarks import register, timeit, result
+from rest_framework.test import APIRequestFactory
+from core.throttling import SlidingWindowThrottle
+from core.provisioning import provision_users
+from rest_framework.request import Request
+from django.contrib.auth import hashers
+from django.core.cache import caches
+from django.db import transaction
+from django.conf import settings
+import time
+import os
+
+PASSWORD = "correct horse battery staple"
+
+
+def _login_cases():
+    """Yield the hashers to compare, starting with Django's default PBKDF2"""
+    yield "django pbkdf2_sha256 (default cost)", hashers.PBKDF2PasswordHasher()
+    for hasher in get_hashers():
+        if hasher.algorithm in ("argon2", "bcrypt_sha256", "pbkdf2_sha256"):
+            yield "configured %s" % hasher.algorithm, hasher
+
+
+@register("login")
+def login(quick=False):
+    """Password checks per second on one core for each configured hasher
+
+    Verifying the password is what dominates the cost of issuing a token,
+    so this is the ceiling for logins per second per core.
+    """
+    preferred = get_hasher().algorithm
+    results = []
+    for case, hasher in _login_cases():
+        try:
+            encoded = hasher.encode(PASSWORD, hasher.salt())
+        except ValueError:
+            continue
+
+        runs, elapsed = timeit(
+            lambda: hasher.verify(PASSWORD, encoded),
+            min_time=0 if quick else 2.0,
+            min_runs=1 if quick else 3,
+        )
+        extra = {"preferred": hasher.algorithm == preferred}
+        if hasher.algorithm.startswith("pbkdf2"):
+            extra["iterations"] = int(encoded.split("$")[1])
+        results.append(result(case, runs, elapsed, **extra))
+
+    return results
+
+
+class HistoryThrottle(SimpleRateThrottle):
+    """DRF's throttle, keeping the timestamp of every request in the window"""
+
+    def get_cache_key(self, request, view):
+        return "benchmark-history"
+
+
+class CounterThrottle(SlidingWindowThrottle):
+    def get_cache_key(self, request, view):
+        return "benchmark-counter"
+
+
+@register("throttles")
+def throttles(quick=False):
+    """Cost of one throttle check with a number of requests in the window
+
+    DRF's history grows with the requests made in the window, while the
+    sliding window counters stay two integers whatever the traffic. The
+    window is reset to the same number of requests before each timed check.
+    """
+    cache = caches[getattr(settings, "THROTTLE_CACHE_ALIAS", "default")]
+    request = Request(APIRequestFactory().post("/api/user/token/"))
+    results = []
+    for recent in (10,) if quick else (10, 1000, 10000):
+        for case, base in (("drf", HistoryThrottle), ("sliding", CounterThrottle)):
+            throttle_class = type(
+                base.__name__, (base,), {"rate": "1000000000/hour", "cache": cache}
+            )
+            window = int(time.time() // 3600)
+            keys = ["benchmark-history"] + [
+                "benchmark-counter:%d" % i for i in (window - 1, window, window + 1)
+            ]
+            runs, elapsed = 0, 0.0
+            while runs < (1 if quick else 200):
+                cache.delete_many(keys)
+                if base is HistoryThrottle:
+                    cache.set(keys[0], [time.time()] * recent, 3600)
+                else:
+                    cache.set(keys[1], recent, 7200)
+
+                started = time.perf_counter()
+                throttle_class().allow_request(request, None)
+                elapsed += time.perf_counter() - started
+                runs += 1
+            cache.delete_many(keys)
+            results.append(result(case, runs, elapsed, requests_in_window=recent))
+
+    return results
+
+
+@register("provisioning")
+def provisioning(quick=False):
+    """Users created per second by bulk provisioning, by hashing processes
+
+    Hashing dominates, so throughput should grow with the workers up to
+    the number of cores. Every run is rolled back.
+    """
+    users = 4 if quick else 200
+    results = []
+    for workers in sorted({1, 2, os.cpu_count() or 1}):
+        rows = [
+            {"email": "provision-%d@example.com" % i, "password": PASSWORD}
+            for i in range(users)
+        ]
+        with transaction.atomic():
+            started = time.perf_counter()
+            report = provision_users(rows, workers=workers)
+            elapsed = time.perf_counter() - started
+            transaction.set_rollback(True)
+        results.append(
+            result("%d workers" % workers, report["created"], elapsed, workers=workers)
+        )
+
+    return results
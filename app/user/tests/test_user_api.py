@@ -1,12 +1,18 @@
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
+from core.models import AccountDeletion
+from django.core.cache import cache
 from rest_framework import status
-from django.test import TestCase
+from django.conf import settings
+from unittest.mock import patch
 from django.urls import reverse
 
 CREATE_USER_URL = reverse("user:create")
 TOKEN_URL = reverse("user:token")
 ME_URL = reverse("user:me")
+PROVISION_URL = reverse("user:provision")
 
 
 def create_user(**params):
@@ -18,6 +24,7 @@ class PublicUserApiTests(TestCase):
 
     def setUp(self) -> None:
         self.client = APIClient()
+        cache.clear()
 
     def test_create_valid_user_success(self):
         """Test creating user with valid payload is successful"""
@@ -150,3 +157,177 @@ class PrivateUserApiTests(TestCase):
         self.assertEqual(self.user.name, user_data["name"])
         self.assertTrue(self.user.check_password(user_data["password"]))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_delete_account(self):
+        """Test that deleting the account locks the user out at once"""
+        token = Token.objects.create(user=self.user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+        self.assertEqual(client.get(ME_URL).status_code, status.HTTP_200_OK)
+
+        response = client.delete(ME_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data, {"status": AccountDeletion.PENDING})
+        self.assertTrue(AccountDeletion.objects.filter(user_id=self.user.pk).exists())
+        self.assertEqual(client.get(ME_URL).status_code, status.HTTP_401_UNAUTHORIZED)
+        payload = {"email": "john@example.com", "password": "Testing123"}
+        response = self.client.post(TOKEN_URL, payload)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(
+    REST_FRAMEWORK=dict(
+        settings.REST_FRAMEWORK,
+        DEFAULT_THROTTLE_RATES={
+            "login_ip": "5/min",
+            "login_email": "2/min",
+            "signup": "2/min",
+        },
+    )
+)
+class ThrottledUserApiTests(TestCase):
+    """Test the rate limits of the public users API"""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        cache.clear()
+        create_user(email="john@example.com", password="Testing123")
+
+    def test_token_requests_throttled_per_email(self):
+        """Test that repeated logins for one email are rejected"""
+        payload = {"email": "john@example.com", "password": "wrong"}
+        codes = [self.client.post(TOKEN_URL, payload).status_code for _ in range(3)]
+
+        self.assertEqual(codes[:2], [status.HTTP_400_BAD_REQUEST] * 2)
+        self.assertEqual(codes[2], status.HTTP_429_TOO_MANY_REQUESTS)
+
+        payload = {"email": "jane@example.com", "password": "wrong"}
+        response = self.client.post(TOKEN_URL, payload)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_token_requests_throttled_per_ip(self):
+        """Test that one client cannot try many emails"""
+        for i in range(5):
+            payload = {"email": f"user{i}@example.com", "password": "wrong"}
+            self.client.post(TOKEN_URL, payload)
+
+        payload = {"email": "john@example.com", "password": "Testing123"}
+        response = self.client.post(TOKEN_URL, payload)
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response)
+
+        response = self.client.post(TOKEN_URL, payload, REMOTE_ADDR="10.0.0.2")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_signup_throttled_per_ip(self):
+        """Test that accounts cannot be created in bursts"""
+        codes = [
+            self.client.post(
+                CREATE_USER_URL,
+                {
+                    "email": f"user{i}@example.com",
+                    "password": "Testing123",
+                    "name": "A",
+                },
+            ).status_code
+            for i in range(3)
+        ]
+
+        self.assertEqual(
+            codes,
+            [status.HTTP_201_CREATED] * 2 + [status.HTTP_429_TOO_MANY_REQUESTS],
+        )
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+class ProvisionUsersApiTests(TestCase):
+    """Test provisioning users in bulk"""
+
+    def setUp(self) -> None:
+        self.admin = create_user(email="admin@example.com", password="Testing123")
+        self.admin.is_staff = True
+        self.admin.save()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_provision_users(self):
+        """Test that staff can create users in bulk"""
+        payload = [
+            {"email": "john@example.com", "name": "John", "password": "Testing123"},
+            {"email": "admin@example.com", "password": "Testing123"},
+            {"email": "invalid"},
+        ]
+
+        response = self.client.post(PROVISION_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["existing"], ["admin@example.com"])
+        self.assertEqual(
+            response.data["errors"],
+            [{"row": 2, "email": "invalid", "error": "invalid email"}],
+        )
+        user = get_user_model().objects.get(email="john@example.com")
+        self.assertTrue(user.check_password("Testing123"))
+
+    @override_settings(USER_PROVISION_WORKERS=4)
+    def test_passwords_hashed_in_process(self):
+        """Test that a request never starts a process pool"""
+        payload = [
+            {"email": "john@example.com", "password": "Testing123"},
+            {"email": "jane@example.com", "password": "Testing123"},
+        ]
+
+        with patch("core.provisioning.ProcessPoolExecutor") as executor:
+            response = self.client.post(PROVISION_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        executor.assert_not_called()
+
+    def test_nothing_created(self):
+        """Test that a request creating no users returns 200"""
+        payload = [{"email": "admin@example.com"}]
+
+        response = self.client.post(PROVISION_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 0)
+
+    def test_staff_required(self):
+        """Test that other users cannot provision users"""
+        user = create_user(email="john@example.com", password="Testing123")
+        self.client.force_authenticate(user)
+
+        response = self.client.post(
+            PROVISION_URL, [{"email": "jane@example.com"}], format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(
+            get_user_model().objects.filter(email="jane@example.com").exists()
+        )
+
+    @override_settings(USER_PROVISION_MAX_USERS=2)
+    def test_max_users(self):
+        """Test that requests over the limit are rejected"""
+        payload = [{"email": f"user{i}@example.com"} for i in range(3)]
+
+        response = self.client.post(PROVISION_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("provision_users", str(response.data[0]))
+        self.assertEqual(get_user_model().objects.count(), 1)
+
+    def test_default_max_users_fits_a_request(self):
+        """Test that a full request hashes few enough passwords to be quick"""
+        self.assertLessEqual(settings.USER_PROVISION_MAX_USERS, 50)
+
+    def test_list_required(self):
+        """Test that the body must be a list of users"""
+        response = self.client.post(
+            PROVISION_URL, {"email": "john@example.com"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,13 +1,63 @@
 from user.serializers import UserSerializer, AuthTokenSerializer
-from rest_framework import generics, authentication, permissions
+from rest_framework.authentication import SessionAuthentication
 from rest_framework.authtoken.views import ObtainAuthToken
+from core.authentication import CachedTokenAuthentication
+from rest_framework import generics, permissions, status
+from rest_framework.serializers import ValidationError
+from django.utils.translation import ugettext as _
 from rest_framework.settings import api_settings
+from core.provisioning import provision_users
+from rest_framework.response import Response
+from core.deletion import request_deletion
+from rest_framework.views import APIView
+from core.mixins import ReplicaReadMixin
+from django.conf import settings
+from core import throttling
 
 
 class CreateUserView(generics.CreateAPIView):
     """Create a new user in the system"""
 
     serializer_class = UserSerializer
+    throttle_classes = (throttling.SignupThrottle,)
+
+
+class ProvisionUsersView(APIView):
+    """Create users in bulk for staff, e.g. when onboarding an organisation"""
+
+    authentication_classes = (CachedTokenAuthentication, SessionAuthentication)
+    permission_classes = (permissions.IsAdminUser,)
+
+    def post(self, request):
+        """Provision the users of a JSON array, reporting what was done
+
+        Passwords are hashed in this thread: forking a process pool per
+        request would copy the whole web worker each time. Each hash takes
+        tens of milliseconds, so requests are limited to a few dozen users
+        to finish well within worker timeouts; larger imports go through
+        the provision_users command, which hashes across processes.
+        """
+        max_users = getattr(settings, "USER_PROVISION_MAX_USERS", 25)
+        if not isinstance(request.data, list):
+            raise ValidationError(_("Expected a list of users"), code="not_a_list")
+        if len(request.data) > max_users:
+            msg = (
+                _(
+                    "At most %d users may be provisioned per request, use the "
+                    "provision_users command for larger imports"
+                )
+                % max_users
+            )
+            raise ValidationError(msg, code="max_users")
+
+        report = provision_users(
+            request.data,
+            batch_size=getattr(settings, "USER_PROVISION_BATCH_SIZE", 500),
+        )
+        return Response(
+            report,
+            status=status.HTTP_201_CREATED if report["created"] else status.HTTP_200_OK,
+        )
 
 
 class CreateTokenView(ObtainAuthToken):
@@ -15,15 +65,21 @@ class CreateTokenView(ObtainAuthToken):
 
     serializer_class = AuthTokenSerializer
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
+    throttle_classes = (throttling.LoginIPThrottle, throttling.LoginEmailThrottle)
 
 
-class ManageUserView(generics.RetrieveUpdateAPIView):
+class ManageUserView(ReplicaReadMixin, generics.RetrieveUpdateDestroyAPIView):
     """Manage the authenticated user"""
 
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = UserSerializer
 
     def get_object(self):
         """Retrieve and return authenticated user"""
         return self.request.user
+
+    def destroy(self, request, *args, **kwargs):
+        """Deactivate the account now and delete its data in the background"""
+        deletion = request_deletion(self.get_object())
+        return Response({"status": deletion.status}, status=status.HTTP_202_ACCEPTED)